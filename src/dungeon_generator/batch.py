@@ -0,0 +1,102 @@
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+
+class BatchResult:  # Outcome of one dungeon in a generate_many batch
+    def __init__(self, index, params, value=None, error=None):
+        self.index = index  # Position of the item in the submitted sequence
+        self.params = params
+        self.value = value  # Tuple returned by DungeonGenerator.generate()
+        self.error = error  # "ExceptionType: message" when generation failed
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        status = "ok" if self.ok else f"error={self.error!r}"
+        return f"BatchResult({self.index}, {status})"
+
+
+def normalize_item(item, defaults):  # Seed or parameter dict -> full parameter dict
+    params = dict(defaults)
+    if isinstance(item, dict):
+        params.update(item)
+    elif item is not None:
+        params["seed"] = item
+    return params
+
+
+def generate_one(generator_class, index, params):  # Build one dungeon, capturing any error
+    try:
+        value = generator_class(**params).generate()
+        return BatchResult(index, params, value)
+    except Exception as e:
+        return BatchResult(index, params, error=f"{type(e).__name__}: {e}")
+
+
+def generate_chunk(generator_class, chunk):  # Worker entry point for a list of (index, params)
+    return [generate_one(generator_class, index, params) for index, params in chunk]
+
+
+def generate_many(
+    generator_class,
+    param_sets_or_seeds,
+    workers=None,
+    chunksize=1,
+    ordered=True,
+    **defaults,
+):  # Yield BatchResults, fanning generation out over a process pool
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    tasks = (
+        (index, normalize_item(item, defaults))
+        for index, item in enumerate(param_sets_or_seeds)
+    )
+    chunks = iter(lambda: list(islice(tasks, chunksize)), [])
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield from generate_chunk(generator_class, chunk)
+        return
+
+    # Keep a bounded number of chunks in flight so huge batches stream instead of queueing
+    max_pending = workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        submitted = deque()  # (future, chunk) in submission order
+
+        def submit_next():
+            chunk = next(chunks, None)
+            if chunk is None:
+                return False
+            submitted.append((pool.submit(generate_chunk, generator_class, chunk), chunk))
+            return True
+
+        while len(submitted) < max_pending and submit_next():
+            pass
+
+        while submitted:
+            if ordered:
+                done = [submitted.popleft()]
+            else:
+                finished, _ = wait([future for future, _ in submitted], return_when=FIRST_COMPLETED)
+                done = [item for item in submitted if item[0] in finished]
+                for item in done:
+                    submitted.remove(item)
+
+            for future, chunk in done:
+                yield from collect(future, chunk)
+                submit_next()
+
+
+def collect(future, chunk):  # Results of a finished chunk; a crashed worker fails only its items
+    try:
+        return future.result()
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        return [BatchResult(index, params, error=error) for index, params in chunk]
@@ -1,4 +1,32 @@
 import math
+import random
+
+
+# (edge slot, first vertex slot, second vertex slot) for the edge opposite each vertex
+EDGE_SLOTS = ((0, 1, 2), (1, 2, 0), (2, 0, 1))
+
+
+def orientation(ax, ay, bx, by, cx, cy):  # pylint: disable=too-many-positional-arguments
+    # > 0 if a, b, c turn counter-clockwise
+    return (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+
+
+def hilbert_index(x, y, order=16):  # Position of integer cell (x, y) along a Hilbert curve
+    index = 0
+    size = 1 << order
+    side = size >> 1
+    while side > 0:
+        rx = 1 if x & side else 0
+        ry = 1 if y & side else 0
+        index += side * side * ((3 * rx) ^ ry)
+        # Rotate the quadrant so the curve stays continuous
+        if ry == 0:
+            if rx == 1:
+                x = size - 1 - x
+                y = size - 1 - y
+            x, y = y, x
+        side >>= 1
+    return index
 
 
 class Point:  # Represents a 2D point
@@ -17,10 +45,11 @@ class Point:  # Represents a 2D point
 
 
 class Triangle:  # Represents a triangle defined by three points
-    def __init__(self, a, b, c):
+    def __init__(self, a, b, c, circumcircle=None):
         self.vertices = [a, b, c]
         self.edges = [(a, b), (b, c), (c, a)]
-        self.circumcircle = self.calculate_circumcircle()
+        # Engines that already know the circumcircle can pass it in to skip recomputation
+        self.circumcircle = circumcircle or self.calculate_circumcircle()
 
     def calculate_circumcircle(self):  # Calculate circumcircle (center and radius)
         point_a, point_b, point_c = self.vertices
@@ -57,13 +86,23 @@ class Triangle:  # Represents a triangle defined by three points
         return dist < radius - 1e-10
 
 
-class DelaunayTriangulation:  # Delaunay triangulation using Bowyer-Watson
-    def __init__(self, points):  # Initializing triangulation with a list of points
+class DelaunayTriangulation:  # Delaunay triangulation (incremental or Bowyer-Watson)
+    ENGINES = ("incremental", "bowyer_watson")
+
+    def __init__(self, points, engine="incremental", seed=0):
+        # Initializing triangulation with a list of points
         if not points or len(points) < 3:
             raise ValueError("Delaunay triangulation requires at least 3 points")
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown triangulation engine: {engine}")
 
         self.points = points
+        self.engine = engine
+        self.seed = seed  # Breaks ties in the insertion order; fixed so output is repeatable
         self.triangles = []
+        self.triangle_indices = []  # Triangles as (i, j, k) indices into points
+        self._edge_indices = None
+        self.cavity_sizes = []  # Triangles removed per inserted point
         self.super_triangle = self.create_super_triangle()
         self.triangulate()
 
@@ -86,14 +125,227 @@ class DelaunayTriangulation:  # Delaunay triangulation using Bowyer-Watson
 
         return Triangle(p1, p2, p3)
 
-    def triangulate(self):  # Performing the Bowyer-Watson triangulation algorithm
+    def triangulate(self):  # Run the selected engine
+        self._edge_indices = None
+        if self.engine == "bowyer_watson":
+            self.triangulate_bowyer_watson()
+        else:
+            self.triangulate_incremental()
+
+    def insertion_order(self):  # Input indices sorted along a Hilbert curve
+        x_coords = [p.x for p in self.points]
+        y_coords = [p.y for p in self.points]
+        min_x, min_y = min(x_coords), min(y_coords)
+        span = max(max(x_coords) - min_x, max(y_coords) - min_y) or 1.0
+        scale = ((1 << 16) - 1) / span
+
+        # Shuffle first so ties (identical Hilbert cells) are broken randomly
+        order = list(range(len(self.points)))
+        random.Random(self.seed).shuffle(order)
+        keys = [
+            hilbert_index(int((x_coords[i] - min_x) * scale), int((y_coords[i] - min_y) * scale))
+            for i in range(len(self.points))
+        ]
+        order.sort(key=keys.__getitem__)
+        return order
+
+    # The hot loop is deliberately kept in one function to avoid per-call overhead
+    # pylint: disable-next=too-many-locals,too-many-branches,too-many-statements
+    def triangulate_incremental(self):  # Bowyer-Watson with triangle adjacency
+        # Vertex coordinates: input points followed by the three super-triangle corners
+        n = len(self.points)
+        xs = [p.x for p in self.points] + [v.x for v in self.super_triangle.vertices]
+        ys = [p.y for p in self.points] + [v.y for v in self.super_triangle.vertices]
+
+        # Flat triangle storage, three slots per triangle:
+        # verts[3t + i] is vertex i (counter-clockwise), nbrs[3t + i] the triangle across
+        # the edge opposite vertex i (-1 on the hull), circle[t] = (cx, cy, r^2)
+        verts = [n, n + 1, n + 2]
+        if orientation(xs[n], ys[n], xs[n + 1], ys[n + 1], xs[n + 2], ys[n + 2]) < 0:
+            verts = [n, n + 2, n + 1]
+        nbrs = [-1, -1, -1]
+        circles = [self._circle(xs, ys, *verts)]
+        alive = [True]
+        marks = [0]
+        free_slots = []
+
+        seen = set()
+        last = 0
+        stamp = 0
+        self.cavity_sizes = []
+
+        for index in self.insertion_order():
+            px, py = xs[index], ys[index]
+            if (px, py) in seen:  # Duplicate points do not change the triangulation
+                continue
+            seen.add((px, py))
+
+            start = self._locate(xs, ys, verts, nbrs, alive, last, px, py)
+
+            # Flood-fill the cavity: triangles whose circumcircle contains the point
+            stamp += 1
+            marks[start] = stamp
+            cavity = [start]
+            stack = [start]
+            boundary = []
+            while stack:
+                t = stack.pop()
+                base = 3 * t
+                for i, j, k in EDGE_SLOTS:
+                    nb = nbrs[base + i]
+                    if nb != -1 and marks[nb] == stamp:
+                        continue
+                    a = verts[base + j]
+                    b = verts[base + k]
+                    if nb != -1:
+                        cx, cy, r2 = circles[nb]
+                        dx = px - cx
+                        dy = py - cy
+                        inside = dx * dx + dy * dy < r2 - 1e-10
+                        # Keep the cavity star-shaped around the point
+                        if inside or orientation(xs[a], ys[a], xs[b], ys[b], px, py) <= 0:
+                            marks[nb] = stamp
+                            cavity.append(nb)
+                            stack.append(nb)
+                            continue
+                    # Remember which slot of the neighbor points back into the cavity
+                    back = -1
+                    if nb != -1:
+                        nb_base = 3 * nb
+                        back = nb_base if nbrs[nb_base] == t else (
+                            nb_base + 1 if nbrs[nb_base + 1] == t else nb_base + 2
+                        )
+                    boundary.append((a, b, nb, back))
+            # Edges between two cavity triangles are interior, not part of the hole
+            boundary = [edge for edge in boundary if edge[2] == -1 or marks[edge[2]] != stamp]
+            self.cavity_sizes.append(len(cavity))
+
+            for t in cavity:
+                alive[t] = False
+                free_slots.append(t)
+
+            # Fan new triangles (a, b, point) over the boundary edges
+            starts = {}
+            ends = {}
+            created = []
+            for a, b, nb, back in boundary:
+                if free_slots:
+                    t = free_slots.pop()
+                    alive[t] = True
+                    circles[t] = self._circle(xs, ys, a, b, index)
+                else:
+                    t = len(alive)
+                    alive.append(True)
+                    marks.append(0)
+                    circles.append(self._circle(xs, ys, a, b, index))
+                    verts.extend((0, 0, 0))
+                    nbrs.extend((-1, -1, -1))
+                base = 3 * t
+                verts[base] = a
+                verts[base + 1] = b
+                verts[base + 2] = index
+                nbrs[base + 2] = nb
+                if nb != -1:
+                    nbrs[back] = t
+                starts[a] = t
+                ends[b] = t
+                created.append(t)
+
+            # Link the fan triangles to each other around the new point
+            for t in created:
+                base = 3 * t
+                nbrs[base] = starts[verts[base + 1]]
+                nbrs[base + 1] = ends[verts[base]]
+            last = created[-1]
+
+        # Keep triangles that do not touch the super-triangle
+        self.triangle_indices = []
+        self.triangles = []
+        for t, is_alive in enumerate(alive):
+            if not is_alive:
+                continue
+            a, b, c = verts[3 * t], verts[3 * t + 1], verts[3 * t + 2]
+            if a >= n or b >= n or c >= n:
+                continue
+            cx, cy, r2 = circles[t]
+            circle = ((cx, cy), math.sqrt(r2)) if r2 != float("inf") else None
+            self.triangle_indices.append((a, b, c))
+            self.triangles.append(
+                Triangle(self.points[a], self.points[b], self.points[c], circle)
+            )
+
+    def edge_indices(self):  # Unique edges as sorted (i, j) index pairs with i < j
+        if self._edge_indices is None:
+            edges = set()
+            for a, b, c in self.triangle_indices:
+                edges.add((a, b) if a < b else (b, a))
+                edges.add((b, c) if b < c else (c, b))
+                edges.add((c, a) if c < a else (a, c))
+            self._edge_indices = sorted(edges)
+        return self._edge_indices
+
+    @staticmethod
+    def _circle(xs, ys, a, b, c):  # Circumcircle as (cx, cy, r^2), infinite when degenerate
+        ax, ay = xs[a], ys[a]
+        bx, by = xs[b] - ax, ys[b] - ay
+        cx, cy = xs[c] - ax, ys[c] - ay
+        determinant = 2 * (bx * cy - by * cx)
+        if abs(determinant) < 1e-10:
+            return (ax, ay, float("inf"))
+        b2 = bx * bx + by * by
+        c2 = cx * cx + cy * cy
+        ux = (cy * b2 - by * c2) / determinant
+        uy = (bx * c2 - cx * b2) / determinant
+        return (ax + ux, ay + uy, ux * ux + uy * uy)
+
+    @staticmethod
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments
+    def _locate(xs, ys, verts, nbrs, alive, start, px, py):
+        # Walk from the last inserted triangle towards the point
+        t = start if alive[start] else alive.index(True)
+        for _ in range(len(alive) + 1):
+            base = 3 * t
+            for i, j, k in EDGE_SLOTS:
+                a = verts[base + j]
+                b = verts[base + k]
+                if orientation(xs[a], ys[a], xs[b], ys[b], px, py) < 0:
+                    nb = nbrs[base + i]
+                    if nb != -1:
+                        t = nb
+                        break
+            else:
+                return t
+
+        # Walk failed to converge (degenerate input); fall back to a linear scan
+        for t, is_alive in enumerate(alive):
+            if not is_alive:
+                continue
+            base = 3 * t
+            if all(
+                orientation(
+                    xs[verts[base + (i + 1) % 3]],
+                    ys[verts[base + (i + 1) % 3]],
+                    xs[verts[base + (i + 2) % 3]],
+                    ys[verts[base + (i + 2) % 3]],
+                    px,
+                    py,
+                )
+                >= 0
+                for i in range(3)
+            ):
+                return t
+        raise RuntimeError("Point lies outside the super-triangle")
+
+    def triangulate_bowyer_watson(self):  # Performing the Bowyer-Watson triangulation algorithm
         self.triangles = [self.super_triangle]
+        self.cavity_sizes = []
 
         for point in self.points:
             bad_triangles = []
             for triangle in self.triangles:
                 if triangle.in_circumcircle(point):
                     bad_triangles.append(triangle)
+            self.cavity_sizes.append(len(bad_triangles))
 
             # Find boundary of polygonal hole
             polygon = []
@@ -124,3 +376,11 @@ class DelaunayTriangulation:  # Delaunay triangulation using Bowyer-Watson
         self.triangles = [
             t for t in self.triangles if not any(v in st_vertices for v in t.vertices)
         ]
+
+        # Index triples; a repeated input point maps to its first occurrence
+        index_of = {}
+        for i, point in enumerate(self.points):
+            index_of.setdefault(point, i)
+        self.triangle_indices = [
+            tuple(index_of[v] for v in t.vertices) for t in self.triangles
+        ]
@@ -1,7 +1,13 @@
 import random
 import math
+import time
 import logging
+from contextlib import nullcontext
 from .delaunay import Point, DelaunayTriangulation
+from .spatial import SpatialHash
+from .instrumentation import GenerationStats
+from .placement import FreeSpace
+from .grid import CHUNK_SIZE, MAX_CHUNKS, GridOptions, label_components, line_points
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -46,13 +52,29 @@ class Door:  # Door class representing a door connecting two rooms
 
 
 class DungeonGenerator:  # Main dungeon generator class
-    def __init__(
+    # Attributes are the public settings and the stage results callers read after
+    # generate(); backend-specific grid settings are grouped in GridOptions
+    # pylint: disable=too-many-instance-attributes
+    PLACEMENT_MODES = ("random", "free_space")
+
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         width=100,
         height=100,
         max_rooms=15,
         min_room_size=5,
         max_room_size=15,
+        *,
+        use_spatial_index=True,
+        placement="random",
+        grid_backend="list",
+        chunk_size=CHUNK_SIZE,
+        max_chunks=MAX_CHUNKS,
+        grid_path=None,
+        seed=None,
+        rng=None,
+        instrument=False,
+        stats_callback=None,
     ):
         if width < 10 or height < 10:
             raise ValueError("Dungeon dimensions must be at least 10x10")
@@ -60,46 +82,151 @@ class DungeonGenerator:  # Main dungeon generator class
             raise ValueError("Must generate at least 3 rooms")
         if min_room_size < 3 or max_room_size < min_room_size:
             raise ValueError("Invalid room size parameters")
+        if placement not in self.PLACEMENT_MODES:
+            raise ValueError(f"Unknown placement mode: {placement}")
+        grid_options = GridOptions(grid_backend, chunk_size, max_chunks, grid_path)
 
         self.width = width
         self.height = height
         self.max_rooms = max_rooms
         self.min_room_size = min_room_size
         self.max_room_size = max_room_size
+        # "random" retries random positions; "free_space" samples only positions that fit
+        self.placement = placement
+        self.placement_shortfall = 0  # Rooms short of max_rooms after free-space placement
+        self.grid_options = grid_options
+        # Every random draw goes through this generator-owned RNG. Without a seed or rng
+        # it is seeded from the global random module, so random.seed() still reproduces
+        # layouts, but later global draws no longer affect this generator.
+        self.seed = seed
+        if rng is None:
+            rng = random.Random(seed if seed is not None else random.getrandbits(64))
+        self.rng = rng
+        # Bucket size matches the largest room so a candidate touches at most 2x2 buckets;
+        # None when use_spatial_index is off
+        self.room_index = SpatialHash(max_room_size + 1) if use_spatial_index else None
         self.rooms = []
         self.corridors = []
         self.doors = []
         self.triangulation = None
         self.grid = None
+        self.components = None  # ComponentLabels of the grid, see component_labels()
+        # Opt-in instrumentation: stats are collected when instrument=True or a callback
+        # is given, and the callback receives the GenerationStats after generate()
+        self.stats_callback = stats_callback
+        self.stats = GenerationStats() if instrument or stats_callback else None
+
+    @classmethod
+    def generate_many(
+        cls, param_sets_or_seeds, workers=None, chunksize=1, ordered=True, **defaults
+    ):  # Batch generation over a process pool, yielding BatchResult objects
+        # Items are seeds or dicts of constructor arguments (optionally with a "seed" key);
+        # keyword arguments are defaults shared by every item
+        from .batch import generate_many
+
+        return generate_many(
+            cls,
+            param_sets_or_seeds,
+            workers=workers,
+            chunksize=chunksize,
+            ordered=ordered,
+            **defaults,
+        )
 
     def generate_rooms(self):  # Generate non-overlapping rooms
+        if self.placement == "free_space":
+            return self.generate_rooms_free_space()
+
         attempts = self.max_rooms * 5
         generated = 0
+        tried = 0
 
-        for _ in range(attempts):
-            if len(self.rooms) >= self.max_rooms:
-                break
+        with self._stage("rooms"):
+            for _ in range(attempts):
+                if len(self.rooms) >= self.max_rooms:
+                    break
+                tried += 1
 
-            room_width = random.randint(self.min_room_size, self.max_room_size)
-            room_height = random.randint(self.min_room_size, self.max_room_size)
+                room_width = self.rng.randint(self.min_room_size, self.max_room_size)
+                room_height = self.rng.randint(self.min_room_size, self.max_room_size)
 
-            # Ensure room fits within bounds
-            if room_width >= self.width - 2 or room_height >= self.height - 2:
-                continue
+                # Ensure room fits within bounds
+                if room_width >= self.width - 2 or room_height >= self.height - 2:
+                    self._count("placement_rejected_size")
+                    continue
 
-            room_x = random.randint(1, self.width - room_width - 1)
-            room_y = random.randint(1, self.height - room_height - 1)
-            new_room = Room(room_x, room_y, room_width, room_height, len(self.rooms))
+                room_x = self.rng.randint(1, self.width - room_width - 1)
+                room_y = self.rng.randint(1, self.height - room_height - 1)
+                new_room = Room(room_x, room_y, room_width, room_height, len(self.rooms))
 
-            if any(new_room.intersects(other_room) for other_room in self.rooms):
-                continue
+                if self.overlaps_existing(new_room):
+                    self._count("placement_rejected_overlap")
+                    continue
 
-            self.rooms.append(new_room)
-            generated += 1
+                self.rooms.append(new_room)
+                if self.room_index is not None:
+                    self.room_index.insert(new_room)
+                generated += 1
 
+        self._count("placement_attempts", tried)
+        self._count("rooms_placed", generated)
         logger.info("Generated %d rooms after %d attempts", generated, attempts)
         return generated
 
+    def generate_rooms_free_space(self):  # Rejection-free placement over tracked free space
+        # Footprints [x, x + w] must stay inside [1, width - 1], as in random placement
+        space = FreeSpace(1, 1, self.width - 1, self.height - 1)
+        for room in self.rooms:
+            space.occupy(room.x, room.y, room.width + 1, room.height + 1)
+        generated = 0
+        min_block = self.min_room_size + 1
+
+        with self._stage("rooms"):
+            while len(self.rooms) < self.max_rooms:
+                room_width = self.rng.randint(self.min_room_size, self.max_room_size)
+                room_height = self.rng.randint(self.min_room_size, self.max_room_size)
+
+                spot = space.fit(self.rng, room_width + 1, room_height + 1, min_block, min_block)
+                if spot is None:
+                    break
+                room_x, room_y, block_width, block_height = spot
+                space.occupy(room_x, room_y, block_width, block_height)
+
+                new_room = Room(
+                    room_x, room_y, block_width - 1, block_height - 1, len(self.rooms)
+                )
+                self.rooms.append(new_room)
+                if self.room_index is not None:
+                    self.room_index.insert(new_room)
+                generated += 1
+
+        self.placement_shortfall = self.max_rooms - len(self.rooms)
+        self._count("placement_attempts", generated)
+        self._count("rooms_placed", generated)
+        if self.placement_shortfall:
+            self._count("placement_shortfall", self.placement_shortfall)
+            logger.warning(
+                "Free-space placement stopped at %d of %d rooms: no room for a %dx%d room",
+                len(self.rooms),
+                self.max_rooms,
+                self.min_room_size,
+                self.min_room_size,
+            )
+        logger.info("Generated %d rooms in a single free-space pass", generated)
+        return generated
+
+    def _stage(self, name):  # Stage timer when instrumented, no-op otherwise
+        return self.stats.stage(name) if self.stats is not None else nullcontext()
+
+    def _count(self, name, amount=1):  # Counter increment when instrumented
+        if self.stats is not None:
+            self.stats.count(name, amount)
+
+    def overlaps_existing(self, room):  # Broad phase via spatial hash, brute force otherwise
+        if self.room_index is not None:
+            return self.room_index.intersects_any(room)
+        return any(room.intersects(other_room) for other_room in self.rooms)
+
     def generate_delaunay(self):  # Generate Delaunay triangulation of room centers
         if len(self.rooms) < 3:
             logger.warning("Need at least 3 rooms for Delaunay triangulation")
@@ -108,7 +235,14 @@ class DungeonGenerator:  # Main dungeon generator class
 
         try:
             points = [room.center for room in self.rooms]
-            self.triangulation = DelaunayTriangulation(points)
+            with self._stage("delaunay"):
+                self.triangulation = DelaunayTriangulation(points)
+            if self.stats is not None:
+                cavities = self.triangulation.cavity_sizes
+                self._count("delaunay_insertions", len(cavities))
+                self._count("delaunay_bad_triangles", sum(cavities))
+                self.stats.set("delaunay_bad_triangles_max", max(cavities, default=0))
+                self._count("delaunay_triangles", len(self.triangulation.triangles))
             logger.info(
                 "Created Delaunay triangulation with %d triangles",
                 len(self.triangulation.triangles),
@@ -126,79 +260,70 @@ class DungeonGenerator:  # Main dungeon generator class
             logger.error("Cannot generate MST without triangulation")
             return False
 
-        all_edges = set()
-
-        # Extract edges from Delaunay triangulation
-        for triangle in self.triangulation.triangles:
-            room_map = {r.center: r for r in self.rooms}
-
-            p1, p2, p3 = triangle.vertices
-            r1, r2, r3 = room_map.get(p1), room_map.get(p2), room_map.get(p3)
-
-            # Add edges with distance
-            if r1 and r2:
-                dist = math.hypot(r1.center.x - r2.center.x, r1.center.y - r2.center.y)
-                edge_key = (min(r1.id, r2.id), max(r1.id, r2.id), dist)
-                all_edges.add(edge_key)
-            if r2 and r3:
-                dist = math.hypot(r2.center.x - r3.center.x, r2.center.y - r3.center.y)
-                edge_key = (min(r2.id, r3.id), max(r2.id, r3.id), dist)
-                all_edges.add(edge_key)
-            if r3 and r1:
-                dist = math.hypot(r3.center.x - r1.center.x, r3.center.y - r1.center.y)
-                edge_key = (min(r3.id, r1.id), max(r3.id, r1.id), dist)
-                all_edges.add(edge_key)
-
-        if not all_edges:
-            logger.error("No edges found in triangulation")
-            return False
-
-        sorted_edges = sorted(list(all_edges), key=lambda item: item[2])
-
-        # Kruskal's algorithm for MST with Union-Find
-        parent = list(range(len(self.rooms)))
-
-        def find(i):  # Find root of node i with path compression
-            if parent[i] == i:
+        with self._stage("mst"):
+            # Point i of the triangulation is the center of self.rooms[i]
+            xs = [room.center.x for room in self.rooms]
+            ys = [room.center.y for room in self.rooms]
+            pairs = self.triangulation.edge_indices()
+            self._count("delaunay_edges", len(pairs))
+            if not pairs:
+                logger.error("No edges found in triangulation")
+                return False
+
+            # Sort by length; the sort is stable, so equal lengths keep index-pair order
+            lengths = [math.hypot(xs[u] - xs[v], ys[u] - ys[v]) for u, v in pairs]
+            order = sorted(range(len(pairs)), key=lengths.__getitem__)
+            sorted_edges = [pairs[i] for i in order]
+
+            # Kruskal's algorithm for MST with Union-Find (union by rank, path halving)
+            parent = list(range(len(self.rooms)))
+            rank = [0] * len(self.rooms)
+
+            def find(i):  # Root of node i, halving the path on the way up
+                while parent[i] != i:
+                    parent[i] = parent[parent[i]]
+                    i = parent[i]
                 return i
-            parent[i] = find(parent[i])
-            return parent[i]
-
-        def union(i, j):  # Union two sets containing i and j; by root
-            root_i = find(i)
-            root_j = find(j)
-            if root_i != root_j:
-                parent[root_j] = root_i
-                return True
-            return False
 
-        mst_edges = []
-        for u, v, _ in sorted_edges:
-            if union(u, v):
-                mst_edges.append((self.rooms[u], self.rooms[v]))
-
-        # Add extra edges for loops (20% of MST edges)
-        extra_edge_ratio = 0.2
-        num_extra_edges = int(len(mst_edges) * extra_edge_ratio)
-        potential_extra_edges = [
-            (self.rooms[u], self.rooms[v])
-            for u, v, _ in sorted_edges
-            if (self.rooms[u], self.rooms[v]) not in mst_edges
-            and (self.rooms[v], self.rooms[u]) not in mst_edges
-        ]
-        random.shuffle(potential_extra_edges)
-
-        final_edges = mst_edges + potential_extra_edges[:num_extra_edges]
-
-        # Create corridors and mark connections
-        for room1, room2 in final_edges:
-            room1.connections.append(room2.id)
-            room2.connections.append(room1.id)
-            self.create_corridor_between_rooms(room1, room2)
+            mst_pairs = []
+            for u, v in sorted_edges:
+                root_u, root_v = find(u), find(v)
+                if root_u == root_v:
+                    continue
+                if rank[root_u] < rank[root_v]:
+                    root_u, root_v = root_v, root_u
+                parent[root_v] = root_u
+                if rank[root_u] == rank[root_v]:
+                    rank[root_u] += 1
+                mst_pairs.append((u, v))
+                if len(mst_pairs) == len(self.rooms) - 1:
+                    break
+
+            # Add extra edges for loops (20% of MST edges)
+            extra_edge_ratio = 0.2
+            num_extra_edges = int(len(mst_pairs) * extra_edge_ratio)
+            in_mst = set(mst_pairs)
+            potential_extra_edges = [edge for edge in sorted_edges if edge not in in_mst]
+            self.rng.shuffle(potential_extra_edges)
+
+            final_edges = [
+                (self.rooms[u], self.rooms[v])
+                for u, v in mst_pairs + potential_extra_edges[:num_extra_edges]
+            ]
+
+        with self._stage("corridors"):
+            # Create corridors and mark connections
+            for room1, room2 in final_edges:
+                room1.connections.append(room2.id)
+                room2.connections.append(room1.id)
+                self.create_corridor_between_rooms(room1, room2)
+
+        self._count("mst_edges", len(mst_pairs))
+        self._count("extra_edges", len(final_edges) - len(mst_pairs))
 
         logger.info(
             "Created MST with %d base edges and %d total edges",
-            len(mst_edges),
+            len(mst_pairs),
             len(final_edges),
         )
         return True
@@ -208,7 +333,7 @@ class DungeonGenerator:  # Main dungeon generator class
         x2, y2 = int(room2.center.x), int(room2.center.y)
 
         path = []
-        if random.choice([True, False]):  # Horizontal then vertical
+        if self.rng.choice([True, False]):  # Horizontal then vertical
             path.append((x1, y1))
             path.append((x2, y1))
             path.append((x2, y2))
@@ -220,25 +345,21 @@ class DungeonGenerator:  # Main dungeon generator class
         self.corridors.append(path)
 
     def generate_grid(self):  # Generating 2D grid representation
+        self.components = None  # Labels of a previous grid
         try:
-            self.grid = [[0 for _ in range(self.width)] for _ in range(self.height)]
-
-            # Mark room cells, value 1 = walkable
-            for room in self.rooms:
-                for y in range(room.y, room.y + room.height):
-                    for x in range(room.x, room.x + room.width):
-                        if 0 <= y < self.height and 0 <= x < self.width:
-                            self.grid[y][x] = 1
-
-            # Mark corridor cells, value 1 = walkable
-            for corridor in self.corridors:
-                for i in range(len(corridor) - 1):
-                    x1, y1 = corridor[i]
-                    x2, y2 = corridor[i + 1]
-                    for x, y in self.get_line_points(int(x1), int(y1), int(x2), int(y2)):
-                        if 0 <= y < self.height and 0 <= x < self.width:
-                            self.grid[y][x] = 1
-
+            with self._stage("grid"):
+                rects = [(room.x, room.y, room.width, room.height) for room in self.rooms]
+                segments = [
+                    (int(x1), int(y1), int(x2), int(y2))
+                    for corridor in self.corridors
+                    for (x1, y1), (x2, y2) in zip(corridor, corridor[1:])
+                ]
+                self.grid, room_cells, corridor_cells = self.grid_options.rasterize(
+                    self.width, self.height, rects, segments
+                )
+
+            self._count("room_cells_rasterized", room_cells)
+            self._count("corridor_cells_rasterized", corridor_cells)
             logger.info("Generated %dx%d grid", self.width, self.height)
             return True
 
@@ -246,29 +367,28 @@ class DungeonGenerator:  # Main dungeon generator class
             logger.error("Failed to generate grid: %s", e)
             return False
 
+    def component_labels(self):  # ComponentLabels of the generated grid, labelled on request
+        # Labelling reads every cell, which costs more than rasterizing the grid, so
+        # generate() leaves it to the callers that need it
+        if self.components is None and self.grid is not None:
+            self.components = label_components(self.grid)
+            if self.stats is not None:
+                self.stats.set("components", self.components.count)
+        return self.components
+
+    def is_connected(self):  # True when the generated floor is one connected region
+        labels = self.component_labels()
+        return labels is not None and labels.is_connected()
+
     @staticmethod
     def get_line_points(x1, y1, x2, y2):  # Bresenham's line algorithm
-        points = []
-        dx, dy = abs(x2 - x1), abs(y2 - y1)
-        sx = 1 if x1 < x2 else -1
-        sy = 1 if y1 < y2 else -1
-        err = dx - dy
-
-        while True:
-            points.append((x1, y1))
-            if x1 == x2 and y1 == y2:
-                break
-            e2 = 2 * err
-            if e2 > -dy:
-                err -= dy
-                x1 += sx
-            if e2 < dx:
-                err += dx
-                y1 += sy
-        return points
+        return line_points(x1, y1, x2, y2)
 
     def generate(self):  # Generating complete dungeon
         logger.info("Starting dungeon generation...")
+        if self.stats is not None:
+            self.stats = GenerationStats()
+        started = time.perf_counter()
 
         # Generate rooms
         num_rooms = self.generate_rooms()
@@ -295,4 +415,9 @@ class DungeonGenerator:  # Main dungeon generator class
             len(self.doors),
         )
 
+        if self.stats is not None:
+            self.stats.timings["total"] = time.perf_counter() - started
+            if self.stats_callback is not None:
+                self.stats_callback(self.stats)
+
         return self.rooms, self.corridors, self.doors, self.triangulation, self.grid
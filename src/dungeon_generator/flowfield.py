@@ -0,0 +1,120 @@
+import heapq
+import math
+from array import array
+from collections import OrderedDict
+
+from .pathfinding import MOVES
+
+MAX_FIELDS = 16  # Flow fields kept per cache, least recently used dropped first
+
+
+class FlowField:  # Distance to the nearest goal and the next step toward it, for every cell
+    def __init__(self, width, height, goals, distances, next_cells, version=0):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self.width = width
+        self.height = height
+        self.goals = goals  # frozenset of (x, y) goal cells
+        self.distances = distances  # array("d"), math.inf where no goal is reachable
+        self.next_cells = next_cells  # array("l") of the next cell's index, -1 if none
+        self.version = version  # Grid version the field was built for
+
+    def distance(self, x, y):  # Path cost to the nearest goal (math.inf if unreachable)
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return math.inf
+        return self.distances[y * self.width + x]
+
+    def next_step(self, x, y):  # Next cell toward the nearest goal, or None at a goal/unreachable
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        index = self.next_cells[y * self.width + x]
+        if index < 0:
+            return None
+        y, x = divmod(index, self.width)
+        return x, y
+
+    def direction(self, x, y):  # (dx, dy) of the next step, or None
+        step = self.next_step(x, y)
+        if step is None:
+            return None
+        return step[0] - x, step[1] - y
+
+    def path(self, x, y):  # Cells from (x, y) to its nearest goal, or None if unreachable
+        if self.distance(x, y) == math.inf:
+            return None
+        path = [(x, y)]
+        step = self.next_step(x, y)
+        while step is not None:
+            path.append(step)
+            step = self.next_step(*step)
+        return path
+
+
+def build_flow_field(cells, width, height, goals, version=0):  # pylint: disable=too-many-locals
+    # One multi-source Dijkstra pass from every goal over a row-major walkability snapshot.
+    # Moves are symmetric, so the cell a neighbor was relaxed from is its next step.
+    goals = frozenset(goals)
+    size = width * height
+    distances = array("d", [math.inf]) * size
+    next_cells = array("l", [-1]) * size
+    open_heap = []
+    for x, y in goals:
+        index = y * width + x
+        distances[index] = 0.0
+        open_heap.append((0.0, index))
+    heapq.heapify(open_heap)
+    heappush, heappop = heapq.heappush, heapq.heappop
+
+    while open_heap:
+        cost, current = heappop(open_heap)
+        if cost > distances[current]:
+            continue  # Stale entry
+        y, x = divmod(current, width)
+        for dx, dy, move_cost in MOVES:
+            if 0 <= x + dx < width and 0 <= y + dy < height:
+                neighbor = current + dy * width + dx
+                if cells[neighbor] and cost + move_cost < distances[neighbor]:
+                    distances[neighbor] = cost + move_cost
+                    next_cells[neighbor] = current
+                    heappush(open_heap, (cost + move_cost, neighbor))
+
+    return FlowField(width, height, goals, distances, next_cells, version)
+
+
+class FlowFieldCache:  # Flow fields over a pathfinder's grid, cached per goal set
+    # Fields are rebuilt only when the pathfinder's version changes, i.e. after
+    # AStarPathfinder.grid_changed() has been called for an edited grid
+    def __init__(self, pathfinder, max_fields=MAX_FIELDS):
+        if max_fields < 1:
+            raise ValueError("max_fields must be at least 1")
+        self.pathfinder = pathfinder
+        self.max_fields = max_fields
+        self.fields = OrderedDict()  # frozenset of goals -> FlowField
+        self.builds = 0  # Fields computed (cache misses and rebuilds)
+
+    def field(self, goals):  # FlowField toward the nearest of the goal cells
+        pathfinder = self.pathfinder
+        width, height, grid = pathfinder.width, pathfinder.height, pathfinder.grid
+        goals = frozenset(
+            (x, y) for x, y in goals if 0 <= x < width and 0 <= y < height and grid[y][x] != 0
+        )
+        if not goals:
+            raise ValueError("A flow field needs at least one walkable goal cell")
+
+        field = self.fields.get(goals)
+        if field is not None and field.version == pathfinder.version:
+            self.fields.move_to_end(goals)
+            return field
+        field = build_flow_field(
+            pathfinder.walkable_cells(), width, height, goals, pathfinder.version
+        )
+        self.builds += 1
+        self.fields[goals] = field
+        self.fields.move_to_end(goals)
+        while len(self.fields) > self.max_fields:
+            self.fields.popitem(last=False)
+        return field
+
+    def next_step(self, x, y, goals):  # Next cell from (x, y) toward the goals, in O(1) once built
+        return self.field(goals).next_step(x, y)
+
+    def __len__(self):
+        return len(self.fields)
@@ -1,11 +1,161 @@
 import sys
 import random
 import pygame
-from .dungeon import DungeonGenerator
+from .grid import FLOOR_RUN
 from .pathfinding import AStarPathfinder
+from .prefetch import DungeonPrefetcher, build_dungeon
+
+MIN_CELL_SIZE = 1  # Zoom limits, in screen pixels per grid cell
+MAX_CELL_SIZE = 32
+PAN_SPEED = 800  # Screen pixels per second while a scroll key is held
+PATH_CACHE_SIZE = 64  # Recent click paths kept; clicks along a cached path reuse part of it
+
+
+class Camera:  # Zoom and scroll position of the explorer's view over the dungeon
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self, screen_width, screen_height, dungeon_width, dungeon_height, cell_size
+    ):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.dungeon_width = dungeon_width
+        self.dungeon_height = dungeon_height
+        self.cell_size = cell_size  # Screen pixels per grid cell
+        # Screen pixel (0, 0) shows world pixel (x, y)
+        self.x = 0
+        self.y = 0
+
+    def clamp(self):  # Keep the camera inside the dungeon
+        world_width = self.dungeon_width * self.cell_size
+        world_height = self.dungeon_height * self.cell_size
+        self.x = max(0, min(self.x, world_width - self.screen_width))
+        self.y = max(0, min(self.y, world_height - self.screen_height))
+
+    def center_on(self, x, y):  # Center the view on a grid cell
+        self.x = int((x + 0.5) * self.cell_size - self.screen_width / 2)
+        self.y = int((y + 0.5) * self.cell_size - self.screen_height / 2)
+        self.clamp()
+
+    def scroll(self, dx, dy):  # Move the camera by screen pixels
+        self.x += int(dx)
+        self.y += int(dy)
+        self.clamp()
+
+    def zoom(self, direction, anchor_x, anchor_y):  # Double or halve the cell size
+        # The world point under the anchor pixel stays under it
+        size = self.cell_size * 2 if direction > 0 else self.cell_size // 2
+        size = max(MIN_CELL_SIZE, min(MAX_CELL_SIZE, size))
+        if size == self.cell_size:
+            return
+        world_x = (self.x + anchor_x) / self.cell_size
+        world_y = (self.y + anchor_y) / self.cell_size
+        self.cell_size = size
+        self.x = int(world_x * size - anchor_x)
+        self.y = int(world_y * size - anchor_y)
+        self.clamp()
+
+    def screen_to_grid(self, screen_x, screen_y):  # Grid cell under a screen pixel
+        return (
+            (screen_x + self.x) // self.cell_size,
+            (screen_y + self.y) // self.cell_size,
+        )
+
+    def is_visible(self, x, y):  # True when a grid cell is at least partly on screen
+        left = x * self.cell_size - self.x
+        top = y * self.cell_size - self.y
+        return (
+            -self.cell_size < left < self.screen_width
+            and -self.cell_size < top < self.screen_height
+        )
+
+    def cell_rect(self, x, y):  # Screen rectangle of a grid cell
+        return pygame.Rect(
+            x * self.cell_size - self.x,
+            y * self.cell_size - self.y,
+            self.cell_size,
+            self.cell_size,
+        )
+
+
+class FrameCache:  # Cached floor of the viewport and what the last frame drew over it
+    def __init__(self, camera, colors):
+        self.camera = camera
+        self.colors = colors
+        # Walls and floor of the visible viewport, kept in step with the camera by
+        # update_floor
+        self.floor = pygame.Surface((camera.screen_width, camera.screen_height))
+        self.floor_view = None  # (x, y, cell_size) of the camera the cache shows
+        self.path_tile = None
+        self.dirty_rects = []  # Screen regions drawn over the floor last frame
+        self.drawn_state = None  # What those regions show; unchanged frames are skipped
+        self.full_redraw = True
+
+    def update_floor(self, grid):  # Bring the cached floor in line with the camera
+        camera = self.camera
+        width, height = camera.screen_width, camera.screen_height
+        view = (camera.x, camera.y, camera.cell_size)
+        if view == self.floor_view:
+            return False
+        if self.floor_view is None or self.floor_view[2] != camera.cell_size:
+            self.render_region(grid, 0, 0, width, height)
+        else:
+            # Panning: shift what is already drawn, render only the uncovered strips
+            dx = self.floor_view[0] - camera.x
+            dy = self.floor_view[1] - camera.y
+            self.floor.scroll(dx, dy)
+            if dx > 0:
+                self.render_region(grid, 0, 0, dx, height)
+            elif dx < 0:
+                self.render_region(grid, width + dx, 0, -dx, height)
+            if dy > 0:
+                self.render_region(grid, 0, 0, width, dy)
+            elif dy < 0:
+                self.render_region(grid, 0, height + dy, width, -dy)
+        self.floor_view = view
+
+        # Translucent tile blitted once per path cell
+        size = camera.cell_size
+        if self.path_tile is None or self.path_tile.get_width() != size:
+            self.path_tile = pygame.Surface((size, size), pygame.SRCALPHA)
+            self.path_tile.fill(self.colors["path"])
+        return True
+
+    def render_region(  # Redraw part of the cached floor
+        self, grid, left, top, width, height
+    ):  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+        # Only cells overlapping the region are read, so the cost depends on the
+        # region's size on screen, never on the dungeon's size
+        camera = self.camera
+        size = camera.cell_size
+        surface = self.floor
+        surface.fill(self.colors["wall"], (left, top, width, height))
+        x0 = max(0, (camera.x + left) // size)
+        x1 = min(camera.dungeon_width, -(-(camera.x + left + width) // size))
+        y0 = max(0, (camera.y + top) // size)
+        y1 = min(camera.dungeon_height, -(-(camera.y + top + height) // size))
+        if x0 >= x1:
+            return
+        floor = self.colors["floor"]
+        offset_x = x0 * size - camera.x
+        if hasattr(grid, "region"):  # Chunked and packed grids read the window at once
+            rows = grid.region(x0, y0, x1 - x0, y1 - y0)
+        else:
+            rows = (grid[y][x0:x1] for y in range(y0, y1))
+        for y, row in enumerate(rows, y0):
+            # Surface.fill keeps the full width or height of a rectangle that starts
+            # off-surface, so partly visible cells are clamped to the surface edge
+            top = y * size - camera.y
+            bottom = top + size
+            top = max(top, 0)
+            # One fill per horizontal run of floor cells
+            for run in FLOOR_RUN.finditer(bytes(row)):
+                start = max(offset_x + run.start() * size, 0)
+                surface.fill(floor, (start, top, offset_x + run.end() * size - start, bottom - top))
 
 
 class DungeonExplorer:
+    # Camera and rendering state live in Camera and FrameCache; what remains is the
+    # dungeon, the player's walk and the pygame objects of the main loop
+    # pylint: disable=too-many-instance-attributes
     def __init__(
         self,
         *,
@@ -14,20 +164,27 @@ class DungeonExplorer:
         dungeon_width=100,
         dungeon_height=100,
         max_rooms=None,
+        seed=None,
+        prefetch=2,
     ):
         pygame.init()
-        self.screen_width = width
-        self.screen_height = height
         self.screen = pygame.display.set_mode((width, height))
-        pygame.display.set_caption("Dungeon Explorer - R: Regenerate | ESC: Quit")
+        pygame.display.set_caption(
+            "Dungeon Explorer - R: Regenerate | Arrows/WASD: Scroll | Wheel: Zoom | ESC: Quit"
+        )
 
-        self.dungeon_width = dungeon_width
-        self.dungeon_height = dungeon_height
-        self.cell_size = min(width // dungeon_width, height // dungeon_height)
+        # Fit the whole dungeon when it fits at one pixel per cell or more
+        cell_size = max(
+            MIN_CELL_SIZE, min(MAX_CELL_SIZE, width // dungeon_width, height // dungeon_height)
+        )
+        self.camera = Camera(width, height, dungeon_width, dungeon_height, cell_size)
 
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont(None, 24)
 
+        # Explorer-owned RNG: picks room counts and seeds every generator
+        self.rng = random.Random(seed)
+
         # Storing desired room count
         self.desired_rooms = max(3, min(100, max_rooms)) if max_rooms is not None else None
 
@@ -36,103 +193,117 @@ class DungeonExplorer:
         self.path_index = 0
         self.move_timer = 0.0
 
+        self.colors = {
+            "background": (10, 10, 40),
+            "floor": (50, 50, 80),
+            "wall": (0, 0, 0),
+            "player": (255, 100, 100),
+            "path": (100, 200, 255, 100),
+            "hud": (220, 220, 220),
+        }
+        self.frame = FrameCache(self.camera, self.colors)
+
         # Generate dungeon with error handling
         print("Generating initial dungeon...")
         try:
-            self._build_dungeon()
+            self._apply_dungeon(*build_dungeon(**self._next_params()))
             print(f"Dungeon generated with {len(self.rooms)} rooms.")
         except Exception as e:
             print(f"Failed to generate dungeon: {e}")
             pygame.quit()
             raise RuntimeError(f"Dungeon generation failed: {e}") from e
 
-        # Initializing player at first room center
-        self.player_x = int(self.rooms[0].center.x)
-        self.player_y = int(self.rooms[0].center.y)
+        # Upcoming dungeons generate in a worker process while this one is explored
+        self.prefetcher = DungeonPrefetcher(self._next_params, depth=prefetch)
+        self.regenerate_requested = False
 
-        self.colors = {
-            "background": (10, 10, 40),
-            "floor": (50, 50, 80),
-            "wall": (0, 0, 0),
-            "player": (255, 100, 100),
-            "path": (100, 200, 255, 100),
-            "hud": (220, 220, 220),
-        }
-
-    def _build_dungeon(self):
+    def _next_params(self):  # Parameters of the next dungeon, drawn from the explorer RNG
         # Pick room count (fixed or random)
         target_rooms = (
             self.desired_rooms
             if self.desired_rooms is not None
-            else random.randint(3, 100)
+            else self.rng.randint(3, 100)
         )
+        return {
+            "width": self.camera.dungeon_width,
+            "height": self.camera.dungeon_height,
+            "max_rooms": target_rooms,
+            "seed": self.rng.getrandbits(64),
+        }
 
-        max_attempts = 10
-        for attempt in range(max_attempts):
-            try:
-                self.dungeon = DungeonGenerator(
-                    width=self.dungeon_width,
-                    height=self.dungeon_height,
-                    max_rooms=target_rooms,
-                    min_room_size=4,
-                    max_room_size=10,
-                )
-                self.rooms, _, _, _, self.grid = self.dungeon.generate()
-
-                # Ensure minimum 3 rooms for triangulation
-                if len(self.rooms) < 3:
-                    print(
-                        f"  Attempt {attempt + 1}: Only {len(self.rooms)} rooms, retrying..."
-                    )
-                    continue
+    def _apply_dungeon(self, rooms, grid):  # Swap in a dungeon and reset the player
+        self.rooms = rooms
+        self.grid = grid
+        self.pathfinder = AStarPathfinder(grid, cache_size=PATH_CACHE_SIZE, snapshot=True)
+        # Reset player to first room center
+        self.player_x = int(rooms[0].center.x)
+        self.player_y = int(rooms[0].center.y)
+        self.camera.center_on(self.player_x, self.player_y)
+        self.frame.floor_view = None  # New dungeon: render the whole viewport
+        # Clear any existing path
+        self.path = None
+        self.path_index = 0
+        self.move_timer = 0.0
+
+    def _swap_ready_dungeon(self):  # Apply a requested dungeon once the worker has it
+        if not self.regenerate_requested or not self.prefetcher.ready():
+            return True
+        self.regenerate_requested = False
+        try:
+            self._apply_dungeon(*self.prefetcher.take())
+            print(f"Regenerated with {len(self.rooms)} rooms.")
+        except Exception as e:
+            print(f"Failed to regenerate: {e}")
+            return False
+        return True
 
-                self.pathfinder = AStarPathfinder(self.grid)
-                return
+    def _handle_camera_event(self, event):  # Scroll and zoom input
+        # C to center the view on the player, +/- to zoom around the screen center
+        camera = self.camera
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_c:
+                camera.center_on(self.player_x, self.player_y)
+            if event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                camera.zoom(1, camera.screen_width // 2, camera.screen_height // 2)
+            if event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                camera.zoom(-1, camera.screen_width // 2, camera.screen_height // 2)
 
-            except Exception as e:
-                print(f"  Attempt {attempt + 1} failed: {e}")
-                if attempt == max_attempts - 1:
-                    raise RuntimeError(
-                        "Could not generate dungeon with minimum 3 rooms"
-                    ) from e
+        # Mouse wheel zooms around the pointer, right or middle drag scrolls
+        if event.type == pygame.MOUSEWHEEL and event.y:
+            camera.zoom(event.y, *pygame.mouse.get_pos())
+        if event.type == pygame.MOUSEMOTION and (event.buttons[1] or event.buttons[2]):
+            camera.scroll(-event.rel[0], -event.rel[1])
 
     def handle_events(self):  # Handling user input events
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False
 
+            # The window contents were lost (uncovered, restored or resized)
+            if event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                self.frame.full_redraw = True
+
             if event.type == pygame.KEYDOWN:
                 # ESC to quit
                 if event.key == pygame.K_ESCAPE:
                     print("\nQuitting dungeon explorer...")
                     return False
 
-                # R to regenerate dungeon
+                # R to regenerate dungeon; swapped in by _swap_ready_dungeon, never
+                # generated on this thread
                 if event.key == pygame.K_r:
                     print("\n[R] Regenerating dungeon...")
-                    try:
-                        self._build_dungeon()
-                        # Reset player to first room center
-                        self.player_x = int(self.rooms[0].center.x)
-                        self.player_y = int(self.rooms[0].center.y)
-                        # Clear any existing path
-                        self.path = None
-                        self.path_index = 0
-                        self.move_timer = 0.0
-                        print(f"Regenerated with {len(self.rooms)} rooms.")
-                    except Exception as e:
-                        print(f"Failed to regenerate: {e}")
-                        return False
+                    self.regenerate_requested = True
+
+            self._handle_camera_event(event)
 
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                mouse_x, mouse_y = pygame.mouse.get_pos()
-                grid_x = mouse_x // self.cell_size
-                grid_y = mouse_y // self.cell_size
+                grid_x, grid_y = self.camera.screen_to_grid(*event.pos)
 
                 # Check if clicked position is valid and walkable
                 if (
-                    0 <= grid_x < self.dungeon_width
-                    and 0 <= grid_y < self.dungeon_height
+                    0 <= grid_x < self.camera.dungeon_width
+                    and 0 <= grid_y < self.camera.dungeon_height
                     and self.grid[grid_y][grid_x] > 0
                 ):
                     self.path = self.pathfinder.find_path(
@@ -140,9 +311,21 @@ class DungeonExplorer:
                     )
                     self.path_index = 0
                     self.move_timer = 0.0
-        return True
+        return self._swap_ready_dungeon()
 
     def update(self, delta_time):  # Update game state based on elapsed time
+        # Scroll while arrow or WASD keys are held
+        keys = pygame.key.get_pressed()
+        right = keys[pygame.K_RIGHT] or keys[pygame.K_d]
+        left = keys[pygame.K_LEFT] or keys[pygame.K_a]
+        down = keys[pygame.K_DOWN] or keys[pygame.K_s]
+        up = keys[pygame.K_UP] or keys[pygame.K_w]
+        pan_x = right - left
+        pan_y = down - up
+        if pan_x or pan_y:
+            step = PAN_SPEED * delta_time
+            self.camera.scroll(pan_x * step, pan_y * step)
+
         # Use delta_time for smooth, controlled movement
         if self.path and self.path_index < len(self.path) - 1:
             self.move_timer += delta_time
@@ -152,6 +335,9 @@ class DungeonExplorer:
                 self.move_timer -= self.move_delay  # Keep remainder
                 self.path_index += 1
                 self.player_x, self.player_y = self.path[self.path_index]
+                # Follow the player when they walk out of view
+                if not self.camera.is_visible(self.player_x, self.player_y):
+                    self.camera.center_on(self.player_x, self.player_y)
 
                 # Clear path when destination reached
                 if self.path_index >= len(self.path) - 1:
@@ -160,50 +346,49 @@ class DungeonExplorer:
                     self.move_timer = 0.0
 
     def draw(self):  # Render the current game state to the screen
-        self.screen.fill(self.colors["wall"])
-
-        # Draw floor tiles
-        for y in range(self.dungeon_height):
-            for x in range(self.dungeon_width):
-                if self.grid[y][x] > 0:
-                    rect = pygame.Rect(
-                        x * self.cell_size,
-                        y * self.cell_size,
-                        self.cell_size,
-                        self.cell_size,
-                    )
-                    pygame.draw.rect(self.screen, self.colors["floor"], rect)
+        camera, frame = self.camera, self.frame
+        hud_text = f"Rooms: {len(self.rooms)} | R: regenerate | ESC: quit"
+        if self.regenerate_requested:
+            hud_text = "Generating next dungeon..."  # Worker has not finished it yet
+        if frame.update_floor(self.grid):
+            frame.full_redraw = True  # Camera moved or the dungeon changed
+        state = (self.player_x, self.player_y, self.path, hud_text)
+        if not frame.full_redraw and state == frame.drawn_state:
+            return
+
+        # Restore last frame's regions from the cached floor instead of redrawing it
+        restored = frame.dirty_rects
+        if frame.full_redraw:
+            self.screen.blit(frame.floor, (0, 0))
+        else:
+            for rect in restored:
+                self.screen.blit(frame.floor, rect, rect)
 
+        drawn = []
         # Draw path if one exists
         if self.path:
-            path_surface = pygame.Surface(
-                (self.screen_width, self.screen_height), pygame.SRCALPHA
-            )
             for x, y in self.path:
-                rect = pygame.Rect(
-                    x * self.cell_size,
-                    y * self.cell_size,
-                    self.cell_size,
-                    self.cell_size,
-                )
-                pygame.draw.rect(path_surface, self.colors["path"], rect)
-            self.screen.blit(path_surface, (0, 0))
+                if camera.is_visible(x, y):
+                    rect = camera.cell_rect(x, y)
+                    self.screen.blit(frame.path_tile, rect)
+                    drawn.append(rect)
 
         # Draw player
-        player_rect = pygame.Rect(
-            self.player_x * self.cell_size,
-            self.player_y * self.cell_size,
-            self.cell_size,
-            self.cell_size,
-        )
+        player_rect = camera.cell_rect(self.player_x, self.player_y)
         pygame.draw.rect(self.screen, self.colors["player"], player_rect)
+        drawn.append(player_rect)
 
         # Draw HUD (single line, clean design)
-        hud_text = f"Rooms: {len(self.rooms)} | R: regenerate | ESC: quit"
         text_surf = self.font.render(hud_text, True, self.colors["hud"])
-        self.screen.blit(text_surf, (10, 10))
+        drawn.append(self.screen.blit(text_surf, (10, 10)))
 
-        pygame.display.flip()
+        if frame.full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update(restored + drawn)
+        frame.dirty_rects = drawn
+        frame.drawn_state = state
+        frame.full_redraw = False
 
     def run(self):  # Main loop to run the dungeon generator
         running = True
@@ -212,5 +397,6 @@ class DungeonExplorer:
             running = self.handle_events()
             self.update(delta_time)
             self.draw()
+        self.prefetcher.close()
         pygame.quit()
         sys.exit()
@@ -0,0 +1,509 @@
+import re
+import tempfile
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only the array backend needs it
+    np = None
+
+GRID_BACKENDS = ("list", "numpy", "chunked", "memmap")
+CHUNK_SIZE = 256  # Cells per chunk side for the chunked backend
+MAX_CHUNKS = 64  # Materialized chunks kept in memory by default
+BAND_BYTES = 8 << 20  # In-memory band size when streaming a memmap grid to disk
+
+FLOOR_RUN = re.compile(rb"[^\x00]+")  # Horizontal run of walkable cells in a grid row
+
+# Bit packing goes through binary-digit strings so whole rows convert at C speed
+_TO_BITS = b"0" + b"1" * 255  # bytes.translate table: any non-zero cell -> b"1"
+_FROM_BITS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def require_numpy(feature):  # Raise a helpful error when NumPy is missing
+    if np is None:
+        raise ImportError(f"{feature} requires NumPy. Install it with 'poetry add numpy'.")
+
+
+def new_grid(
+    width, height, backend="list", *, chunk_size=CHUNK_SIZE, max_chunks=MAX_CHUNKS
+):  # Empty grid, value 0 = wall
+    if backend == "list":
+        return [[0] * width for _ in range(height)]
+    if backend == "numpy":
+        require_numpy("The numpy grid backend")
+        return np.zeros((height, width), dtype=np.uint8)
+    if backend == "chunked":
+        return ChunkedGrid(width, height, chunk_size=chunk_size, max_chunks=max_chunks)
+    raise ValueError(f"Unknown grid backend: {backend}")
+
+
+class GridOptions:  # Backend a generator rasterizes into, plus settings only some backends use
+    def __init__(self, backend="list", chunk_size=CHUNK_SIZE, max_chunks=MAX_CHUNKS, path=None):
+        if backend not in GRID_BACKENDS:
+            raise ValueError(f"Unknown grid backend: {backend}")
+        if backend in ("numpy", "memmap"):
+            require_numpy(f"The {backend} grid backend")
+        self.backend = backend
+        # Chunked backend only: cells per chunk side and chunks kept in its LRU
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        # Memmap backend only: file for the grid, an anonymous temporary file when None
+        self.path = path
+
+    def rasterize(self, width, height, rects, segments):  # (grid, room cells, corridor cells)
+        if self.backend == "memmap":
+            # Streams bands of rows to a file instead of filling an in-memory grid
+            return rasterize_to_file(self.path, width, height, rects, segments)
+        # The chunked backend only records shapes here; cells are built on access
+        grid = new_grid(
+            width, height, self.backend, chunk_size=self.chunk_size, max_chunks=self.max_chunks
+        )
+        # Mark room and corridor cells, value 1 = walkable
+        room_cells = sum(fill_rect(grid, *rect) for rect in rects)
+        corridor_cells = sum(fill_segment(grid, *segment) for segment in segments)
+        return grid, room_cells, corridor_cells
+
+
+def rasterize_to_file(
+    path, width, height, rects, segments, *, band_bytes=BAND_BYTES
+):  # Write a uint8 grid file band by band; returns (np.memmap, rect cells, segment cells)
+    # Only one band of rows is ever held in memory: shapes are bucketed by the bands
+    # they cover, each band is filled with the NumPy helpers and appended to the file.
+    # With path=None the grid lives in an anonymous temporary file.
+    require_numpy("The memmap grid backend")
+    band_rows = max(1, band_bytes // max(width, 1))
+    bands = {}
+    shapes = [(fill_rect, rect, rect[1], rect[1] + rect[3] - 1) for rect in rects]
+    shapes += [(fill_segment, seg, min(seg[1], seg[3]), max(seg[1], seg[3])) for seg in segments]
+    for fill, shape, top, bottom in shapes:
+        top, bottom = max(top, 0), min(bottom, height - 1)
+        for band in range(top // band_rows, bottom // band_rows + 1):
+            bands.setdefault(band, []).append((fill, shape))
+
+    # pylint: disable-next=consider-using-with
+    handle = open(path, "w+b") if path is not None else tempfile.TemporaryFile()
+    counts = {fill_rect: 0, fill_segment: 0}
+    with handle:
+        for band_start in range(0, height, band_rows):
+            rows = min(band_rows, height - band_start)
+            band = np.zeros((rows, width), dtype=np.uint8)
+            for fill, (x1, y1, x2, y2) in bands.get(band_start // band_rows, ()):
+                # Rects are (x, y, w, h), segments (x1, y1, x2, y2); only y is shifted
+                if fill is fill_rect:
+                    counts[fill] += fill_rect(band, x1, y1 - band_start, x2, y2)
+                else:
+                    counts[fill] += fill_segment(band, x1, y1 - band_start, x2, y2 - band_start)
+            handle.write(band.tobytes())
+        handle.flush()
+        grid = np.memmap(handle, dtype=np.uint8, mode="r+", shape=(height, width))
+    return grid, counts[fill_rect], counts[fill_segment]
+
+
+def fill_rect(grid, x, y, width, height, *, value=1):  # Fill cells [x, x+width) x [y, y+height)
+    if isinstance(grid, ChunkedGrid):
+        return grid.add_rect(x, y, width, height, value=value)
+    x0, y0 = max(x, 0), max(y, 0)
+    if isinstance(grid, list):
+        grid_height = len(grid)
+        grid_width = len(grid[0]) if grid_height else 0
+        x1, y1 = min(x + width, grid_width), min(y + height, grid_height)
+        if x0 >= x1 or y0 >= y1:
+            return 0
+        run = [value] * (x1 - x0)
+        for row in range(y0, y1):
+            grid[row][x0:x1] = run
+    else:
+        grid_height, grid_width = grid.shape
+        x1, y1 = min(x + width, grid_width), min(y + height, grid_height)
+        if x0 >= x1 or y0 >= y1:
+            return 0
+        grid[y0:y1, x0:x1] = value
+    return (x1 - x0) * (y1 - y0)
+
+
+def fill_segment(grid, x1, y1, x2, y2, *, value=1):  # Mark a corridor segment, endpoints included
+    # Axis-aligned segments are filled as a single rectangle; others fall back to Bresenham
+    if isinstance(grid, ChunkedGrid):
+        return grid.add_segment(x1, y1, x2, y2, value=value)
+    if x1 == x2 or y1 == y2:
+        return fill_rect(
+            grid, min(x1, x2), min(y1, y2), abs(x2 - x1) + 1, abs(y2 - y1) + 1, value=value
+        )
+
+    grid_height = len(grid)
+    grid_width = len(grid[0]) if grid_height else 0
+    points = [
+        (x, y)
+        for x, y in line_points(x1, y1, x2, y2)
+        if 0 <= y < grid_height and 0 <= x < grid_width
+    ]
+    if not points:
+        return 0
+
+    if isinstance(grid, list):
+        for x, y in points:
+            grid[y][x] = value
+    else:
+        xs, ys = zip(*points)
+        grid[list(ys), list(xs)] = value
+    return len(points)
+
+
+def packed_stride(width):  # Bytes per bit-packed row
+    return (width + 7) // 8
+
+
+def pack_row(row, width):  # Cell values -> bytes, one bit per cell, most significant bit first
+    stride = packed_stride(width)
+    bits = bytes(row).translate(_TO_BITS) + b"0" * (stride * 8 - width)
+    return int(bits, 2).to_bytes(stride, "big")
+
+
+def unpack_row(data, width):  # Inverse of pack_row: bytearray of 0/1 cells
+    bits = format(int.from_bytes(data, "big"), f"0{len(data) * 8}b")
+    return bytearray(bits[:width].encode().translate(_FROM_BITS))
+
+
+def line_points(x1, y1, x2, y2):  # Bresenham's line algorithm
+    points = []
+    dx, dy = abs(x2 - x1), abs(y2 - y1)
+    sx = 1 if x1 < x2 else -1
+    sy = 1 if y1 < y2 else -1
+    err = dx - dy
+
+    while True:
+        points.append((x1, y1))
+        if x1 == x2 and y1 == y2:
+            break
+        e2 = 2 * err
+        if e2 > -dy:
+            err -= dy
+            x1 += sx
+        if e2 < dx:
+            err += dx
+            y1 += sy
+    return points
+
+
+class ChunkedGrid:  # Grid whose cells are rasterized per chunk, only when first accessed
+    # Rooms and corridor segments are recorded per chunk they touch; a chunk's cells
+    # are built from those shapes on demand and kept in a bounded LRU, so memory
+    # depends on max_chunks rather than on width x height. Read-only once built.
+    def __init__(self, width, height, *, chunk_size=CHUNK_SIZE, max_chunks=MAX_CHUNKS):
+        if chunk_size < 1 or max_chunks < 1:
+            raise ValueError("chunk_size and max_chunks must be at least 1")
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.shapes = {}  # (chunk_x, chunk_y) -> [(fill function, args, value)]
+        self.chunks = OrderedDict()  # (chunk_x, chunk_y) -> rows, least recently used first
+        self.hits = 0
+        self.misses = 0  # Chunks rasterized, including ones rebuilt after eviction
+        self.evictions = 0
+
+    def _register(self, shape, x0, y0, x1, y1):  # Attach a shape to chunks overlapping a box
+        # Box is inclusive and already clipped to the grid
+        size = self.chunk_size
+        for cy in range(y0 // size, y1 // size + 1):
+            for cx in range(x0 // size, x1 // size + 1):
+                self.shapes.setdefault((cx, cy), []).append(shape)
+
+    def add_rect(self, x, y, width, height, *, value=1):  # Record a filled rectangle
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + width, self.width), min(y + height, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return 0
+        self._register((fill_rect, (x, y, width, height), value), x0, y0, x1 - 1, y1 - 1)
+        return (x1 - x0) * (y1 - y0)
+
+    def add_segment(self, x1, y1, x2, y2, *, value=1):  # Record a corridor segment
+        if x1 == x2 or y1 == y2:
+            return self.add_rect(
+                min(x1, x2), min(y1, y2), abs(x2 - x1) + 1, abs(y2 - y1) + 1, value=value
+            )
+        points = [
+            (x, y) for x, y in line_points(x1, y1, x2, y2)
+            if 0 <= x < self.width and 0 <= y < self.height
+        ]
+        if not points:
+            return 0
+        xs, ys = zip(*points)
+        self._register(
+            (fill_segment, (x1, y1, x2, y2), value), min(xs), min(ys), max(xs), max(ys)
+        )
+        return len(points)
+
+    def chunk(self, chunk_x, chunk_y):  # Rows of one chunk, rasterizing it on a miss
+        key = (chunk_x, chunk_y)
+        rows = self.chunks.get(key)
+        if rows is not None:
+            self.hits += 1
+            self.chunks.move_to_end(key)
+            return rows
+
+        self.misses += 1
+        size = self.chunk_size
+        origin_x, origin_y = chunk_x * size, chunk_y * size
+        chunk_width = max(0, min(size, self.width - origin_x))
+        chunk_height = max(0, min(size, self.height - origin_y))
+        rows = [bytearray(chunk_width) for _ in range(chunk_height)]
+        # Shapes are stored in world coordinates; the list helpers clip them to the chunk
+        for fill, args, value in self.shapes.get(key, ()):
+            if fill is fill_rect:
+                x, y, width, height = args
+                fill_rect(rows, x - origin_x, y - origin_y, width, height, value=value)
+            else:
+                x1, y1, x2, y2 = args
+                fill_segment(
+                    rows, x1 - origin_x, y1 - origin_y, x2 - origin_x, y2 - origin_y, value=value
+                )
+
+        self.chunks[key] = rows
+        if len(self.chunks) > self.max_chunks:
+            self.chunks.popitem(last=False)
+            self.evictions += 1
+        return rows
+
+    def cell(self, x, y):  # Cell value, 0 outside the grid
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return 0
+        size = self.chunk_size
+        chunk_x, local_x = divmod(x, size)
+        chunk_y, local_y = divmod(y, size)
+        return self.chunk(chunk_x, chunk_y)[local_y][local_x]
+
+    def is_walkable(self, x, y):  # Walkability query shared by pathfinding and rendering
+        return self.cell(x, y) != 0
+
+    def region(self, x, y, width, height):  # Rows for a window, e.g. the visible viewport
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + width, self.width), min(y + height, self.height)
+        size = self.chunk_size
+        rows = []
+        for row in range(y0, y1):
+            chunk_y, local_y = divmod(row, size)
+            cells = bytearray()
+            for chunk_x in range(x0 // size, (x1 - 1) // size + 1):
+                start = max(x0 - chunk_x * size, 0)
+                end = min(x1 - chunk_x * size, size)
+                cells += self.chunk(chunk_x, chunk_y)[local_y][start:end]
+            rows.append(cells)
+        return rows
+
+    def __getitem__(self, y):  # grid[y][x] support for existing callers
+        if not 0 <= y < self.height:
+            raise IndexError("grid row out of range")
+        return GridRow(self, y)
+
+    def __len__(self):
+        return self.height
+
+
+class GridRow:  # One row of a lazy grid (anything with cell(), region() and width)
+    def __init__(self, grid, y):
+        self.grid = grid
+        self.y = y
+
+    def __getitem__(self, x):
+        if isinstance(x, slice):  # Copy of the cells, like a list row slice
+            start, stop, step = x.indices(self.grid.width)
+            if step != 1:
+                return bytearray(self.grid.cell(i, self.y) for i in range(start, stop, step))
+            if start >= stop:
+                return bytearray()
+            return self.grid.region(start, self.y, stop - start, 1)[0]
+        if not 0 <= x < self.grid.width:
+            raise IndexError("grid column out of range")
+        return self.grid.cell(x, self.y)
+
+    def __len__(self):
+        return self.grid.width
+
+
+class PackedGrid:  # Read-only grid stored one bit per cell, e.g. a view into a mapped file
+    def __init__(self, width, height, data):
+        self.width = width
+        self.height = height
+        self.stride = packed_stride(width)
+        if len(data) < self.stride * height:
+            raise ValueError("Packed grid data is too short")
+        self.data = data  # Any buffer (bytes, memoryview, mmap); rows are never copied eagerly
+
+    @classmethod
+    def from_grid(cls, grid):  # Pack a list, NumPy or chunked grid
+        height = len(grid)
+        width = len(grid[0]) if height else 0
+        return cls(width, height, b"".join(packed_rows(grid, width, height)))
+
+    def cell(self, x, y):  # Cell value (0 or 1), 0 outside the grid
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return 0
+        return (self.data[y * self.stride + (x >> 3)] >> (7 - (x & 7))) & 1
+
+    def is_walkable(self, x, y):  # Same query interface as ChunkedGrid
+        return self.cell(x, y) != 0
+
+    def row(self, y):  # Unpacked row as a bytearray of 0/1 cells
+        start = y * self.stride
+        return unpack_row(self.data[start:start + self.stride], self.width)
+
+    def region(self, x, y, width, height):  # Unpacked rows for a window
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + width, self.width), min(y + height, self.height)
+        return [self.row(row)[x0:x1] for row in range(y0, y1)]
+
+    def walkable_cells(self):  # Row-major 0/1 bytes for the flat pathfinding engine
+        cells = bytearray()
+        for y in range(self.height):
+            cells += self.row(y)
+        return cells
+
+    def __getitem__(self, y):  # grid[y][x] support for existing callers
+        if not 0 <= y < self.height:
+            raise IndexError("grid row out of range")
+        return GridRow(self, y)
+
+    def __len__(self):
+        return self.height
+
+
+def packed_rows(grid, width, height):  # Yield the bit-packed rows of any grid backend
+    if isinstance(grid, PackedGrid):
+        yield bytes(grid.data[: grid.stride * height])
+    elif np is not None and isinstance(grid, np.ndarray):
+        yield np.packbits(grid != 0, axis=1).tobytes()
+    elif isinstance(grid, ChunkedGrid):
+        # One band of chunk rows at a time, so only a band is ever materialized
+        for band in range(0, height, grid.chunk_size):
+            for row in grid.region(0, band, width, grid.chunk_size):
+                yield pack_row(row, width)
+    else:
+        for row in grid:
+            yield pack_row(row, width)
+
+
+def walkable_rows(grid, width, height):  # Yield each row of any grid backend as 0/1 bytes
+    if isinstance(grid, PackedGrid):
+        for y in range(height):
+            yield grid.row(y)
+    elif np is not None and isinstance(grid, np.ndarray):
+        for y in range(height):
+            yield (grid[y] != 0).tobytes()
+    elif isinstance(grid, ChunkedGrid):
+        for band in range(0, height, grid.chunk_size):
+            yield from grid.region(0, band, width, grid.chunk_size)
+    else:
+        for row in grid:
+            try:
+                yield bytes(row)
+            except (TypeError, ValueError):
+                yield bytes(1 if value else 0 for value in row)
+
+
+def label_components(grid):  # ComponentLabels for the 8-connected floor of any grid backend
+    # One pass over the rows: each horizontal run of floor cells is joined (union-find over
+    # run ids) with the runs of the previous row it touches, diagonals included, so only
+    # runs are stored and no per-cell label array has to be filled
+    height = len(grid)
+    width = len(grid[0]) if height else 0
+    parent = []
+
+    def find(run):  # Root of a run, halving the path on the way up
+        while parent[run] != run:
+            parent[run] = parent[parent[run]]
+            run = parent[run]
+        return run
+
+    rows = []
+    previous = []  # (start, end, run id) of the previous row
+    for row in walkable_rows(grid, width, height):
+        current = []
+        index = 0
+        for match in FLOOR_RUN.finditer(row):
+            start, end = match.span()
+            run = len(parent)
+            parent.append(run)
+            # Runs of the row above touching [start - 1, end], i.e. sharing a cell or corner
+            while index < len(previous) and previous[index][1] < start:
+                index += 1
+            scan = index
+            while scan < len(previous) and previous[scan][0] <= end:
+                root, other = find(run), find(previous[scan][2])
+                if root != other:
+                    parent[max(root, other)] = min(root, other)
+                scan += 1
+            current.append((start, end, run))
+        rows.append(current)
+        previous = current
+
+    # Dense component numbers, in order of each component's first run
+    numbers = {}
+    labelled = []
+    for runs in rows:
+        starts, ends, labels = array("l"), array("l"), array("l")
+        for start, end, run in runs:
+            starts.append(start)
+            ends.append(end)
+            labels.append(numbers.setdefault(find(run), len(numbers)))
+        labelled.append((starts, ends, labels))
+    return ComponentLabels(width, height, labelled, len(numbers))
+
+
+class ComponentLabels:  # Connected-component label of every floor cell, stored per run
+    # rows[y] holds (starts, ends, labels) arrays for the floor runs of row y, so a lookup
+    # is a binary search in one row. Opening cells later merges components through a small
+    # union-find over labels. Blocking cells can split a component, which is not tracked:
+    # labels then stay conservative (different labels are always disconnected, equal ones
+    # may no longer be) until the grid is labelled again.
+    def __init__(self, width, height, rows, count):
+        self.width = width
+        self.height = height
+        self.rows = rows
+        self.count = count  # Components, counting merges but not splits since labelling
+        self.next_label = count
+        self.edits = {}  # (x, y) -> label of a cell edited since, -1 if blocked
+        self.merged = {}  # label -> label it was merged into
+
+    def root(self, label):  # Current label after merges
+        while label in self.merged:
+            label = self.merged[label]
+        return label
+
+    def label(self, x, y):  # Component of a floor cell, -1 for walls and outside cells
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return -1
+        label = self.edits.get((x, y))
+        if label is None:
+            starts, ends, labels = self.rows[y]
+            run = bisect_right(starts, x) - 1
+            label = labels[run] if run >= 0 and x < ends[run] else -1
+        return self.root(label) if label >= 0 else -1
+
+    def same_component(self, a, b):  # True when floor cells a and b = (x, y) may be connected
+        label = self.label(*a)
+        return label >= 0 and label == self.label(*b)
+
+    def set_cell(self, x, y, walkable):  # Record a cell edit made after labelling
+        if not walkable:
+            self.edits[(x, y)] = -1
+            return
+        self.edits[(x, y)] = -1  # Not its own neighbor
+        touching = {
+            self.label(x + dx, y + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+        } - {-1}
+        if touching:
+            label = min(touching)
+            for other in touching - {label}:
+                self.merged[other] = label
+                self.count -= 1
+        else:  # A new single-cell component
+            label = self.next_label
+            self.next_label += 1
+            self.count += 1
+        self.edits[(x, y)] = label
+
+    def is_connected(self):  # All floor cells in one component (splits are not tracked)
+        return self.count <= 1
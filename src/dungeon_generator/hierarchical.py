@@ -0,0 +1,376 @@
+import heapq
+from bisect import bisect_left
+
+from .pathfinding import DIAGONAL_COST, AStarPathfinder
+from .spatial import SpatialHash
+
+SEGMENT_BUCKET = 64  # Cells per side of the buckets indexing corridor segments
+ROOM_BUCKET = 64  # Cells per side of the buckets indexing rooms
+
+
+def octile(dx, dy):  # Cost of the shortest 8-connected walk across an open area
+    dx, dy = abs(dx), abs(dy)
+    return max(dx, dy) + (DIAGONAL_COST - 1) * min(dx, dy)
+
+
+def octile_line(x1, y1, x2, y2):  # Cells of that walk: diagonal steps first, then straight
+    # Every cell lies in the bounding box of the endpoints, so the walk stays inside any
+    # rectangle (room) or straight corridor containing both of them
+    step_x = (x2 > x1) - (x2 < x1)
+    step_y = (y2 > y1) - (y2 < y1)
+    cells = [(x1, y1)]
+    x, y = x1, y1
+    while x != x2 or y != y2:
+        if x != x2:
+            x += step_x
+        if y != y2:
+            y += step_y
+        cells.append((x, y))
+    return cells
+
+
+def path_cost(path):  # Total move cost of a list of 8-connected cells
+    return sum(
+        DIAGONAL_COST if x1 != x2 and y1 != y2 else 1.0
+        for (x1, y1), (x2, y2) in zip(path, path[1:])
+    )
+
+
+class Segment:  # Axis-aligned corridor segment with its abstract nodes in order along it
+    def __init__(self, x1, y1, x2, y2):
+        self.horizontal = y1 == y2
+        # Fixed coordinate and the inclusive [low, high] range along the segment
+        self.line = y1 if self.horizontal else x1
+        self.low = min(x1, x2) if self.horizontal else min(y1, y2)
+        self.high = max(x1, x2) if self.horizontal else max(y1, y2)
+        self.stops = set()  # Positions along the segment that become nodes
+        self.positions = []  # Sorted stop positions
+        self.nodes = []  # Node id at each position
+
+    def cell(self, position):  # Grid cell at a position along the segment
+        return (position, self.line) if self.horizontal else (self.line, position)
+
+    def position(self, x, y):  # Position of a cell on the segment, or None if it is off it
+        along, across = (x, y) if self.horizontal else (y, x)
+        if across == self.line and self.low <= along <= self.high:
+            return along
+        return None
+
+
+class HierarchicalPathfinder:  # Plans over rooms and corridors, then refines legs on the grid
+    # The abstract graph is built once per dungeon from the room rectangles and corridor
+    # polylines. Nodes are corridor waypoints, corridor crossings and the cells where a
+    # corridor enters, leaves or runs along a room; edges are straight corridor runs and
+    # octile walks between nodes of one room. A node on a room's border (outside it but
+    # 8-adjacent) is linked only to nodes inside the room. Each leg of an abstract path is
+    # therefore a straight or octile walk within one room or corridor, checked against
+    # the grid and replanned with grid A* only if it is blocked.
+    def __init__(self, grid, rooms, corridors, engine="flat"):
+        self.grid = grid
+        self.pathfinder = AStarPathfinder(grid, engine=engine)  # Leg repair and fallback
+        self.width = self.pathfinder.width
+        self.height = self.pathfinder.height
+        self.is_walkable = self.pathfinder.walkable_query()
+        self.nodes_expanded = 0  # Abstract nodes expanded by the most recent search
+        self.fallbacks = 0  # Queries or legs that needed a grid search
+
+        self.rooms = rooms
+        self.room_index = SpatialHash(ROOM_BUCKET)
+        for room in rooms:
+            self.room_index.insert(room)
+
+        self.node_x = []
+        self.node_y = []
+        self.node_ids = {}  # (x, y) -> node id
+        self.adjacency = []  # node id -> [(neighbor, cost)]
+        self.room_nodes = {}  # room id -> (node ids inside the room, node ids on its border)
+        self.segments = []
+        self.segment_buckets = {}  # (col, row) -> indices of segments crossing the bucket
+        self._build(corridors)
+
+    def _build(self, corridors):  # Abstract graph from rooms and corridor polylines
+        # Non-axis-aligned segments are not indexed; cells only reachable through them
+        # are handled by the grid fallback
+        for corridor in corridors:
+            for (x1, y1), (x2, y2) in zip(corridor, corridor[1:]):
+                x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
+                if x1 == x2 or y1 == y2:
+                    self._add_segment(Segment(x1, y1, x2, y2))
+
+        for segment in self.segments:
+            segment.stops.update((segment.low, segment.high))
+            self._add_room_entrances(segment)
+        junctions = self._add_junctions()
+
+        for segment in self.segments:
+            segment.positions = sorted(segment.stops)
+            segment.nodes = [self._node(*segment.cell(p)) for p in segment.positions]
+            for i in range(1, len(segment.nodes)):
+                self._link(
+                    segment.nodes[i - 1], segment.nodes[i],
+                    segment.positions[i] - segment.positions[i - 1],
+                )
+        for first, first_position, second, second_position, cost in junctions:
+            self._link(
+                self.node_ids[first.cell(first_position)],
+                self.node_ids[second.cell(second_position)],
+                cost,
+            )
+
+        # Nodes inside a room are joined pairwise by octile walks across it, border nodes
+        # to every inside node
+        for node, (x, y) in enumerate(zip(self.node_x, self.node_y)):
+            for room, inside in self.rooms_near(x, y):
+                self.room_nodes.setdefault(room.id, ([], []))[0 if inside else 1].append(node)
+        for inside, border in self.room_nodes.values():
+            for i, a in enumerate(inside):
+                for b in inside[i + 1:] + border:
+                    cost = octile(self.node_x[a] - self.node_x[b], self.node_y[a] - self.node_y[b])
+                    self._link(a, b, cost)
+
+    def _add_segment(self, segment):
+        index = len(self.segments)
+        self.segments.append(segment)
+        x1, y1 = segment.cell(segment.low)
+        x2, y2 = segment.cell(segment.high)
+        # One cell of margin, so segments that only touch still share a bucket
+        for row in range((y1 - 1) // SEGMENT_BUCKET, (y2 + 1) // SEGMENT_BUCKET + 1):
+            for col in range((x1 - 1) // SEGMENT_BUCKET, (x2 + 1) // SEGMENT_BUCKET + 1):
+                self.segment_buckets.setdefault((col, row), []).append(index)
+
+    def _add_room_entrances(self, segment):  # Where the segment enters, leaves or runs along rooms
+        x1, y1 = segment.cell(segment.low)
+        x2, y2 = segment.cell(segment.high)
+        for room in self.room_index.query(x1 - 1, y1 - 1, x2 - x1 + 2, y2 - y1 + 2):
+            if segment.horizontal:
+                across, across_size = room.y, room.height
+                along, along_size = room.x, room.width
+            else:
+                across, across_size = room.x, room.width
+                along, along_size = room.y, room.height
+            if not across - 1 <= segment.line <= across + across_size:
+                continue
+            # Touching span (cells 8-adjacent to the room or in it) and, when the segment
+            # passes through the room, the span inside it
+            spans = [(along - 1, along + along_size)]
+            if across <= segment.line < across + across_size:
+                spans.append((along, along + along_size - 1))
+            for low, high in spans:
+                low, high = max(low, segment.low), min(high, segment.high)
+                if low <= high:
+                    segment.stops.update((low, high))
+
+    def _add_junctions(self):  # Where corridor segments cross, overlap or touch
+        # Returns (segment, position, segment, position, cost) links between the two
+        # segments' nearest cells; a crossing is one shared cell and costs nothing
+        junctions = []
+        seen = set()
+        for indices in self.segment_buckets.values():
+            for i, a in enumerate(indices):
+                for b in indices[i + 1:]:
+                    if (a, b) not in seen:
+                        seen.add((a, b))
+                        junctions.extend(self._touching(self.segments[a], self.segments[b]))
+        for first, first_position, second, second_position, _ in junctions:
+            first.stops.add(first_position)
+            second.stops.add(second_position)
+        return junctions
+
+    @staticmethod
+    def _touching(first, second):  # Junction links between two segments, if 8-adjacent
+        if first.horizontal != second.horizontal:
+            # Nearest cells: each segment clamped to the other's line
+            first_position = min(max(second.line, first.low), first.high)
+            second_position = min(max(first.line, second.low), second.high)
+            dx = abs(first_position - second.line)
+            dy = abs(second_position - first.line)
+            if dx <= 1 and dy <= 1:
+                return [(first, first_position, second, second_position, octile(dx, dy))]
+            return []
+
+        distance = abs(first.line - second.line)
+        if distance > 1:
+            return []
+        low, high = max(first.low, second.low), min(first.high, second.high)
+        if low <= high:
+            # Side by side (or collinear): link both ends of the shared span
+            return [
+                (first, position, second, position, float(distance))
+                for position in sorted({low, high})
+            ]
+        if low - high == 1:  # End to end, possibly diagonally
+            return [
+                (first, position, second, other, octile(1, distance))
+                for position, other in ((first.high, second.low), (first.low, second.high))
+                if abs(position - other) == 1
+            ]
+        return []
+
+    def _node(self, x, y):  # Node id of a cell, created on first use
+        node = self.node_ids.get((x, y))
+        if node is None:
+            node = len(self.node_x)
+            self.node_ids[(x, y)] = node
+            self.node_x.append(x)
+            self.node_y.append(y)
+            self.adjacency.append([])
+        return node
+
+    def _link(self, a, b, cost):
+        if a != b:
+            self.adjacency[a].append((b, cost))
+            self.adjacency[b].append((a, cost))
+
+    def rooms_near(self, x, y):  # (room, inside) for rooms containing or touching the cell
+        return [
+            (room, room.x <= x < room.x + room.width and room.y <= y < room.y + room.height)
+            for room in self.room_index.query(x - 1, y - 1, 2, 2)
+            if room.x - 1 <= x <= room.x + room.width and room.y - 1 <= y <= room.y + room.height
+        ]
+
+    def room_at(self, x, y):  # Room whose floor contains the cell, or None
+        for room in self.room_index.query(x, y, 0, 0):
+            if room.x <= x < room.x + room.width and room.y <= y < room.y + room.height:
+                return room
+        return None
+
+    def segments_at(self, x, y):  # Indexed corridor segments passing through the cell
+        indices = self.segment_buckets.get((x // SEGMENT_BUCKET, y // SEGMENT_BUCKET), ())
+        return [
+            self.segments[i] for i in indices if self.segments[i].position(x, y) is not None
+        ]
+
+    def _links(self, x, y):  # (node, cost) entry points for a cell and the areas it is in
+        node_x, node_y = self.node_x, self.node_y
+        links = []
+        areas = set()
+        for room, inside in self.rooms_near(x, y):
+            inside_nodes, border_nodes = self.room_nodes.get(room.id, ((), ()))
+            nodes = inside_nodes + border_nodes if inside else inside_nodes
+            links.extend((node, octile(node_x[node] - x, node_y[node] - y)) for node in nodes)
+            areas.add(("room" if inside else "border", room.id))
+            if inside:
+                return links, areas  # Every way out of a room goes through its nodes
+
+        for segment in self.segments_at(x, y):
+            # Nearest stops on either side along the segment
+            position = segment.position(x, y)
+            i = bisect_left(segment.positions, position)
+            for j in (i - 1, i):
+                if 0 <= j < len(segment.positions):
+                    links.append((segment.nodes[j], abs(segment.positions[j] - position)))
+            areas.add(("segment", id(segment)))
+        return links, areas
+
+    @staticmethod
+    def _shared(start_areas, goal_areas):  # True if one straight or octile walk joins them
+        if any(kind == "segment" for kind, _ in start_areas & goal_areas):
+            return True
+        start_rooms = {key for kind, key in start_areas if kind == "room"}
+        goal_rooms = {key for kind, key in goal_areas if kind == "room"}
+        start_near = {key for kind, key in start_areas if kind != "segment"}
+        goal_near = {key for kind, key in goal_areas if kind != "segment"}
+        return bool(start_rooms & goal_near or goal_rooms & start_near)
+
+    def find_path(self, start_x, start_y, end_x, end_y):  # Same contract as AStarPathfinder
+        if not (0 <= start_x < self.width and 0 <= start_y < self.height):
+            return None
+        if not (0 <= end_x < self.width and 0 <= end_y < self.height):
+            return None
+        if not self.is_walkable(start_x, start_y) or not self.is_walkable(end_x, end_y):
+            return None
+        self.nodes_expanded = 0
+
+        start_links, start_areas = self._links(start_x, start_y)
+        goal_links, goal_areas = self._links(end_x, end_y)
+        shared = self._shared(start_areas, goal_areas)
+        waypoints = None
+        if start_links or shared:
+            waypoints = self._plan(
+                start_x, start_y, end_x, end_y, start_links, goal_links, shared=shared
+            )
+        if waypoints is None:
+            # Off the abstract graph, or the graph misses a connection the grid has
+            self.fallbacks += 1
+            return self.pathfinder.find_path(start_x, start_y, end_x, end_y)
+        return self._refine(waypoints)
+
+    def _plan(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+        self, start_x, start_y, end_x, end_y, start_links, goal_links, shared
+    ):
+        # A* over the abstract graph with the query cells as temporary start and goal nodes;
+        # returns the waypoint cells of the cheapest route, or None if there is none
+        node_x, node_y, adjacency = self.node_x, self.node_y, self.adjacency
+        goal_costs = {}
+        for node, cost in goal_links:
+            goal_costs[node] = min(cost, goal_costs.get(node, cost))
+
+        # A start and goal in the same room or corridor connect directly
+        best = octile(end_x - start_x, end_y - start_y) if shared else float("inf")
+        best_node = None
+
+        g_score = {}
+        parent = {}
+        open_heap = []
+        for node, cost in start_links:
+            if cost < g_score.get(node, float("inf")):
+                g_score[node] = cost
+                parent[node] = -1
+                h = octile(end_x - node_x[node], end_y - node_y[node])
+                heapq.heappush(open_heap, (cost + h, node))
+
+        closed = set()
+        while open_heap:
+            f, node = heapq.heappop(open_heap)
+            if f >= best:
+                break
+            if node in closed:
+                continue
+            closed.add(node)
+            self.nodes_expanded += 1
+            cost = g_score[node]
+            if node in goal_costs and cost + goal_costs[node] < best:
+                best = cost + goal_costs[node]
+                best_node = node
+            for neighbor, step in adjacency[node]:
+                new_cost = cost + step
+                if neighbor not in closed and new_cost < g_score.get(neighbor, float("inf")):
+                    g_score[neighbor] = new_cost
+                    parent[neighbor] = node
+                    h = octile(end_x - node_x[neighbor], end_y - node_y[neighbor])
+                    heapq.heappush(open_heap, (new_cost + h, neighbor))
+
+        if best_node is None:
+            return [(start_x, start_y), (end_x, end_y)] if shared else None
+        waypoints = [(end_x, end_y)]
+        node = best_node
+        while node != -1:
+            waypoints.append((node_x[node], node_y[node]))
+            node = parent[node]
+        waypoints.append((start_x, start_y))
+        waypoints.reverse()
+        return waypoints
+
+    def _refine(self, waypoints):  # Grid cells along the waypoints, with corners cut
+        is_walkable = self.is_walkable
+        path = [waypoints[0]]
+        for (x1, y1), (x2, y2) in zip(waypoints, waypoints[1:]):
+            leg = octile_line(x1, y1, x2, y2)
+            if not all(is_walkable(x, y) for x, y in leg):
+                # From a room's border, the walk in one of the two directions stays inside
+                leg = octile_line(x2, y2, x1, y1)[::-1]  # pylint: disable=arguments-out-of-order
+            if not all(is_walkable(x, y) for x, y in leg):
+                # The grid disagrees with the dungeon layout here; search this leg only
+                self.fallbacks += 1
+                leg = self.pathfinder.find_path(x1, y1, x2, y2)
+                if leg is None:
+                    return None
+            for cell in leg[1:]:
+                # Skip a cell when its neighbors along the path touch: one move is cheaper
+                if len(path) >= 2 and max(
+                    abs(cell[0] - path[-2][0]), abs(cell[1] - path[-2][1])
+                ) <= 1:
+                    path.pop()
+                if cell != path[-1]:
+                    path.append(cell)
+        return path
@@ -0,0 +1,248 @@
+import heapq
+import math
+
+from .pathfinding import DIAGONAL_COST, MOVES
+
+# Costs are kept as integers in 1/COST_SCALE units: with float costs, keys that should tie
+# can differ in the last bit depending on summation order, and D* Lite stops too early
+COST_SCALE = 1000
+STRAIGHT = COST_SCALE
+DIAGONAL = round(DIAGONAL_COST * COST_SCALE)
+
+
+class PaddedView:  # padded[index] over a walkability query, for grids without a snapshot
+    # Same layout as AStarPathfinder.padded_cells(): row stride width + 2, wall border
+    def __init__(self, is_walkable, width, height):
+        self.is_walkable = is_walkable
+        self.width = width
+        self.height = height
+
+    def __getitem__(self, index):
+        y, x = divmod(index, self.width + 2)
+        if 0 < x <= self.width and 0 < y <= self.height:
+            return self.is_walkable(x - 1, y - 1)
+        return 0
+
+
+class DStarLite:  # Incremental planner that repairs its search after cell edits
+    # D* Lite (Koenig & Likhachev) searches backward from the goal, so g holds each cell's
+    # cost to the goal. When cells change, only the cells whose cost depended on them are
+    # re-expanded; moving the start keeps everything through the km key offset. Edits made
+    # with AStarPathfinder.set_walkable()/set_walkable_cells() are picked up automatically;
+    # anything announced with grid_changed() starts the search over. Cells are indices into
+    # the pathfinder's padded snapshot, so neighbors never need bounds checks.
+    def __init__(self, pathfinder, start_x, start_y, goal_x, goal_y):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self.pathfinder = pathfinder
+        self.width = pathfinder.width
+        self.height = pathfinder.height
+        self.stride = self.width + 2
+        self.offsets = tuple(
+            (dy * self.stride + dx, round(cost * COST_SCALE)) for dx, dy, cost in MOVES
+        )
+        self.start = self.index(start_x, start_y)
+        self.start_x, self.start_y = start_x + 1, start_y + 1  # Padded coordinates
+        self.goal = self.index(goal_x, goal_y)
+        self.nodes_expanded = 0  # Cells expanded by the most recent (re)plan
+        self.planned = None  # Cells expanded by the last plan from scratch
+        self.restarts = 0  # Repairs abandoned for a plan from scratch
+        self.g = {}
+        self.rhs = {}
+        self.open = {}  # cell -> current key; heap entries with another key are stale
+        self.heap = []
+        self.km = 0
+        self.last = self.start  # Start cell when km was last updated
+        self.version = pathfinder.version
+        self.cells = None  # Padded walkability, shared with the pathfinder
+        self.reset()
+        pathfinder.planners.add(self)
+
+    def index(self, x, y):  # Grid cell -> padded index
+        return (y + 1) * self.stride + x + 1
+
+    def reset(self):  # Forget the search tree; the next find_path() plans from scratch
+        self.planned = None
+        self.g.clear()
+        self.rhs = {self.goal: 0}
+        self.open.clear()
+        self.heap = []
+        self.km = 0
+        self.last = self.start
+        self.version = self.pathfinder.version
+        if self.pathfinder.engine == "sparse":  # Chunked and mapped grids are read in place
+            self.cells = PaddedView(self.pathfinder.walkable_query(), self.width, self.height)
+        else:  # Patched in place by set_walkable_cells(), replaced after grid_changed()
+            self.cells = self.pathfinder.padded_cells()
+        self._push(self.goal)
+
+    def heuristic(self, cell):  # Octile distance from the start, exact on an open grid
+        y, x = divmod(cell, self.stride)
+        dx, dy = abs(x - self.start_x), abs(y - self.start_y)
+        return STRAIGHT * (dx + dy) + (DIAGONAL - 2 * STRAIGHT) * min(dx, dy)
+
+    def _key(self, cell):  # (min(g, rhs) + h(start, cell) + km, min(g, rhs))
+        best = min(self.g.get(cell, math.inf), self.rhs.get(cell, math.inf))
+        return (best + self.heuristic(cell) + self.km, best)
+
+    def _push(self, cell):
+        key = self._key(cell)
+        self.open[cell] = key
+        heapq.heappush(self.heap, (key, cell))
+
+    def _best_rhs(self, cell):  # Cheapest move cost + neighbor cost to the goal
+        best = math.inf
+        cells, g = self.cells, self.g
+        if cells[cell]:  # Moves touching a blocked cell cost infinity
+            for offset, move_cost in self.offsets:
+                neighbor = cell + offset
+                if cells[neighbor]:
+                    best = min(best, move_cost + g.get(neighbor, math.inf))
+        return best
+
+    def _queue(self, cell):  # Open list membership follows g != rhs
+        if self.g.get(cell, math.inf) != self.rhs.get(cell, math.inf):
+            self._push(cell)
+        else:
+            self.open.pop(cell, None)
+
+    def _update(self, cell):  # Recompute rhs from scratch, then requeue
+        if cell != self.goal:
+            self.rhs[cell] = self._best_rhs(cell)
+        self._queue(cell)
+
+    def _top_key(self):  # Smallest current key on the open list, skipping stale heap entries
+        heap, current = self.heap, self.open
+        while heap and current.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def _compute(self, limit=None):  # pylint: disable=too-many-locals
+        # Expand cells until the start's cost is settled. Returns False if more than
+        # `limit` cells were expanded first (the repair grew larger than a fresh plan).
+        expanded = 0
+        g, rhs, cells, offsets = self.g, self.rhs, self.cells, self.offsets
+        heap, open_keys = self.heap, self.open
+        start, goal, stride, km = self.start, self.goal, self.stride, self.km
+        start_x, start_y = self.start_x, self.start_y
+        diagonal_extra = DIAGONAL - 2 * STRAIGHT
+        heappush, heappop = heapq.heappush, heapq.heappop
+        inf = math.inf
+        while True:
+            while heap and open_keys.get(heap[0][1]) != heap[0][0]:
+                heappop(heap)  # Stale entry
+            if not heap:
+                break
+            start_g, start_rhs = g.get(start, inf), rhs.get(start, inf)
+            start_best = min(start_g, start_rhs)  # h(start, start) is 0
+            if heap[0][0] >= (start_best + km, start_best) and start_rhs <= start_g:
+                break
+            if limit is not None and expanded > limit:
+                self.nodes_expanded = expanded
+                return False
+            old_key, cell = heappop(heap)
+            old_g, cell_rhs = g.get(cell, inf), rhs.get(cell, inf)
+            best = min(old_g, cell_rhs)
+            y, x = divmod(cell, stride)
+            dx, dy = abs(x - start_x), abs(y - start_y)
+            new_key = (best + STRAIGHT * (dx + dy) + diagonal_extra * min(dx, dy) + km, best)
+            if old_key < new_key:  # Key grew after a start move: requeue
+                open_keys[cell] = new_key
+                heappush(heap, (new_key, cell))
+                continue
+            expanded += 1
+            if old_g > cell_rhs:  # Overconsistent: settle it, else its cost went up
+                g[cell] = cost = cell_rhs
+                del open_keys[cell]
+                for offset, move_cost in offsets:
+                    neighbor = cell + offset
+                    new_cost = move_cost + cost
+                    if cells[neighbor] and neighbor != goal and new_cost < rhs.get(neighbor, inf):
+                        rhs[neighbor] = new_cost
+                        neighbor_g = g.get(neighbor, inf)
+                        if neighbor_g == new_cost:
+                            open_keys.pop(neighbor, None)
+                            continue
+                        best = min(neighbor_g, new_cost)
+                        y, x = divmod(neighbor, stride)
+                        dx, dy = abs(x - start_x), abs(y - start_y)
+                        h = STRAIGHT * (dx + dy) + diagonal_extra * min(dx, dy)
+                        key = (best + h + km, best)
+                        open_keys[neighbor] = key
+                        heappush(heap, (key, neighbor))
+            else:
+                self._raise(cell, old_g)
+        self.nodes_expanded = expanded
+        return True
+
+    def _raise(self, cell, old_g):  # Underconsistent cell: redo the cells that relied on it
+        g, rhs, cells = self.g, self.rhs, self.cells
+        g[cell] = math.inf
+        for offset, move_cost in self.offsets:
+            neighbor = cell + offset
+            if (
+                cells[neighbor] and neighbor != self.goal
+                and rhs.get(neighbor, math.inf) == move_cost + old_g
+            ):
+                rhs[neighbor] = self._best_rhs(neighbor)
+                self._queue(neighbor)
+        self._update(cell)
+
+    def cells_changed(self, cells, version):  # Called by the pathfinder after cell edits
+        if self.version != version - 1:
+            self.reset()  # Missed a grid_changed() in between: the old tree is unreliable
+            return
+        self.version = version
+        for x, y in cells:
+            cell = self.index(x, y)
+            self._update(cell)
+            for offset, _ in self.offsets:
+                if self.cells[cell + offset]:
+                    self._update(cell + offset)
+
+    def move_start(self, x, y):  # The agent moved: keep the search, adjust the key offset
+        self.start = self.index(x, y)
+        self.start_x, self.start_y = x + 1, y + 1
+        self.km += self.heuristic(self.last)
+        self.last = self.start
+
+    def find_path(self):  # Current shortest path from start to goal, or None
+        if self.version != self.pathfinder.version:
+            self.reset()
+        self.nodes_expanded = 0
+        cells = self.cells
+        if not (cells[self.start] and cells[self.goal]):
+            return None
+        if self.planned is None:  # First plan, or restarted: nothing to repair
+            self._compute()
+            self.planned = self.nodes_expanded
+        elif not self._compute(limit=self.planned // 2):
+            # Edits near the goal raise the cost of most of the tree. A raised cell is
+            # expanded twice, so past half the size of a fresh plan, planning again is cheaper
+            expanded = self.nodes_expanded
+            self.reset()
+            self._compute()
+            self.planned = self.nodes_expanded
+            self.nodes_expanded += expanded
+            self.restarts += 1
+        if self.rhs.get(self.start, math.inf) == math.inf:
+            return None
+
+        # Follow the cheapest neighbor (move cost + its cost to goal) down to the goal
+        g, stride, inf = self.g, self.stride, math.inf
+        cell = self.start
+        path = []
+        while True:
+            y, x = divmod(cell, stride)
+            path.append((x - 1, y - 1))
+            if cell == self.goal:
+                break
+            best, best_cost = -1, inf
+            for offset, move_cost in self.offsets:
+                neighbor = cell + offset
+                if cells[neighbor]:
+                    cost = move_cost + g.get(neighbor, inf)
+                    if cost < best_cost:
+                        best, best_cost = neighbor, cost
+            if best < 0 or len(path) > self.width * self.height:
+                return None  # Cannot happen once _compute() has settled the start
+            cell = best
+        return path
@@ -0,0 +1,29 @@
+import time
+from contextlib import contextmanager
+
+
+class GenerationStats:  # Wall time per generation stage plus named counters
+    def __init__(self):
+        self.timings = {}  # Stage name -> seconds
+        self.counters = {}  # Counter name -> number
+
+    @contextmanager
+    def stage(self, name):  # Time a block and add it to the stage total
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, name, amount=1):  # Increment a counter
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set(self, name, value):  # Overwrite a counter (maxima, sizes)
+        self.counters[name] = value
+
+    def as_dict(self):  # Plain, JSON-serializable copy
+        return {"timings": dict(self.timings), "counters": dict(self.counters)}
+
+    def __repr__(self):
+        timings = ", ".join(f"{name}={seconds:.4f}s" for name, seconds in self.timings.items())
+        return f"GenerationStats({timings})"
@@ -4,14 +4,16 @@ from .dungeon import DungeonGenerator
 from .visualization import visualize_dungeon
 
 
-def generate_and_visualize(seed, rooms=None):  # Generating and visualizing
+def generate_and_visualize(seed, rooms=None, output="dungeon.png", show=True):  # Generate and draw
+    # One RNG drives the room count and every generation attempt, so a seed
+    # reproduces the whole run without touching the global random module
+    rng = random.Random(seed)
     if seed is not None:
-        random.seed(seed)
         print(f"Using seed: {seed}")
 
     # Choosing a random room count in the range of 3-100 if not provided
     if rooms is None:
-        rooms = random.randint(3, 100)
+        rooms = rng.randint(3, 100)
     else:
         rooms = max(3, min(100, rooms))
 
@@ -26,6 +28,8 @@ def generate_and_visualize(seed, rooms=None):  # Generating and visualizing
                 max_rooms=rooms,
                 min_room_size=4,
                 max_room_size=10,
+                placement="free_space",
+                rng=rng,
             )
             rooms_list, corridors, _, triangulation, _ = generator.generate()
 
@@ -43,6 +47,8 @@ def generate_and_visualize(seed, rooms=None):  # Generating and visualizing
                 triangulation,
                 width=generator.width,
                 height=generator.height,
+                output=output,
+                show=show,
             )
             return
 
@@ -53,7 +59,7 @@ def generate_and_visualize(seed, rooms=None):  # Generating and visualizing
                 print("Try a different seed or adjusting parameters.")
 
 
-def run_game(rooms=None):
+def run_game(rooms=None, seed=None, size=100):
     try:
         from .game_interface import DungeonExplorer
 
@@ -63,6 +69,8 @@ def run_game(rooms=None):
         print("Controls:")
         print("  • Click anywhere in the rooms to move player")
         print("  • Press R to regenerate dungeon")
+        print("  • Arrows/WASD or right-drag to scroll, mouse wheel or +/- to zoom")
+        print("  • Press C to center the view on the player")
         print("  • Press ESC to quit")
         if rooms:
             print(f"  • Fixed room count: {rooms}")
@@ -70,7 +78,11 @@ def run_game(rooms=None):
             print("  • Random room count: 3-100 per generation")
         print("=" * 60 + "\n")
 
-        explorer = DungeonExplorer(max_rooms=rooms)
+        if seed is not None:
+            print(f"Using seed: {seed}")
+        explorer = DungeonExplorer(
+            dungeon_width=size, dungeon_height=size, max_rooms=rooms, seed=seed
+        )
         explorer.run()
     except ImportError as e:
         print(
@@ -90,10 +102,12 @@ def main(): # Added helper text for usage examples
 Examples:
   %(prog)s --game                    # Random 3-100 rooms each regeneration
   %(prog)s --game --rooms 30         # Always 30 rooms
+  %(prog)s --game --size 2000        # Scroll and zoom around a 2000x2000 map
   %(prog)s --generate                # Random 3-100 rooms
   %(prog)s --generate --rooms 50     # Exactly 50 rooms
   %(prog)s --generate --seed 42      # Reproducible with seed
   %(prog)s --generate --rooms 25 --seed 42  # Both fixed
+  %(prog)s --generate --no-show --output map.png  # Save only, no window
         """,
     )
     parser.add_argument(
@@ -114,6 +128,22 @@ Examples:
         type=int,
         help="Number of rooms to generate (3-100). If omitted, a random count is chosen.",
     )
+    parser.add_argument(
+        "--size",
+        type=int,
+        default=100,
+        help="Width and height of the --game dungeon in cells (default 100).",
+    )
+    parser.add_argument(
+        "--output",
+        default="dungeon.png",
+        help="Path of the --generate PNG (default dungeon.png).",
+    )
+    parser.add_argument(
+        "--no-show",
+        action="store_true",
+        help="Only save the --generate PNG, without opening a window (for batch use).",
+    )
 
     args = parser.parse_args()
 
@@ -130,9 +160,11 @@ Examples:
         rooms = max(3, min(100, rooms))
 
     if args.game:
-        run_game(rooms)
+        if args.size < 10:
+            print("Warning: --size must be at least 10.")
+        run_game(rooms, args.seed, max(10, args.size))
     elif args.generate:
-        generate_and_visualize(args.seed, rooms)
+        generate_and_visualize(args.seed, rooms, args.output, show=not args.no_show)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,21 @@
 import heapq
 import math
+import sys
+import weakref
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .grid import ChunkedGrid, label_components, np, walkable_rows
+
+# 8-directional moves as (dx, dy, cost); diagonal moves cost more
+MOVES = (
+    (0, 1, 1.0), (1, 0, 1.0), (0, -1, 1.0), (-1, 0, 1.0),
+    (1, 1, 1.414), (-1, -1, 1.414), (1, -1, 1.414), (-1, 1, 1.414),
+)
+DIAGONAL_COST = MOVES[4][2]
+MAX_STAMP = 2 ** 32 - 3  # Search stamps are stored as unsigned 32-bit ints
+_PROCESS_WORKER = {}  # The pathfinder of a worker process, set up by start_worker()
 
 
 class Node:  # Represents A* pathfinding node
@@ -25,11 +41,256 @@ class Node:  # Represents A* pathfinding node
         return hash((self.x, self.y))
 
 
+def jump(cells, stride, goal, index, dx, dy):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    # Next jump point from index in direction (dx, dy), or None. Cells are indices into a
+    # walkability snapshot padded with a wall border (see AStarPathfinder.padded_cells).
+    # Diagonal moves only need the target cell to be walkable, as in every engine, so the
+    # forced-neighbor rules are those of the corner-cutting variant.
+    step = dy * stride + dx
+    while True:
+        index += step
+        if not cells[index]:
+            return None
+        if index == goal:
+            return index
+        if dx and dy:
+            row = dy * stride
+            if (not cells[index - dx] and cells[index - dx + row]) or (
+                not cells[index - row] and cells[index + dx - row]
+            ):
+                return index
+            # A straight jump from here reaching a jump point makes this one
+            if (
+                jump(cells, stride, goal, index, dx, 0) is not None
+                or jump(cells, stride, goal, index, 0, dy) is not None
+            ):
+                return index
+        elif dx:
+            if (not cells[index + stride] and cells[index + stride + dx]) or (
+                not cells[index - stride] and cells[index - stride + dx]
+            ):
+                return index
+        elif (not cells[index + 1] and cells[index + 1 + step]) or (
+            not cells[index - 1] and cells[index - 1 + step]
+        ):
+            return index
+
+
+def pruned_directions(cells, stride, index, previous):  # JPS successor directions of a jump point
+    if previous == -1:
+        return [(dx, dy) for dx, dy, _ in MOVES]
+    y, x = divmod(index, stride)
+    py, px = divmod(previous, stride)
+    dx = (x > px) - (x < px)
+    dy = (y > py) - (y < py)
+    if dx and dy:
+        result = [(dx, 0), (0, dy), (dx, dy)]
+        if not cells[index - dx]:
+            result.append((-dx, dy))
+        if not cells[index - dy * stride]:
+            result.append((dx, -dy))
+    elif dx:
+        result = [(dx, 0)]
+        result.extend((dx, side) for side in (1, -1) if not cells[index + side * stride])
+    else:
+        result = [(0, dy)]
+        result.extend((side, dy) for side in (1, -1) if not cells[index + side])
+    return result
+
+
+class PathCache:  # Bounded LRU cache of paths keyed by (start, goal) cell indices
+    # Paths are stored as arrays of row-major cell indices. Every cell of the most recently
+    # stored path through it maps to (key, position), so a query whose endpoints both lie on
+    # one cached path is answered with that slice: a part of a shortest path is a shortest
+    # path, and moves are symmetric, so reversed slices work too. Entries are tied to the
+    # pathfinder's grid version and all dropped once it changes. The version lives on the
+    # pathfinder, not the grid: plain lists cannot report writes, so edits must go through
+    # set_walkable()/set_walkable_cells() or be announced with grid_changed(). A hit whose
+    # path crosses a cell blocked without notice is caught (see AStarPathfinder.find_path);
+    # a cached failure next to a cell opened without notice is not.
+    def __init__(self, width, max_entries=256):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.width = width
+        self.max_entries = max_entries
+        self.version = 0
+        self.entries = OrderedDict()  # (start, goal) -> array("l") of cells, or None
+        self.cells = {}  # cell -> (key, position) on the newest cached path through it
+        self.size = 0  # Bytes held by the path arrays
+        self.hits = 0
+        self.subpath_hits = 0  # Hits served from part of another path (also counted in hits)
+        self.stale = 0  # Hits through a cell blocked without notice (also counted in hits)
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, start, goal, version):  # (found, path); found is False on a miss
+        if version != self.version:
+            self.invalidate()
+            self.version = version
+        key = (start, goal)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True, self.to_path(self.entries[key])
+        on_start, on_goal = self.cells.get(start), self.cells.get(goal)
+        if on_start is not None and on_goal is not None and on_start[0] == on_goal[0]:
+            self.entries.move_to_end(on_start[0])
+            first, last = on_start[1], on_goal[1]
+            cells = self.entries[on_start[0]]
+            if first <= last:
+                cells = cells[first:last + 1]
+            else:
+                cells = cells[last:first + 1][::-1]
+            self.hits += 1
+            self.subpath_hits += 1
+            return True, self.to_path(cells)
+        self.misses += 1
+        return False, None
+
+    def put(self, start, goal, path, version):  # Store a search result (None if unreachable)
+        if version < self.version:
+            return  # Found on a grid that has changed since
+        if version > self.version:  # The grid changed after the last lookup
+            self.invalidate()
+            self.version = version
+        key = (start, goal)
+        if key in self.entries:
+            self._drop(key)
+        width = self.width
+        cells = None if path is None else array("l", (y * width + x for x, y in path))
+        self.entries[key] = cells
+        if cells is not None:
+            self.size += cells.itemsize * len(cells)
+            for position, cell in enumerate(cells):
+                self.cells[cell] = (key, position)
+        while len(self.entries) > self.max_entries:
+            self._drop(next(iter(self.entries)))
+            self.evictions += 1
+
+    def _drop(self, key):  # Remove one entry and the index cells still pointing at it
+        cells = self.entries.pop(key)
+        if cells is None:
+            return
+        self.size -= cells.itemsize * len(cells)
+        for cell in cells:
+            entry = self.cells.get(cell)
+            if entry is not None and entry[0] == key:
+                del self.cells[cell]
+
+    def to_path(self, cells):  # Cell indices -> list of (x, y), None stays None
+        if cells is None:
+            return None
+        width = self.width
+        return [(cell % width, cell // width) for cell in cells]
+
+    def invalidate(self):  # Drop every entry
+        self.entries.clear()
+        self.cells.clear()
+        self.size = 0
+
+    def hit_rate(self):  # Fraction of lookups answered from the cache
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def memory(self):  # Approximate bytes used by the paths, the LRU and the cell index
+        entry = sys.getsizeof((0, 0))
+        return (
+            self.size + sys.getsizeof(self.entries) + len(self.entries) * 2 * entry
+            + sys.getsizeof(self.cells) + len(self.cells) * entry
+        )
+
+    def as_dict(self):  # Counters and sizes, JSON-serializable
+        return {
+            "hits": self.hits,
+            "subpath_hits": self.subpath_hits,
+            "stale": self.stale,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate(),
+            "entries": len(self.entries),
+            "bytes": self.memory(),
+        }
+
+    def __len__(self):
+        return len(self.entries)
+
+
 class AStarPathfinder:
-    def __init__(self, grid):  # Initializing pathfinder with a grid
+    ENGINES = ("flat", "node", "sparse", "jps")
+
+    # By default the flat, node and sparse engines read the grid itself on every search, so
+    # cells written directly (grid[y][x] = 0) are seen right away. snapshot=True promises that
+    # the grid only changes through set_walkable()/set_walkable_cells(), or is announced with
+    # grid_changed(): the flat engine then searches a one-byte-per-cell copy, and component
+    # labels are computed on the first query to reject unreachable goals without a search.
+    # The jps engine, the path cache, flow fields and incremental planners always rely on
+    # snapshots and the grid version, so they need the same promise.
+    def __init__(  # Initializing pathfinder with a grid
+        self, grid, engine="flat", cache_size=0, components=None, snapshot=False
+    ):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown pathfinding engine: {engine}")
         self.grid = grid
         self.height = len(grid)
         self.width = len(grid[0]) if self.height > 0 else 0
+        # Chunked and memory-mapped grids may not fit in memory: a flat snapshot (and the
+        # flat per-cell arrays) would load all of it, so they use the sparse engine instead
+        if engine in ("flat", "jps") and (
+            isinstance(grid, ChunkedGrid) or (np is not None and isinstance(grid, np.memmap))
+        ):
+            engine = "sparse"
+        self.engine = engine
+        self.snapshot = snapshot
+        self.nodes_expanded = 0  # Cells expanded by the most recent search (or batch)
+        self.batch_nodes_expanded = []  # Per-query expansions of the most recent find_paths()
+        self.version = 0  # Bumped by grid_changed(); cached data built for older versions is stale
+        self._walkable = None
+        self._padded = None
+        self._rows = None  # Rows read by the flat engine, see cell_rows()
+        self._buffers = None  # Flat engine search arrays, reused across searches
+        self._stamp = 0  # Generation of the most recent flat search
+        self._workers = []  # Thread-pool clones, kept with their buffers across find_paths()
+        self._processes = None  # WorkerProcesses kept across find_paths(use_processes=True)
+        self.planners = weakref.WeakSet()  # Incremental planners told about cell edits
+        # ComponentLabels (e.g. DungeonGenerator.components); labelled on first use otherwise
+        self._components = components
+        # Optional LRU of recent results, cache_size paths at most
+        self.path_cache = PathCache(self.width, cache_size) if cache_size > 0 else None
+
+    def grid_changed(self):  # Call after editing grid cells: drops the walkability snapshots
+        self.version += 1
+        self._walkable = None
+        self._padded = None
+        self._rows = None
+        self._components = None
+
+    def set_walkable(self, x, y, value):  # Open (truthy value) or block one cell
+        return self.set_walkable_cells([(x, y, value)])
+
+    def set_walkable_cells(self, edits):  # Apply (x, y, value) edits as one grid change
+        # Unlike grid_changed(), the snapshots are patched in place and registered planners
+        # only repair around the edited cells. Returns the cells whose walkability changed.
+        width, height = self.width, self.height
+        changed = []
+        for x, y, value in edits:
+            if not (0 <= x < width and 0 <= y < height):
+                raise ValueError(f"Cell ({x}, {y}) is outside the grid")
+            value = 1 if value else 0
+            if (self.grid[y][x] != 0) == value:
+                continue
+            self.grid[y][x] = value
+            if self._walkable is not None:
+                self._walkable[y * width + x] = value
+            if self._padded is not None:
+                self._padded[(y + 1) * (width + 2) + x + 1] = value
+            if self._components is not None:
+                self._components.set_cell(x, y, value)
+            changed.append((x, y))
+        if changed:
+            self.version += 1
+            for planner in list(self.planners):
+                planner.cells_changed(changed, self.version)
+        return changed
 
     def find_path(self, start_x, start_y, end_x, end_y):  # Find path using A*
         # Validate inputs
@@ -40,6 +301,371 @@ class AStarPathfinder:
         if self.grid[start_y][start_x] == 0 or self.grid[end_y][end_x] == 0:
             return None
 
+        self.nodes_expanded = 0
+        # Cross-component queries fail without a search. Labels are only computed here for
+        # snapshotted grids: a cell opened directly in a live grid could join two components.
+        # Sparse grids may be too large to label on the fly, so they are only checked when
+        # labels were given or requested.
+        labels = self._components
+        if labels is None and self.snapshot and self.engine != "sparse":
+            labels = self.component_labels()
+        if labels is not None and not labels.same_component((start_x, start_y), (end_x, end_y)):
+            return None
+        cache = self.path_cache
+        if cache is not None:
+            start, goal = start_y * self.width + start_x, end_y * self.width + end_x
+            found, path = cache.get(start, goal, self.version)
+            if found and self.path_open(path):
+                return path
+            if found:  # The grid was edited directly: drop everything derived from it
+                cache.stale += 1
+                self.grid_changed()
+        search = {
+            "flat": self._find_path_flat,
+            "sparse": self._find_path_sparse,
+            "jps": self._find_path_jps,
+            "node": self._find_path_nodes,
+        }[self.engine]
+        path = search(start_x, start_y, end_x, end_y)
+        if cache is not None:
+            cache.put(start, goal, path, self.version)
+        return path
+
+    def path_open(self, path):  # False if a cell of a path (None counts as open) is blocked
+        if path is None:
+            return True
+        is_walkable = self.walkable_query()
+        return all(is_walkable(x, y) for x, y in path)
+
+    def component_labels(self):  # ComponentLabels of the grid
+        # Kept for later queries only when they cannot go stale: the grid is snapshotted or
+        # the labels were passed in. A live grid is labelled again on every call.
+        if self._components is not None:
+            return self._components
+        labels = label_components(self.grid)
+        if self.snapshot:
+            self._components = labels
+        return labels
+
+    def same_component(self, a, b):  # False when cells a and b = (x, y) cannot be connected
+        return self.component_labels().same_component(a, b)
+
+    def find_paths(self, pairs, workers=0, use_processes=False):  # Paths for many queries
+        # pairs are ((start_x, start_y), (end_x, end_y)); paths come back in input order and
+        # batch_nodes_expanded holds each query's expansions. With workers > 0 the queries are
+        # split into contiguous chunks solved on a thread or process pool
+        pairs = list(pairs)
+        if workers < 1 or len(pairs) < 2:
+            paths, expanded = solve_batch(self, pairs)
+        else:
+            chunk = -(-len(pairs) // workers)
+            chunks = [pairs[i:i + chunk] for i in range(0, len(pairs), chunk)]
+            # Labels (when find_path would use them) are computed once and shared by every
+            # worker, rather than each worker labelling the whole grid again
+            labels = self._components
+            if labels is None and self.snapshot and self.engine != "sparse":
+                labels = self.component_labels()
+            if use_processes:
+                results = self.worker_processes(len(chunks), labels).map(chunks)
+            else:
+                # Snapshots are built once here and shared, read-only, by every worker
+                if self.engine == "jps":
+                    self.padded_cells()
+                elif self.engine == "flat":
+                    self.cell_rows()
+                with ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+                    results = list(pool.map(solve_batch, self.workers(len(chunks)), chunks))
+            paths = [path for chunk_paths, _ in results for path in chunk_paths]
+            expanded = [count for _, chunk_expanded in results for count in chunk_expanded]
+        self.batch_nodes_expanded = expanded
+        self.nodes_expanded = sum(expanded)
+        return paths
+
+    def worker_processes(self, count, components=None):  # WorkerProcesses holding this grid
+        # The pool is started once and reused, so later batches only send their queries.
+        # Its processes hold a copy of the walkability rows (of the grid itself for the
+        # sparse engine, which is not read ahead); the pool is restarted when the copy is out
+        # of date, that is when the rows differ or after grid_changed(), or when the labels
+        # or more processes are needed
+        grid = self.grid if self.engine == "sparse" else self.snapshot_rows()
+        processes = self._processes
+        if processes is None or not processes.serves(grid, self.version, components, count):
+            self.close()
+            processes = WorkerProcesses(grid, self.engine, components, count, self.version)
+            self._processes = processes
+        return processes
+
+    def close(self):  # Stop the worker processes of find_paths(use_processes=True), if any
+        if self._processes is not None:
+            self._processes.close()
+            self._processes = None
+
+    def workers(self, count):  # Pathfinders sharing this grid and its snapshots
+        # Each clone keeps its own search buffers, so later batches reuse them instead of
+        # allocating 20 bytes per cell per worker again. Workers do not use the cache.
+        while len(self._workers) < count:
+            self._workers.append(
+                AStarPathfinder(self.grid, engine=self.engine, snapshot=self.snapshot)
+            )
+        clones = self._workers[:count]
+        # pylint: disable=protected-access
+        for clone in clones:
+            clone.version = self.version
+            clone._walkable = self._walkable
+            clone._padded = self._padded
+            clone._rows = self._rows
+            clone._components = self._components
+        return clones
+
+    def snapshot_rows(self):  # Current walkability as one bytes row per grid row
+        return list(walkable_rows(self.grid, self.width, self.height))
+
+    def cell_rows(self):  # Rows the flat engine reads, indexed [y][x]
+        # List grids are read in place and NumPy rows through live memoryviews, unless the
+        # pathfinder was created with snapshot=True; packed grids never change and are read
+        # from their unpacked snapshot
+        grid = self.grid
+        if isinstance(grid, list) and not self.snapshot:
+            return grid
+        if self._rows is None:
+            if hasattr(grid, "tobytes") and not self.snapshot:
+                self._rows = [memoryview(row) for row in grid]
+            else:
+                walkable, width = memoryview(self.walkable_cells()), self.width
+                self._rows = [walkable[y * width:(y + 1) * width] for y in range(self.height)]
+        return self._rows
+
+    def walkable_cells(self):  # Row-major walkability snapshot, one byte per cell
+        if self._walkable is None:
+            if hasattr(self.grid, "walkable_cells"):  # Packed grids unpack themselves
+                self._walkable = self.grid.walkable_cells()
+            elif hasattr(self.grid, "tobytes"):  # NumPy arrays
+                self._walkable = bytearray((self.grid != 0).tobytes())
+            else:
+                cells = bytearray()
+                for row in self.grid:
+                    try:
+                        cells += bytes(row)
+                    except (TypeError, ValueError):
+                        cells += bytes(1 if value else 0 for value in row)
+                self._walkable = cells
+        return self._walkable
+
+    def _find_path_flat(self, start_x, start_y, end_x, end_y):  # pylint: disable=too-many-locals
+        # A* over flat arrays indexed by y * width + x; stale heap entries are skipped on pop
+        # The per-cell arrays are allocated once and reused: stamps[i] == opened means
+        # g_score[i] belongs to this search, stamps[i] == opened + 1 that the cell is closed,
+        # and anything older is stale, so nothing has to be cleared between searches
+        width, height = self.width, self.height
+        rows = self.cell_rows()
+        g_score, parent, stamps = self.search_buffers()
+        opened = self._stamp + 1
+        closed = opened + 1
+        self._stamp = closed
+
+        start = start_y * width + start_x
+        goal = end_y * width + end_x
+        hypot = math.hypot
+        heappush, heappop = heapq.heappush, heapq.heappop
+
+        g_score[start] = 0.0
+        parent[start] = -1
+        stamps[start] = opened
+        h = hypot(end_x - start_x, end_y - start_y)
+        # (f, h, index): ties on f prefer cells closer to the goal, then the lower index
+        open_heap = [(h, h, start)]
+        expanded = 0
+
+        while open_heap:
+            _, _, current = heappop(open_heap)
+            if stamps[current] == closed:
+                continue
+            if current == goal:
+                self.nodes_expanded = expanded
+                return self._reconstruct_flat(parent, goal)
+            stamps[current] = closed
+            expanded += 1
+
+            y, x = divmod(current, width)
+            cost = g_score[current]
+            for dx, dy, move_cost in MOVES:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < width and 0 <= ny < height) or not rows[ny][nx]:
+                    continue
+                neighbor = current + dy * width + dx
+                stamp = stamps[neighbor]
+                if stamp == closed:
+                    continue
+                new_cost = cost + move_cost
+                if stamp != opened or new_cost < g_score[neighbor]:
+                    stamps[neighbor] = opened
+                    g_score[neighbor] = new_cost
+                    parent[neighbor] = current
+                    h = hypot(end_x - nx, end_y - ny)
+                    heappush(open_heap, (new_cost + h, h, neighbor))
+
+        self.nodes_expanded = expanded
+        return None  # No path found
+
+    def search_buffers(self):  # (g_score, parent, stamps) arrays sized to the grid
+        size = self.width * self.height
+        if self._buffers is None or self._stamp >= MAX_STAMP:
+            self._buffers = (
+                array("d", [0.0]) * size, array("l", [-1]) * size, array("I", [0]) * size
+            )
+            self._stamp = 0
+        return self._buffers
+
+    def walkable_query(self):  # is_walkable(x, y) callable that reads cells in place
+        if hasattr(self.grid, "is_walkable"):  # Chunked and packed grids
+            return self.grid.is_walkable
+        grid = self.grid
+        if hasattr(grid, "tobytes"):
+            # NumPy arrays (including np.memmap): a flat byte view never copies the array or
+            # loads pages that are not visited, but y * width + x only addresses a cell of a
+            # C-contiguous uint8 array. Other dtypes and strided views are indexed per cell.
+            if grid.dtype == np.uint8 and grid.flags.c_contiguous:
+                cells = memoryview(grid).cast("B")
+                width = self.width
+                return lambda x, y: cells[y * width + x] != 0
+            return lambda x, y: grid[y, x] != 0
+        return lambda x, y: grid[y][x] != 0
+
+    def _find_path_sparse(self, start_x, start_y, end_x, end_y):  # pylint: disable=too-many-locals
+        # Same search as the flat engine, but state lives in dicts keyed by cell index so
+        # memory follows the explored region and cells are only read when reached
+        width, height = self.width, self.height
+        is_walkable = self.walkable_query()
+
+        start = start_y * width + start_x
+        goal = end_y * width + end_x
+        hypot = math.hypot
+        heappush, heappop = heapq.heappush, heapq.heappop
+
+        g_score = {start: 0.0}
+        parent = {start: -1}
+        closed = set()
+        h = hypot(end_x - start_x, end_y - start_y)
+        open_heap = [(h, h, start)]
+        expanded = 0
+
+        while open_heap:
+            _, _, current = heappop(open_heap)
+            if current in closed:
+                continue
+            if current == goal:
+                self.nodes_expanded = expanded
+                return self._reconstruct_flat(parent, goal)
+            closed.add(current)
+            expanded += 1
+
+            y, x = divmod(current, width)
+            cost = g_score[current]
+            for dx, dy, move_cost in MOVES:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                neighbor = current + dy * width + dx
+                if neighbor in closed or not is_walkable(nx, ny):
+                    continue
+                new_cost = cost + move_cost
+                if new_cost < g_score.get(neighbor, math.inf):
+                    g_score[neighbor] = new_cost
+                    parent[neighbor] = current
+                    h = hypot(end_x - nx, end_y - ny)
+                    heappush(open_heap, (new_cost + h, h, neighbor))
+
+        self.nodes_expanded = expanded
+        return None  # No path found
+
+    def padded_cells(self):  # Walkability snapshot with a one-cell wall border
+        # Row stride is width + 2, so neighbor offsets never need bounds checks
+        if self._padded is None:
+            width = self.width
+            walkable = self.walkable_cells()
+            padded = bytearray(width + 2)
+            for y in range(self.height):
+                padded += b"\x00" + walkable[y * width:(y + 1) * width] + b"\x00"
+            padded += bytes(width + 2)
+            self._padded = padded
+        return self._padded
+
+    def _find_path_jps(self, start_x, start_y, end_x, end_y):  # pylint: disable=too-many-locals
+        # Jump Point Search: A* that only expands cells where the optimal path may turn,
+        # over indices into the padded snapshot
+        cells = self.padded_cells()
+        stride = self.width + 2
+        goal = (end_y + 1) * stride + end_x + 1
+
+        def octile(index):  # Admissible distance to the goal for 1 / DIAGONAL_COST moves
+            y, x = divmod(index, stride)
+            dx, dy = abs(end_x + 1 - x), abs(end_y + 1 - y)
+            return max(dx, dy) + (DIAGONAL_COST - 1) * min(dx, dy)
+
+        start = (start_y + 1) * stride + start_x + 1
+        g_score = {start: 0.0}
+        parent = {start: -1}
+        closed = set()
+        h = octile(start)
+        open_heap = [(h, h, start)]
+        expanded = 0
+
+        while open_heap:
+            _, _, current = heapq.heappop(open_heap)
+            if current in closed:
+                continue
+            if current == goal:
+                self.nodes_expanded = expanded
+                return self._expand_jump_points(parent, goal, stride)
+            closed.add(current)
+            expanded += 1
+
+            cost = g_score[current]
+            for dx, dy in pruned_directions(cells, stride, current, parent[current]):
+                point = jump(cells, stride, goal, current, dx, dy)
+                if point is None or point in closed:
+                    continue
+                steps = abs(point - current) // abs(dy * stride + dx)  # Length of the run
+                new_cost = cost + steps * (DIAGONAL_COST if dx and dy else 1.0)
+                if new_cost < g_score.get(point, math.inf):
+                    g_score[point] = new_cost
+                    parent[point] = current
+                    h = octile(point)
+                    heapq.heappush(open_heap, (new_cost + h, h, point))
+
+        self.nodes_expanded = expanded
+        return None  # No path found
+
+    @staticmethod
+    def _expand_jump_points(parent, goal, stride):  # Full cell path through the jump points
+        points = []
+        index = goal
+        while index != -1:
+            y, x = divmod(index, stride)
+            points.append((x - 1, y - 1))  # Padded index -> grid cell
+            index = parent[index]
+        points.reverse()
+
+        path = [points[0]]
+        for (x1, y1), (x2, y2) in zip(points, points[1:]):
+            # Consecutive jump points are joined by one straight or diagonal run
+            dx = (x2 > x1) - (x2 < x1)
+            dy = (y2 > y1) - (y2 < y1)
+            for step in range(1, max(abs(x2 - x1), abs(y2 - y1)) + 1):
+                path.append((x1 + step * dx, y1 + step * dy))
+        return path
+
+    def _reconstruct_flat(self, parent, goal):  # Walk parent links back to the start
+        width = self.width
+        path = []
+        index = goal
+        while index != -1:
+            y, x = divmod(index, width)
+            path.append((x, y))
+            index = parent[index]
+        return list(reversed(path))
+
+    def _find_path_nodes(self, start_x, start_y, end_x, end_y):  # Original Node-based A*
         start_node = Node(
             start_x, start_y, 0, self.heuristic(start_x, start_y, end_x, end_y)
         )
@@ -57,12 +683,10 @@ class AStarPathfinder:
                 return self.reconstruct_path(current_node)
 
             closed_set.add((current_node.x, current_node.y))
+            self.nodes_expanded += 1
 
             # 8-directional movement
-            for dx, dy in [
-                (0, 1), (1, 0), (0, -1), (-1, 0),
-                (1, 1), (-1, -1), (1, -1), (-1, 1),
-            ]:
+            for dx, dy, move_cost in MOVES:
                 nx, ny = current_node.x + dx, current_node.y + dy
 
                 # Checking bounds and walkability
@@ -73,8 +697,7 @@ class AStarPathfinder:
                 if (nx, ny) in closed_set:
                     continue
 
-                # Calculating cost (diagonal moves cost more)
-                move_cost = 1.414 if dx != 0 and dy != 0 else 1.0
+                # Diagonal moves cost more (see MOVES)
                 new_cost = current_node.cost + move_cost
 
                 # Check if this path to neighbor is better
@@ -103,3 +726,49 @@ class AStarPathfinder:
             path.append((node.x, node.y))
             node = node.parent
         return list(reversed(path))
+
+
+def solve_batch(pathfinder, pairs):  # (paths, nodes expanded per query) for a list of pairs
+    paths, expanded = [], []
+    for (start_x, start_y), (end_x, end_y) in pairs:
+        paths.append(pathfinder.find_path(start_x, start_y, end_x, end_y))
+        expanded.append(pathfinder.nodes_expanded)
+    return paths, expanded
+
+
+def start_worker(grid, engine, components=None):  # Process pool initializer
+    # One pathfinder per process, so its buffers are reused by every batch it solves
+    _PROCESS_WORKER["pathfinder"] = AStarPathfinder(grid, engine=engine, components=components)
+
+
+def solve_batch_in_worker(pairs):  # Process pool entry point
+    return solve_batch(_PROCESS_WORKER["pathfinder"], pairs)
+
+
+class WorkerProcesses:  # Process pool whose workers each hold a pathfinder over one grid
+    # Dropping the last reference shuts the processes down, close() does it right away
+    def __init__(
+        self, grid, engine, components, count, version
+    ):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self.grid = grid
+        self.components = components
+        self.count = count
+        self.version = version
+        self.pool = ProcessPoolExecutor(
+            max_workers=count, initializer=start_worker, initargs=(grid, engine, components)
+        )
+
+    def serves(self, grid, version, components, count):  # True if usable for this batch
+        # Rows are compared by value: a live grid may have been written since the pool started
+        return (
+            self.count >= count
+            and self.version == version
+            and self.components is components
+            and (self.grid is grid or self.grid == grid)
+        )
+
+    def map(self, chunks):  # solve_batch results for each chunk of pairs, in order
+        return list(self.pool.map(solve_batch_in_worker, chunks))
+
+    def close(self):  # Stop the processes; batches are synchronous, so none is running
+        self.pool.shutdown(cancel_futures=True)
@@ -0,0 +1,131 @@
+class FreeSpace:  # Maximal free rectangles (MaxRects) over a cell area
+    # Rectangles are (x, y, width, height) in cells. A room of size w x h occupies the
+    # closed footprint [x, x + w] x [y, y + h] (see Room.intersects), so it needs a free
+    # area of (w + 1) x (h + 1) cells; disjoint footprints never intersect.
+    def __init__(self, x, y, width, height, *, bucket_size=32, probes=16):
+        self.bucket_size = bucket_size
+        self.probes = probes  # Random rectangles tried before scanning all of them
+        self.rects = []
+        self.positions = {}  # Rectangle -> index in self.rects, for O(1) removal
+        self.buckets = {}  # Bucket coordinates -> rectangles overlapping that bucket
+        if width > 0 and height > 0:
+            self._add((x, y, width, height))
+
+    def _bucket_range(self, x, y, width, height):
+        size = self.bucket_size
+        return (
+            range(x // size, (x + width - 1) // size + 1),
+            range(y // size, (y + height - 1) // size + 1),
+        )
+
+    def _add(self, rect):
+        self.positions[rect] = len(self.rects)
+        self.rects.append(rect)
+        cols, rows = self._bucket_range(*rect)
+        for row in rows:
+            for col in cols:
+                self.buckets.setdefault((col, row), set()).add(rect)
+
+    def _remove(self, rect):
+        # Swap with the last rectangle so removal stays O(1)
+        index = self.positions.pop(rect)
+        last = self.rects.pop()
+        if last != rect:
+            self.rects[index] = last
+            self.positions[last] = index
+        cols, rows = self._bucket_range(*rect)
+        for row in rows:
+            for col in cols:
+                bucket = self.buckets[(col, row)]
+                bucket.discard(rect)
+                if not bucket:
+                    del self.buckets[(col, row)]
+
+    def _nearby(self, x, y, width, height):  # Rectangles sharing a bucket with the area
+        cols, rows = self._bucket_range(x, y, width, height)
+        found = set()
+        for row in rows:
+            for col in cols:
+                found.update(self.buckets.get((col, row), ()))
+        return found
+
+    def candidates(self, width, height):  # Free rects that fit a w x h cell block
+        return [r for r in self.rects if r[2] >= width and r[3] >= height]
+
+    def sample(self, rng, width, height):  # Random top-left corner for a w x h block, or None
+        # Cheap probes first: while the area is still open most rectangles fit
+        rects = self.rects
+        for _ in range(self.probes if rects else 0):
+            rx, ry, rw, rh = rects[rng.randrange(len(rects))]
+            if rw >= width and rh >= height:
+                return rng.randint(rx, rx + rw - width), rng.randint(ry, ry + rh - height)
+
+        fitting = self.candidates(width, height)
+        if not fitting:
+            return None
+        # Weight each rectangle by how many positions it offers for the block
+        weights = [(r[2] - width + 1) * (r[3] - height + 1) for r in fitting]
+        rx, ry, rw, rh = rng.choices(fitting, weights=weights)[0]
+        return rng.randint(rx, rx + rw - width), rng.randint(ry, ry + rh - height)
+
+    def fit(self, rng, width, height, min_width, min_height):  # Place a block, shrinking if needed
+        # Returns (x, y, width, height) or None when not even the minimum block fits
+        spot = self.sample(rng, width, height)
+        if spot is not None:
+            return spot[0], spot[1], width, height
+
+        fitting = self.candidates(min_width, min_height)
+        if not fitting:
+            return None
+        # Shrink the block to the chosen rectangle, never below the minimum size
+        rx, ry, rw, rh = rng.choices(fitting, weights=[r[2] * r[3] for r in fitting])[0]
+        width, height = min(width, rw), min(height, rh)
+        return (
+            rng.randint(rx, rx + rw - width),
+            rng.randint(ry, ry + rh - height),
+            width,
+            height,
+        )
+
+    def occupy(self, x, y, width, height):  # Remove a block, keeping rectangles maximal
+        near = []
+        pieces = []
+        # Only rectangles within one cell of the block can be split or contain a new piece
+        for rect in sorted(self._nearby(x - 1, y - 1, width + 2, height + 2)):
+            rx, ry, rw, rh = rect
+            if x >= rx + rw or x + width <= rx or y >= ry + rh or y + height <= ry:
+                # Untouched, but may touch the block's one-cell border
+                if x <= rx + rw and x + width >= rx and y <= ry + rh and y + height >= ry:
+                    near.append(rect)
+                continue
+            self._remove(rect)
+            # Up to four maximal pieces around the occupied block
+            if x > rx:
+                pieces.append((rx, ry, x - rx, rh))
+            if x + width < rx + rw:
+                pieces.append((x + width, ry, rx + rw - x - width, rh))
+            if y > ry:
+                pieces.append((rx, ry, rw, y - ry))
+            if y + height < ry + rh:
+                pieces.append((rx, y + height, rw, ry + rh - y - height))
+
+        # Untouched rectangles were maximal before and every piece lies inside an old
+        # rectangle, so only the new pieces can be redundant. Each piece borders the
+        # block, so any rectangle containing it must touch the block's border too.
+        kept = []
+        for piece in sorted(set(pieces), key=lambda r: (-r[2] * r[3], r)):
+            if not self._contained(piece, near) and not self._contained(piece, kept):
+                kept.append(piece)
+        for piece in kept:
+            self._add(piece)
+
+    @staticmethod
+    def _contained(rect, others):  # True if rect lies inside any of the others
+        x, y, w, h = rect
+        return any(
+            ox <= x and oy <= y and x + w <= ox + ow and y + h <= oy + oh
+            for ox, oy, ow, oh in others
+        )
+
+    def __len__(self):
+        return len(self.rects)
@@ -0,0 +1,58 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .dungeon import DungeonGenerator
+
+
+def build_dungeon(width, height, max_rooms, seed, max_attempts=10):  # (rooms, grid), retrying
+    # Worker entry point; attempts after the first use derived seeds so they differ
+    error = None
+    for attempt in range(max_attempts):
+        try:
+            generator = DungeonGenerator(
+                width=width,
+                height=height,
+                max_rooms=max_rooms,
+                min_room_size=4,
+                max_room_size=10,
+                placement="free_space",
+                seed=seed + attempt,
+            )
+            rooms, _, _, _, grid = generator.generate()
+            # Ensure minimum 3 rooms for triangulation, all reachable from each other
+            if len(rooms) >= 3 and generator.is_connected():
+                return rooms, grid
+        except Exception as e:
+            error = e
+    raise RuntimeError("Could not generate a connected dungeon with minimum 3 rooms") from error
+
+
+class DungeonPrefetcher:  # Keeps upcoming dungeons generating in a background worker
+    # next_params() is called on the caller's thread when a dungeon is queued, so the
+    # sequence of dungeons depends only on the caller's RNG, never on worker timing.
+    # A process worker keeps generation off the interpreter running the render loop.
+    def __init__(self, next_params, depth=2, use_processes=True):
+        if depth < 1:
+            raise ValueError("Prefetch depth must be at least 1")
+        self.next_params = next_params
+        self.depth = depth
+        executor = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self.pool = executor(max_workers=1)
+        self.pending = deque()  # Futures in the order they will be handed out
+        self.fill()
+
+    def fill(self):  # Queue dungeons until `depth` are ready or in progress
+        while len(self.pending) < self.depth:
+            self.pending.append(self.pool.submit(build_dungeon, **self.next_params()))
+
+    def ready(self):  # True when take() would not block
+        return bool(self.pending) and self.pending[0].done()
+
+    def take(self):  # Next dungeon as (rooms, grid); blocks if it is still generating
+        future = self.pending.popleft()
+        self.fill()
+        return future.result()  # Re-raises the worker's error if generation failed
+
+    def close(self):  # Stop the worker, dropping queued dungeons
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.pending.clear()
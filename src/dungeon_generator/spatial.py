@@ -0,0 +1,43 @@
+class SpatialHash:  # Uniform-grid bucket index over axis-aligned rectangles (rooms)
+    def __init__(self, cell_size):
+        if cell_size < 1:
+            raise ValueError("Spatial hash cell size must be at least 1")
+        self.cell_size = int(cell_size)
+        self.buckets = {}
+        self.count = 0
+
+    def _cell_range(self, x, y, width, height):  # Bucket coordinates covered by a rectangle
+        # Rooms are treated as closed intervals [x, x + width], matching Room.intersects
+        size = self.cell_size
+        return (
+            range(x // size, (x + width) // size + 1),
+            range(y // size, (y + height) // size + 1),
+        )
+
+    def insert(self, item):  # Add a rectangle-like item (x, y, width, height attributes)
+        cols, rows = self._cell_range(item.x, item.y, item.width, item.height)
+        for row in rows:
+            for col in cols:
+                self.buckets.setdefault((col, row), []).append(item)
+        self.count += 1
+
+    def query(self, x, y, width, height):  # Items in buckets overlapping the rectangle
+        cols, rows = self._cell_range(x, y, width, height)
+        found = {}
+        for row in rows:
+            for col in cols:
+                for item in self.buckets.get((col, row), ()):
+                    found[id(item)] = item
+        return list(found.values())
+
+    def intersects_any(self, room):  # True if any indexed room intersects the given room
+        cols, rows = self._cell_range(room.x, room.y, room.width, room.height)
+        for row in rows:
+            for col in cols:
+                for other in self.buckets.get((col, row), ()):
+                    if room.intersects(other):
+                        return True
+        return False
+
+    def __len__(self):
+        return self.count
@@ -0,0 +1,159 @@
+import mmap
+import struct
+
+from .dungeon import Room
+from .grid import PackedGrid, packed_rows, packed_stride
+
+# Binary dungeon file, all integers little-endian:
+#   header    HEADER (magic, version, flags, sizes, grid offset)
+#   rooms     room_count x ROOM_RECORD (id, x, y, width, height)
+#   corridors segment_count x SEGMENT_RECORD (corridor index, x1, y1, x2, y2)
+#   edges     edge_count x EDGE_RECORD (room index, room index), i < j
+#   grid      height rows of packed_stride(width) bytes, one bit per cell, MSB first
+MAGIC = b"DGNF"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIIIIIQ")
+ROOM_RECORD = struct.Struct("<iiiii")
+SEGMENT_RECORD = struct.Struct("<iiiii")
+EDGE_RECORD = struct.Struct("<II")
+
+
+class DungeonFile:  # A loaded dungeon; the grid may be a view into a memory-mapped file
+    def __init__(  # pylint: disable=too-many-positional-arguments
+        self, width, height, rooms, corridors, edges, grid, *, version=VERSION, mapping=None,
+        buffer=None,
+    ):
+        self.version = version
+        self.width = width
+        self.height = height
+        self.rooms = rooms
+        self.corridors = corridors
+        self.edges = edges  # (room index, room index) pairs of the room graph
+        self.grid = grid  # PackedGrid
+        self._mapping = mapping  # Open mmap backing grid.data, if any
+        self._buffer = buffer  # memoryview over the mapping
+
+    def close(self):  # Release the memory map; the grid is unusable afterwards
+        if self._mapping is None:
+            return
+        self.grid.data.release()
+        self._buffer.release()
+        self._mapping.close()
+        self._mapping = None
+        self._buffer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def room_edges(rooms):  # Unique (i, j) room-graph edges from Room.connections
+    edges = set()
+    for room in rooms:
+        for other in room.connections:
+            edges.add((min(room.id, other), max(room.id, other)))
+    return sorted(edges)
+
+
+def save(path, dungeon):  # Write a generated dungeon (DungeonGenerator or DungeonFile)
+    if dungeon.grid is None:
+        raise ValueError("Dungeon has no grid; call generate() before saving")
+    width, height = dungeon.width, dungeon.height
+    segments = [
+        (index, int(x1), int(y1), int(x2), int(y2))
+        for index, corridor in enumerate(dungeon.corridors)
+        for (x1, y1), (x2, y2) in zip(corridor, corridor[1:])
+    ]
+    edges = room_edges(dungeon.rooms)
+    grid_offset = (
+        HEADER.size
+        + len(dungeon.rooms) * ROOM_RECORD.size
+        + len(segments) * SEGMENT_RECORD.size
+        + len(edges) * EDGE_RECORD.size
+    )
+
+    with open(path, "wb") as handle:
+        handle.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                0,
+                width,
+                height,
+                len(dungeon.rooms),
+                len(dungeon.corridors),
+                len(segments),
+                len(edges),
+                grid_offset,
+            )
+        )
+        handle.write(
+            b"".join(
+                ROOM_RECORD.pack(room.id, room.x, room.y, room.width, room.height)
+                for room in dungeon.rooms
+            )
+        )
+        handle.write(b"".join(SEGMENT_RECORD.pack(*segment) for segment in segments))
+        handle.write(b"".join(EDGE_RECORD.pack(*edge) for edge in edges))
+        for chunk in packed_rows(dungeon.grid, width, height):
+            handle.write(chunk)
+
+
+def read_rooms(buffer, offset, count):  # Room objects from the fixed-width room table
+    return [
+        Room(x, y, width, height, room_id)
+        for room_id, x, y, width, height in ROOM_RECORD.iter_unpack(
+            buffer[offset:offset + count * ROOM_RECORD.size]
+        )
+    ]
+
+
+def read_corridors(buffer, offset, corridor_count, segment_count):  # Corridor polylines
+    corridors = [[] for _ in range(corridor_count)]
+    for index, x1, y1, x2, y2 in SEGMENT_RECORD.iter_unpack(
+        buffer[offset:offset + segment_count * SEGMENT_RECORD.size]
+    ):
+        # Consecutive segments of a corridor share their joint point
+        if not corridors[index]:
+            corridors[index].append((x1, y1))
+        corridors[index].append((x2, y2))
+    return corridors
+
+
+def load(path, use_mmap=True):  # Read a dungeon file; the grid is mapped, not copied
+    with open(path, "rb") as handle:
+        if use_mmap:
+            mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            buffer = memoryview(mapping)
+        else:
+            mapping = None
+            buffer = memoryview(handle.read())
+
+    if len(buffer) < HEADER.size:
+        raise ValueError(f"{path} is not a dungeon file")
+    magic, version, _, width, height, *counts, grid_offset = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a dungeon file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported dungeon file version {version} (expected {VERSION})")
+    room_count, corridor_count, segment_count, edge_count = counts
+
+    offset = HEADER.size
+    rooms = read_rooms(buffer, offset, room_count)
+    offset += room_count * ROOM_RECORD.size
+    corridors = read_corridors(buffer, offset, corridor_count, segment_count)
+    offset += segment_count * SEGMENT_RECORD.size
+
+    edges = list(EDGE_RECORD.iter_unpack(buffer[offset:offset + edge_count * EDGE_RECORD.size]))
+    for i, j in edges:
+        rooms[i].connections.append(j)
+        rooms[j].connections.append(i)
+
+    grid_size = packed_stride(width) * height
+    grid = PackedGrid(width, height, buffer[grid_offset:grid_offset + grid_size])
+    return DungeonFile(
+        width, height, rooms, corridors, edges, grid, version=version, mapping=mapping,
+        buffer=buffer,
+    )
@@ -1,62 +1,80 @@
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection, PatchCollection
+from matplotlib.figure import Figure
 from matplotlib.patches import Rectangle
 
-def visualize_dungeon(
-    rooms, corridors, triangulation=None, width=100, height=100
-):
-    _, ax = plt.subplots(figsize=(12, 12))
+LABEL_LIMIT = 200  # Room IDs are drawn only on maps with at most this many rooms
+
+
+def visualize_dungeon(  # pylint: disable=too-many-arguments
+    rooms,
+    corridors,
+    triangulation=None,
+    width=100,
+    height=100,
+    *,
+    output="dungeon.png",
+    show=True,
+    label_limit=LABEL_LIMIT,
+    dpi=150,
+):  # Draw the map, save it to output (skipped when None) and return the Figure
+    # Every layer is one collection, so drawing cost no longer grows with one artist per
+    # triangle, segment and room. With show=False the figure is rendered on an Agg canvas
+    # without pyplot: nothing opens a window, blocks or stays registered with pyplot.
+    if show:
+        figure, ax = plt.subplots(figsize=(12, 12))
+    else:
+        figure = Figure(figsize=(12, 12))
+        FigureCanvasAgg(figure)
+        ax = figure.add_subplot()
     ax.set_facecolor("black")
 
     # Plot Delaunay triangulation
     if triangulation:
-        for triangle in triangulation.triangles:
-            vertices = triangle.vertices
-            pts = [
-                (vertices[0].x, vertices[0].y),
-                (vertices[1].x, vertices[1].y),
-                (vertices[2].x, vertices[2].y),
-                (vertices[0].x, vertices[0].y),
-            ]
-            ax.plot(*zip(*pts), color="blue", linestyle=":", alpha=0.4, zorder=1)
+        outlines = [
+            [(v.x, v.y) for v in (*triangle.vertices, triangle.vertices[0])]
+            for triangle in triangulation.triangles
+        ]
+        ax.add_collection(
+            LineCollection(outlines, colors="blue", linestyles=":", alpha=0.4, zorder=1)
+        )
 
-    # Plot corridors
-    for corridor in corridors:
-        for i in range(len(corridor) - 1):
-            x1, y1 = corridor[i]
-            x2, y2 = corridor[i + 1]
-            ax.plot([x1, x2], [y1, y2], color="gray", linewidth=2, zorder=2)
+    # Plot corridors, each one polyline
+    ax.add_collection(LineCollection(corridors, colors="gray", linewidths=2, zorder=2))
 
     # Plot rooms
-    for room in rooms:
-        ax.add_patch(
-            Rectangle(
-                (room.x, room.y),
-                room.width,
-                room.height,
-                fill=True,
-                facecolor="darkslateblue",
-                edgecolor="white",
-                linewidth=1,
-                alpha=0.9,
-                zorder=3,
-            )
-        )
-        # Room IDs
-        ax.text(
-            room.center.x,
-            room.center.y,
-            str(room.id),
-            color="white",
-            ha="center",
-            va="center",
-            fontsize=8,
-            zorder=4,
+    ax.add_collection(
+        PatchCollection(
+            [Rectangle((room.x, room.y), room.width, room.height) for room in rooms],
+            facecolor="darkslateblue",
+            edgecolor="white",
+            linewidth=1,
+            alpha=0.9,
+            zorder=3,
         )
+    )
+    # Room IDs, unreadable (and slow to lay out) on large maps
+    if len(rooms) <= label_limit:
+        for room in rooms:
+            ax.text(
+                room.center.x,
+                room.center.y,
+                str(room.id),
+                color="white",
+                ha="center",
+                va="center",
+                fontsize=8,
+                zorder=4,
+            )
 
     ax.set_xlim(0, width)
     ax.set_ylim(0, height)
     ax.set_aspect("equal")
     ax.set_title("Procedural Dungeon (Delaunay + MST)")
-    plt.savefig("dungeon.png", dpi=150, bbox_inches="tight")
-    print("Dungeon map saved to dungeon.png")
-    plt.show()
+    if output is not None:
+        figure.savefig(output, dpi=dpi, bbox_inches="tight")
+        print(f"Dungeon map saved to {output}")
+    if show:
+        plt.show()
+    return figure
@@ -0,0 +1,78 @@
+# Batch pathfinding benchmark: many short NPC queries per tick, find_path loop vs find_paths
+# speedup compares a find_path loop with searches that each allocate their own arrays
+# Run from src/: python -m tests.benchmarks.bench_batch [--sizes 200 400] [--queries 500]
+import argparse
+import random
+import time
+
+from dungeon_generator.dungeon import DungeonGenerator
+from dungeon_generator.pathfinding import AStarPathfinder
+
+
+def nearby_queries(rooms, count, seed):  # Short NPC moves: start and end in the same room
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(count):
+        room = rng.choice(rooms)
+        xs = range(room.x, room.x + room.width)
+        ys = range(room.y, room.y + room.height)
+        pairs.append(((rng.choice(xs), rng.choice(ys)), (rng.choice(xs), rng.choice(ys))))
+    return pairs
+
+
+def timed_loop(grid, pairs):  # Seconds for a plain find_path loop on one pathfinder
+    pathfinder = AStarPathfinder(grid)
+    start = time.perf_counter()
+    for (sx, sy), (ex, ey) in pairs:
+        pathfinder.find_path(sx, sy, ex, ey)
+    return time.perf_counter() - start
+
+
+def timed_allocating(grid, pairs):  # Seconds when every search allocates its own arrays
+    start = time.perf_counter()
+    for (sx, sy), (ex, ey) in pairs:
+        AStarPathfinder(grid).find_path(sx, sy, ex, ey)
+    return time.perf_counter() - start
+
+
+def timed_batch(grid, pairs, **options):  # Seconds for one find_paths call, pools started
+    pathfinder = AStarPathfinder(grid)
+    pathfinder.find_paths(pairs, **options)  # Start any pool outside the timing
+    start = time.perf_counter()
+    pathfinder.find_paths(pairs, **options)
+    elapsed = time.perf_counter() - start
+    pathfinder.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched pathfinding")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 400, 800])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(
+        f"{'size':>6} {'queries':>8} {'allocate per search (s)':>24} {'loop (s)':>9} "
+        f"{'batch (s)':>10} {'threads (s)':>12} {'processes (s)':>14} {'speedup':>8}"
+    )
+    for size in args.sizes:
+        gen = DungeonGenerator(width=size, height=size, max_rooms=max(10, size * size // 1500),
+                               placement="free_space", seed=args.seed)
+        rooms, _, _, _, grid = gen.generate()
+        pairs = nearby_queries(rooms, args.queries, args.seed)
+
+        allocating = timed_allocating(grid, pairs)
+        loop = timed_loop(grid, pairs)
+        batch = timed_batch(grid, pairs)
+        threads = timed_batch(grid, pairs, workers=args.workers)
+        processes = timed_batch(grid, pairs, workers=args.workers, use_processes=True)
+        print(
+            f"{size:>6} {len(pairs):>8} {allocating:>24.3f} {loop:>9.3f} {batch:>10.3f} "
+            f"{threads:>12.3f} {processes:>14.3f} {allocating / loop:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
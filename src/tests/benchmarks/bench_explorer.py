@@ -0,0 +1,53 @@
+# Explorer frame-time benchmark: draw() cost while the player walks a long path
+# Run from src/: python -m tests.benchmarks.bench_explorer [--sizes 100 400]
+# Uses SDL's dummy video driver, so no window opens and only drawing is measured.
+import argparse
+import contextlib
+import io
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from dungeon_generator.game_interface import DungeonExplorer  # pylint: disable=wrong-import-position
+
+
+def frame_times(size, frames, seed):  # Sorted per-frame seconds of update() + draw()
+    with contextlib.redirect_stdout(io.StringIO()):  # Hide the explorer's progress messages
+        explorer = DungeonExplorer(
+            dungeon_width=size, dungeon_height=size, max_rooms=100, seed=seed
+        )
+    try:
+        target = explorer.rooms[-1]
+        explorer.path = explorer.pathfinder.find_path(
+            explorer.player_x, explorer.player_y, int(target.center.x), int(target.center.y)
+        )
+        explorer.draw()  # First frame draws the whole cached floor
+        times = []
+        for _ in range(frames):
+            start = time.perf_counter()
+            explorer.update(explorer.move_delay)  # One step along the path per frame
+            explorer.draw()
+            times.append(time.perf_counter() - start)
+        return sorted(times)
+    finally:
+        explorer.prefetcher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DungeonExplorer frame times")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 200, 400])
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'size':>6} {'median (ms)':>12} {'p99 (ms)':>9} {'fps (median)':>13}")
+    for size in args.sizes:
+        times = frame_times(size, args.frames, args.seed)
+        median = times[len(times) // 2]
+        p99 = times[min(len(times) - 1, int(len(times) * 0.99))]
+        print(f"{size:>6} {median * 1000:>12.2f} {p99 * 1000:>9.2f} {1 / median:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
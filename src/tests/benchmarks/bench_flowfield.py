@@ -0,0 +1,63 @@
+# Flow field benchmark: many agents heading to one goal, per-agent A* vs one shared field
+# Run from src/: python -m tests.benchmarks.bench_flowfield [--sizes 200 400] [--agents 500]
+import argparse
+import random
+import time
+
+from dungeon_generator.dungeon import DungeonGenerator
+from dungeon_generator.flowfield import FlowFieldCache
+from dungeon_generator.pathfinding import AStarPathfinder
+
+
+def agents_in_rooms(rooms, count, seed):  # Random room cells, one per agent
+    rng = random.Random(seed)
+    agents = []
+    for _ in range(count):
+        room = rng.choice(rooms)
+        agents.append((rng.randrange(room.x, room.x + room.width),
+                       rng.randrange(room.y, room.y + room.height)))
+    return agents
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark flow fields against per-agent A*")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 200, 400])
+    parser.add_argument("--agents", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(
+        f"{'size':>6} {'agents':>7} {'A* (s)':>9} {'field build (ms)':>17} "
+        f"{'steps (ms)':>11} {'speedup':>8}"
+    )
+    for size in args.sizes:
+        gen = DungeonGenerator(width=size, height=size, max_rooms=max(10, size * size // 1500),
+                               placement="free_space", seed=args.seed)
+        rooms, _, _, _, grid = gen.generate()
+        goal = (int(rooms[0].center.x), int(rooms[0].center.y))
+        agents = agents_in_rooms(rooms, args.agents, args.seed)
+        pathfinder = AStarPathfinder(grid)
+        pathfinder.walkable_cells()  # Build the walkability snapshot outside the timing
+
+        start = time.perf_counter()
+        for x, y in agents:
+            pathfinder.find_path(x, y, *goal)
+        astar_time = time.perf_counter() - start
+
+        cache = FlowFieldCache(pathfinder)
+        start = time.perf_counter()
+        field = cache.field([goal])
+        build_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for x, y in agents:
+            field.next_step(x, y)
+        step_time = time.perf_counter() - start
+
+        print(
+            f"{size:>6} {len(agents):>7} {astar_time:>9.3f} {build_time * 1000:>17.1f} "
+            f"{step_time * 1000:>11.3f} {astar_time / (build_time + step_time):>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# Grid rasterization benchmark: list-of-lists vs NumPy backend
+# Run from src/: python -m tests.benchmarks.bench_grid [--sizes 1000 2000 4000]
+import argparse
+import random
+import time
+
+from dungeon_generator.dungeon import DungeonGenerator
+
+
+def legacy_fill(gen):  # The original cell-by-cell rasterization, kept as a reference point
+    grid = [[0 for _ in range(gen.width)] for _ in range(gen.height)]
+    for room in gen.rooms:
+        for y in range(room.y, room.y + room.height):
+            for x in range(room.x, room.x + room.width):
+                if 0 <= y < gen.height and 0 <= x < gen.width:
+                    grid[y][x] = 1
+    for corridor in gen.corridors:
+        for i in range(len(corridor) - 1):
+            x1, y1 = corridor[i]
+            x2, y2 = corridor[i + 1]
+            for x, y in gen.get_line_points(int(x1), int(y1), int(x2), int(y2)):
+                if 0 <= y < gen.height and 0 <= x < gen.width:
+                    grid[y][x] = 1
+    return grid
+
+
+def build_layout(size, seed):  # Rooms and corridors for a size x size map
+    random.seed(seed)
+    gen = DungeonGenerator(
+        width=size,
+        height=size,
+        max_rooms=max(10, size * size // 4000),
+        min_room_size=10,
+        max_room_size=60,
+    )
+    gen.generate_rooms()
+    gen.generate_mst()
+    return gen
+
+
+def timed(func, *args):  # (seconds, result) for one call of func(*args)
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark grid generation backends")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1000, 2000, 4000])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(
+        f"{'size':>6} {'rooms':>6} {'legacy (s)':>11} {'list (s)':>10} {'numpy (s)':>10} "
+        f"{'speedup':>8}"
+    )
+    for size in args.sizes:
+        gen = build_layout(size, args.seed)
+        legacy_time, legacy_grid = timed(legacy_fill, gen)
+
+        gen.grid_options.backend = "list"
+        list_time, _ = timed(gen.generate_grid)
+        list_grid = gen.grid
+
+        gen.grid_options.backend = "numpy"
+        numpy_time, _ = timed(gen.generate_grid)
+
+        if list_grid != legacy_grid or gen.grid.tolist() != legacy_grid:
+            raise RuntimeError(f"Backends disagree for {size}x{size}")
+
+        speedup = legacy_time / numpy_time if numpy_time > 0 else float("inf")
+        print(
+            f"{size:>6} {len(gen.rooms):>6} {legacy_time:>11.4f} {list_time:>10.4f} "
+            f"{numpy_time:>10.4f} {speedup:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
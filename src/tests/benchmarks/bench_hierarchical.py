@@ -0,0 +1,84 @@
+# Hierarchical pathfinding benchmark: long-range queries vs grid A* (flat engine)
+# Run from src/: python -m tests.benchmarks.bench_hierarchical [--sizes 1024 4096]
+import argparse
+import random
+import time
+
+from dungeon_generator.dungeon import DungeonGenerator
+from dungeon_generator.hierarchical import HierarchicalPathfinder, path_cost
+from dungeon_generator.pathfinding import AStarPathfinder
+
+
+def build_dungeon(size, seed):  # Connected dungeon filling a size x size map
+    gen = DungeonGenerator(
+        width=size,
+        height=size,
+        max_rooms=max(10, size * size // 3000),
+        min_room_size=6,
+        max_room_size=30,
+        placement="free_space",
+        seed=seed,
+    )
+    gen.generate()
+    return gen
+
+
+def far_queries(rooms, count, seed):  # Pairs of room cells, longest first
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(count * 4):
+        a, b = rng.sample(rooms, 2)
+        pairs.append((
+            (rng.randrange(a.x, a.x + a.width), rng.randrange(a.y, a.y + a.height)),
+            (rng.randrange(b.x, b.x + b.width), rng.randrange(b.y, b.y + b.height)),
+        ))
+    pairs.sort(key=lambda p: -abs(p[0][0] - p[1][0]) - abs(p[0][1] - p[1][1]))
+    return pairs[:count]
+
+
+def run(pathfinder, queries):  # Total seconds and the paths found
+    paths = []
+    start = time.perf_counter()
+    for (sx, sy), (ex, ey) in queries:
+        paths.append(pathfinder.find_path(sx, sy, ex, ey))
+    return time.perf_counter() - start, paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hierarchical pathfinding")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[512, 1024, 2048])
+    parser.add_argument("--queries", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(
+        f"{'size':>6} {'rooms':>6} {'build (s)':>10} {'A* (ms/q)':>10} {'hier (ms/q)':>12} "
+        f"{'speedup':>8} {'worst cost':>11}"
+    )
+    for size in args.sizes:
+        gen = build_dungeon(size, args.seed)
+        queries = far_queries(gen.rooms, args.queries, args.seed)
+
+        start = time.perf_counter()
+        hierarchical = HierarchicalPathfinder(gen.grid, gen.rooms, gen.corridors)
+        build_time = time.perf_counter() - start
+        astar = AStarPathfinder(gen.grid)
+        astar.walkable_cells()  # Build the walkability snapshot outside the timing
+
+        astar_time, optimal = run(astar, queries)
+        hier_time, paths = run(hierarchical, queries)
+        # Path cost relative to the optimal grid path, worst query
+        worst = max(
+            path_cost(path) / max(path_cost(best), 1.0)
+            for path, best in zip(paths, optimal)
+            if path and best
+        )
+        print(
+            f"{size:>6} {len(gen.rooms):>6} {build_time:>10.3f} "
+            f"{astar_time * 1000 / len(queries):>10.1f} {hier_time * 1000 / len(queries):>12.2f} "
+            f"{astar_time / hier_time:>8.1f} {worst:>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# Incremental replanning benchmark: D* Lite repair after one cell edit vs a fresh A* search
+# Run from src/: python -m tests.benchmarks.bench_incremental [--sizes 200 400] [--edits 20]
+import argparse
+import random
+import time
+
+from dungeon_generator.dungeon import DungeonGenerator
+from dungeon_generator.incremental import DStarLite
+from dungeon_generator.pathfinding import AStarPathfinder
+
+
+def inside(room, cell):  # Cell strictly inside a room, so blocking it leaves a detour
+    x, y = cell
+    return room.x < x < room.x + room.width - 1 and room.y < y < room.y + room.height - 1
+
+
+def edit_picker(kind, rooms, grid, rng):  # Callable choosing the next cell to block
+    floor = [(x, y) for y, row in enumerate(grid) for x, value in enumerate(row) if value]
+
+    def pick(path):
+        if kind == "off path":
+            on_path = set(path)
+            return rng.choice([cell for cell in rng.sample(floor, 10) if cell not in on_path])
+        if kind == "near agent":
+            candidates = [cell for cell in path[1:30] if inside(rooms[0], cell)]
+        elif kind == "near goal":
+            candidates = [cell for cell in path[-30:-1] if inside(rooms[-1], cell)]
+        else:  # A corridor cell: closing a door
+            candidates = [cell for cell in path[1:-1] if not any(inside(r, cell) for r in rooms)]
+        return rng.choice(candidates or path[1:2])
+    return pick
+
+
+def main():  # pylint: disable=too-many-locals
+    parser = argparse.ArgumentParser(description="Benchmark incremental replanning")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 400])
+    parser.add_argument("--edits", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(
+        f"{'size':>6} {'edit':>11} {'replan (ms)':>12} {'expanded':>9} {'A* (ms)':>9} "
+        f"{'expanded':>9} {'time ratio':>11}"
+    )
+    for size in args.sizes:
+        gen = DungeonGenerator(width=size, height=size, max_rooms=max(10, size * size // 1500),
+                               min_room_size=6, max_room_size=20, placement="free_space",
+                               seed=args.seed)
+        rooms, _, _, _, grid = gen.generate()
+        start = (int(rooms[0].center.x), int(rooms[0].center.y))
+        goal = (int(rooms[-1].center.x), int(rooms[-1].center.y))
+        for kind in ("off path", "near agent", "near goal", "corridor"):
+            pathfinder = AStarPathfinder([list(row) for row in grid])
+            planner = DStarLite(pathfinder, *start, *goal)
+            path = planner.find_path()
+            pick = edit_picker(kind, rooms, grid, random.Random(args.seed))
+            replan = fresh = replan_expanded = fresh_expanded = 0
+            for _ in range(args.edits):
+                cell = pick(path)
+                pathfinder.set_walkable(*cell, 0)
+                began = time.perf_counter()
+                new_path = planner.find_path()
+                replan += time.perf_counter() - began
+                replan_expanded += planner.nodes_expanded
+                began = time.perf_counter()
+                pathfinder.find_path(*start, *goal)
+                fresh += time.perf_counter() - began
+                fresh_expanded += pathfinder.nodes_expanded
+                pathfinder.set_walkable(*cell, 1)  # Reopen so every edit starts from the same map
+                planner.find_path()
+                path = new_path or path
+            edits = args.edits
+            print(
+                f"{size:>6} {kind:>11} {replan * 1000 / edits:>12.2f} "
+                f"{replan_expanded // edits:>9} {fresh * 1000 / edits:>9.2f} "
+                f"{fresh_expanded // edits:>9} {replan / fresh:>11.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# Out-of-core grid benchmark: peak RSS of generate() + one path query per grid backend
+# Run from src/: python -m tests.benchmarks.bench_memmap [--sizes 2048 4096 8192]
+# Each measurement runs in a fresh child process, because peak RSS (ru_maxrss) never
+# goes down within a process. Unix only (uses the resource module).
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from dungeon_generator.dungeon import DungeonGenerator
+from dungeon_generator.pathfinding import AStarPathfinder
+
+
+def run_child(size, backend, seed):  # Generate, query one path, report time and peak RSS
+    import resource  # pylint: disable=import-outside-toplevel
+
+    with tempfile.TemporaryDirectory() as directory:
+        gen = DungeonGenerator(
+            width=size,
+            height=size,
+            max_rooms=max(10, size * size // 40000),
+            min_room_size=10,
+            max_room_size=60,
+            grid_backend=backend,
+            grid_path=os.path.join(directory, "grid.bin") if backend == "memmap" else None,
+            seed=seed,
+        )
+        start = time.perf_counter()
+        rooms, _, _, _, grid = gen.generate()
+        generate_time = time.perf_counter() - start
+
+        first = rooms[0]
+        other = rooms[first.connections[0]]
+        start = time.perf_counter()
+        path = AStarPathfinder(grid).find_path(
+            int(first.center.x), int(first.center.y), int(other.center.x), int(other.center.y)
+        )
+        path_time = time.perf_counter() - start
+        del grid, gen
+
+    # ru_maxrss is in kilobytes on Linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {
+        "rooms": len(rooms),
+        "generate": generate_time,
+        "path": path_time,
+        "path_length": len(path) if path else 0,
+        "peak_mb": peak_mb,
+    }
+
+
+def measure(size, backend, seed):  # Run one measurement in a child process
+    output = subprocess.run(
+        [
+            sys.executable, "-m", "tests.benchmarks.bench_memmap", "--child",
+            "--sizes", str(size), "--backends", backend, "--seed", str(seed),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark peak memory of grid backends")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2048, 4096, 8192])
+    parser.add_argument("--backends", nargs="+", default=["list", "numpy", "memmap"])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.sizes[0], args.backends[0], args.seed)))
+        return
+
+    print(
+        f"{'size':>6} {'backend':>8} {'rooms':>6} {'generate (s)':>13} {'path (s)':>9} "
+        f"{'peak RSS (MB)':>14}"
+    )
+    for size in args.sizes:
+        for backend in args.backends:
+            result = measure(size, backend, args.seed)
+            print(
+                f"{size:>6} {backend:>8} {result['rooms']:>6} {result['generate']:>13.3f} "
+                f"{result['path']:>9.3f} {result['peak_mb']:>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# Path cache benchmark: repeated and overlapping queries with and without the LRU path cache
+# Run from src/: python -m tests.benchmarks.bench_path_cache [--sizes 200 400] [--queries 1000]
+import argparse
+import random
+import time
+
+from dungeon_generator.dungeon import DungeonGenerator
+from dungeon_generator.pathfinding import AStarPathfinder
+
+
+def player_queries(pathfinder, rooms, count, seed):  # Popular routes, repeats and sub-routes
+    # A handful of popular room-to-room routes; every query either repeats one or walks
+    # part of it (a player clicking further along the path they are already on)
+    rng = random.Random(seed)
+    centers = [(int(room.center.x), int(room.center.y)) for room in rooms]
+    routes = []
+    while len(routes) < 20:
+        path = pathfinder.find_path(*rng.choice(centers), *rng.choice(centers))
+        if path and len(path) > 2:
+            routes.append(path)
+    queries = []
+    for _ in range(count):
+        route = rng.choice(routes)
+        if rng.random() < 0.5:
+            queries.append((route[0], route[-1]))
+        else:
+            first, last = sorted(rng.sample(range(len(route)), 2))
+            queries.append((route[first], route[last]))
+    return queries
+
+
+def timed(pathfinder, queries):  # Seconds for all queries
+    start = time.perf_counter()
+    for (sx, sy), (ex, ey) in queries:
+        pathfinder.find_path(sx, sy, ex, ey)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the path cache")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 400])
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--cache-size", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(
+        f"{'size':>6} {'queries':>8} {'no cache (s)':>13} {'cache (s)':>10} {'hit rate':>9} "
+        f"{'subpath':>8} {'KiB':>7} {'speedup':>8}"
+    )
+    for size in args.sizes:
+        gen = DungeonGenerator(width=size, height=size, max_rooms=max(10, size * size // 1500),
+                               placement="free_space", seed=args.seed)
+        rooms, _, _, _, grid = gen.generate()
+        plain = AStarPathfinder(grid)
+        queries = player_queries(plain, rooms, args.queries, args.seed)
+        cached = AStarPathfinder(grid, cache_size=args.cache_size)
+        cached.walkable_cells()  # Build the walkability snapshot outside the timing
+
+        uncached_time = timed(plain, queries)
+        cached_time = timed(cached, queries)
+        stats = cached.path_cache.as_dict()
+        print(
+            f"{size:>6} {len(queries):>8} {uncached_time:>13.3f} {cached_time:>10.3f} "
+            f"{stats['hit_rate']:>9.2f} {stats['subpath_hits']:>8} {stats['bytes'] / 1024:>7.0f} "
+            f"{uncached_time / cached_time:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
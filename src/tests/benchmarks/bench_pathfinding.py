@@ -0,0 +1,79 @@
+# A* engine benchmark: original Node-based engine, flat-array engine and Jump Point Search
+# Run from src/: python -m tests.benchmarks.bench_pathfinding [--sizes 512 2048]
+import argparse
+import random
+import time
+
+from dungeon_generator.dungeon import DungeonGenerator
+from dungeon_generator.pathfinding import AStarPathfinder
+
+
+def build_dungeon(size, seed):  # Connected dungeon filling a size x size map
+    random.seed(seed)
+    gen = DungeonGenerator(
+        width=size,
+        height=size,
+        max_rooms=max(10, size * size // 3000),
+        min_room_size=6,
+        max_room_size=30,
+    )
+    gen.generate()
+    return gen
+
+
+def far_queries(rooms, count, seed):  # Pairs of room centers, longest first
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(count * 4):
+        a, b = rng.sample(rooms, 2)
+        pairs.append(
+            ((int(a.center.x), int(a.center.y)), (int(b.center.x), int(b.center.y)))
+        )
+    pairs.sort(key=lambda p: -abs(p[0][0] - p[1][0]) - abs(p[0][1] - p[1][1]))
+    return pairs[:count]
+
+
+def run_engine(grid, engine, queries):  # Total seconds, expansions and path lengths
+    pathfinder = AStarPathfinder(grid, engine=engine)
+    if engine in ("flat", "jps"):
+        pathfinder.walkable_cells()  # Build the walkability snapshot outside the timing
+    expanded = 0
+    lengths = []
+    start = time.perf_counter()
+    for (sx, sy), (ex, ey) in queries:
+        path = pathfinder.find_path(sx, sy, ex, ey)
+        expanded += pathfinder.nodes_expanded
+        lengths.append(len(path) if path else 0)
+    return time.perf_counter() - start, expanded, lengths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark A* engines")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[512, 2048])
+    parser.add_argument("--queries", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'size':>6} {'engine':>6} {'time (s)':>10} {'expanded':>10} {'per query (ms)':>15}")
+    for size in args.sizes:
+        gen = build_dungeon(size, args.seed)
+        queries = far_queries(gen.rooms, args.queries, args.seed)
+        results = {}
+        for engine in ("node", "flat", "jps"):
+            elapsed, expanded, lengths = run_engine(gen.grid, engine, queries)
+            results[engine] = (elapsed, lengths)
+            print(
+                f"{size:>6} {engine:>6} {elapsed:>10.3f} {expanded:>10} "
+                f"{elapsed * 1000 / len(queries):>15.1f}"
+            )
+        reachable = [bool(n) for n in results["node"][1]]
+        if any([bool(n) for n in results[e][1]] != reachable for e in ("flat", "jps")):
+            raise RuntimeError("Engines disagree on reachability")
+        print(
+            f"{size:>6} {'':>6} flat vs node {results['node'][0] / results['flat'][0]:.1f}x, "
+            f"jps vs flat {results['flat'][0] / results['jps'][0]:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# Room placement benchmark: spatial hash broad phase vs brute-force overlap checks
+# Run from src/: python -m tests.benchmarks.bench_room_placement [--counts 100 500 2000]
+import argparse
+import math
+import random
+import time
+
+from dungeon_generator.dungeon import DungeonGenerator
+
+
+def time_placement(room_count, use_spatial_index, seed):  # Seconds spent in generate_rooms
+    # Map grows with the room count so the target stays reachable
+    side = max(50, int(math.sqrt(room_count) * 20))
+    random.seed(seed)
+    gen = DungeonGenerator(
+        width=side,
+        height=side,
+        max_rooms=room_count,
+        min_room_size=4,
+        max_room_size=10,
+        use_spatial_index=use_spatial_index,
+    )
+    start = time.perf_counter()
+    gen.generate_rooms()
+    elapsed = time.perf_counter() - start
+    return elapsed, gen.rooms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark room placement")
+    parser.add_argument(
+        "--counts", type=int, nargs="+", default=[50, 100, 250, 500, 1000, 2000]
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'rooms':>8} {'placed':>8} {'brute (s)':>12} {'indexed (s)':>12} {'speedup':>8}")
+    for count in args.counts:
+        brute_time, brute_rooms = time_placement(count, False, args.seed)
+        index_time, index_rooms = time_placement(count, True, args.seed)
+
+        # Same seed must place exactly the same rooms with either strategy
+        same = [(r.x, r.y, r.width, r.height) for r in brute_rooms] == [
+            (r.x, r.y, r.width, r.height) for r in index_rooms
+        ]
+        if not same:
+            raise RuntimeError(f"Placement differs between strategies for {count} rooms")
+
+        speedup = brute_time / index_time if index_time > 0 else float("inf")
+        print(
+            f"{count:>8} {len(index_rooms):>8} {brute_time:>12.4f} "
+            f"{index_time:>12.4f} {speedup:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
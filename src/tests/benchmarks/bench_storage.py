@@ -0,0 +1,71 @@
+# Binary dungeon format benchmark: save/load time and grid memory vs list-of-lists
+# Run from src/: python -m tests.benchmarks.bench_storage [--sizes 1024 4096]
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from dungeon_generator.dungeon import DungeonGenerator
+from dungeon_generator.storage import load, save
+
+
+def build_dungeon(size, seed):  # Full dungeon on a size x size map
+    gen = DungeonGenerator(
+        width=size,
+        height=size,
+        max_rooms=max(10, size * size // 6000),
+        min_room_size=10,
+        max_room_size=60,
+        seed=seed,
+    )
+    gen.generate()
+    return gen
+
+
+def peak_memory(func, *args):  # (result, peak traced bytes) for one call of func(*args)
+    tracemalloc.start()
+    try:
+        result = func(*args)
+        return result, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def timed(func, *args):  # (seconds, result) for one call of func(*args)
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dungeon save/load")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1024, 2048, 4096])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(
+        f"{'size':>6} {'rooms':>6} {'file (KB)':>10} {'save (s)':>9} {'load (s)':>9} "
+        f"{'load MB':>8} {'lists MB':>9}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "dungeon.dgn")
+        for size in args.sizes:
+            gen = build_dungeon(size, args.seed)
+            save_time, _ = timed(save, path, gen)
+
+            load_time, loaded = timed(load, path)
+            loaded.close()
+            loaded, load_peak = peak_memory(load, path)
+            loaded.close()
+            _, list_peak = peak_memory(lambda grid: [list(row) for row in grid], gen.grid)
+
+            print(
+                f"{size:>6} {len(gen.rooms):>6} {os.path.getsize(path) / 1024:>10.0f} "
+                f"{save_time:>9.4f} {load_time:>9.4f} {load_peak / 1e6:>8.2f} "
+                f"{list_peak / 1e6:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
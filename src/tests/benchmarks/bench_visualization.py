@@ -0,0 +1,73 @@
+# Map rendering benchmark: one artist per triangle/segment/room vs collections, saved as PNG
+# Run from src/: python -m tests.benchmarks.bench_visualization [--rooms 1000 10000]
+import argparse
+import math
+import os
+import tempfile
+import time
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Rectangle
+
+from dungeon_generator.dungeon import DungeonGenerator
+from dungeon_generator.visualization import visualize_dungeon
+
+
+def per_artist(rooms, corridors, triangulation, size, output):  # The previous drawing loop
+    figure = Figure(figsize=(12, 12))
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot()
+    ax.set_facecolor("black")
+    for triangle in triangulation.triangles:
+        points = [(v.x, v.y) for v in (*triangle.vertices, triangle.vertices[0])]
+        ax.plot(*zip(*points), color="blue", linestyle=":", alpha=0.4, zorder=1)
+    for corridor in corridors:
+        for (x1, y1), (x2, y2) in zip(corridor, corridor[1:]):
+            ax.plot([x1, x2], [y1, y2], color="gray", linewidth=2, zorder=2)
+    for room in rooms:
+        ax.add_patch(Rectangle((room.x, room.y), room.width, room.height, fill=True,
+                               facecolor="darkslateblue", edgecolor="white", linewidth=1,
+                               alpha=0.9, zorder=3))
+        ax.text(room.center.x, room.center.y, str(room.id), color="white", ha="center",
+                va="center", fontsize=8, zorder=4)
+    ax.set_xlim(0, size)
+    ax.set_ylim(0, size)
+    ax.set_aspect("equal")
+    figure.savefig(output, dpi=150, bbox_inches="tight")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dungeon map rendering")
+    parser.add_argument("--rooms", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-old-above", type=int, default=1000,
+                        help="Only time the per-artist loop up to this many rooms")
+    args = parser.parse_args()
+
+    print(f"{'rooms':>6} {'per artist (s)':>15} {'collections (s)':>16} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, "map.png")
+        for count in args.rooms:
+            size = int(math.sqrt(count * 400))  # About a quarter of the map is rooms
+            gen = DungeonGenerator(width=size, height=size, max_rooms=count, min_room_size=4,
+                                   max_room_size=12, placement="free_space", seed=args.seed)
+            rooms, corridors, _, triangulation, _ = gen.generate()
+
+            started = time.perf_counter()
+            visualize_dungeon(rooms, corridors, triangulation, size, size, output=output,
+                              show=False)
+            new = time.perf_counter() - started
+            old = None
+            if count <= args.skip_old_above:
+                started = time.perf_counter()
+                per_artist(rooms, corridors, triangulation, size, output)
+                old = time.perf_counter() - started
+            print(
+                f"{len(rooms):>6} {old if old is not None else float('nan'):>15.2f} "
+                f"{new:>16.2f} {old / new if old is not None else float('nan'):>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+# Benchmark suite covering every generation and pathfinding stage
+# Run from src/: python -m tests.benchmarks.suite [--profile quick|full] [--output results.json]
+# Results are compared against tests/benchmarks/baseline.json; regressions above
+# --threshold make the command exit with status 1.
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+
+from dungeon_generator.delaunay import DelaunayTriangulation
+from dungeon_generator.dungeon import DungeonGenerator
+from dungeon_generator.pathfinding import AStarPathfinder
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+PROFILES = {
+    "quick": {"rooms": [10, 100, 1000], "grids": [100, 512], "repeats": 5},
+    "full": {
+        "rooms": [10, 100, 1000, 10000],
+        "grids": [100, 512, 1024, 2048, 4096],
+        "repeats": 3,
+    },
+}
+
+
+def measure(setup, func, repeats):  # Run setup() untimed, then time func(state)
+    samples = []
+    for _ in range(repeats):
+        state = setup()
+        start = time.perf_counter()
+        func(state)
+        samples.append(time.perf_counter() - start)
+    return {
+        "seconds": min(samples),
+        "median": statistics.median(samples),
+        "repeats": repeats,
+    }
+
+
+def room_sweep_generator(count, seed):  # Map sized so `count` rooms fit comfortably
+    side = max(50, int(math.sqrt(count) * 22))
+    return DungeonGenerator(
+        width=side, height=side, max_rooms=count, min_room_size=4, max_room_size=10, seed=seed
+    )
+
+
+def grid_sweep_generator(size, seed):  # Fixed room density for a size x size map
+    return DungeonGenerator(
+        width=size,
+        height=size,
+        max_rooms=max(5, size * size // 3000),
+        min_room_size=6,
+        max_room_size=30,
+        seed=seed,
+    )
+
+
+def with_rooms(gen):
+    gen.generate_rooms()
+    return gen
+
+
+def with_triangulation(gen):
+    gen.generate_rooms()
+    gen.generate_delaunay()
+    return gen
+
+
+def with_layout(gen):
+    gen.generate_rooms()
+    gen.generate_mst()
+    return gen
+
+
+def far_query(gen):  # Pathfinder plus a long query between room centers
+    gen = with_layout(gen)
+    gen.generate_grid()
+    first = gen.rooms[0]
+    target = max(
+        gen.rooms,
+        key=lambda r: abs(r.center.x - first.center.x) + abs(r.center.y - first.center.y),
+    )
+    pathfinder = AStarPathfinder(gen.grid)
+    points = (
+        int(first.center.x),
+        int(first.center.y),
+        int(target.center.x),
+        int(target.center.y),
+    )
+    return pathfinder, points
+
+
+def run_suite(profile, seed):  # {benchmark name: timing dict}
+    config = PROFILES[profile]
+    repeats = config["repeats"]
+    results = {}
+
+    def record(name, setup, func):
+        print(f"  {name} ...", end="", flush=True)
+        results[name] = measure(setup, func, repeats)
+        print(f" {results[name]['seconds']:.4f}s")
+
+    # Setups bind the sweep value as a default argument: measure() calls them later
+    for count in config["rooms"]:
+        record(
+            f"rooms/generate_rooms/n={count}",
+            lambda count=count: room_sweep_generator(count, seed),
+            lambda gen: gen.generate_rooms(),
+        )
+        record(
+            f"rooms/delaunay/n={count}",
+            lambda count=count: [
+                r.center for r in with_rooms(room_sweep_generator(count, seed)).rooms
+            ],
+            DelaunayTriangulation,
+        )
+        record(
+            f"rooms/generate_mst/n={count}",
+            lambda count=count: with_triangulation(room_sweep_generator(count, seed)),
+            lambda gen: gen.generate_mst(),
+        )
+
+    for size in config["grids"]:
+        record(
+            f"grid/generate_grid/size={size}",
+            lambda size=size: with_layout(grid_sweep_generator(size, seed)),
+            lambda gen: gen.generate_grid(),
+        )
+        record(
+            f"grid/find_path/size={size}",
+            lambda size=size: far_query(grid_sweep_generator(size, seed)),
+            lambda state: state[0].find_path(*state[1]),
+        )
+        record(
+            f"grid/generate/size={size}",
+            lambda size=size: grid_sweep_generator(size, seed),
+            lambda gen: gen.generate(),
+        )
+
+    return results
+
+
+def compare(results, baseline, threshold, min_seconds):  # List of (name, old, new, ratio)
+    regressions = []
+    for name, current in sorted(results.items()):
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        old, new = previous["seconds"], current["seconds"]
+        # Timings below the noise floor are too jittery to flag
+        if max(old, new) < min_seconds:
+            continue
+        ratio = new / old if old > 0 else float("inf")
+        marker = "REGRESSION" if ratio > 1 + threshold else ""
+        print(f"  {name:<40} {old:>9.4f}s -> {new:>9.4f}s  x{ratio:5.2f} {marker}")
+        if marker:
+            regressions.append((name, old, new, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the dungeon generator benchmark suite")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Relative slowdown that counts as a regression (0.25 = 25%%)",
+    )
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=0.02,
+        help="Ignore benchmarks faster than this in both runs",
+    )
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="Store these results as the baseline"
+    )
+    args = parser.parse_args()
+
+    print(f"Running '{args.profile}' benchmark profile (seed {args.seed})")
+    results = run_suite(args.profile, args.seed)
+    report = {
+        "meta": {
+            "profile": args.profile,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2, sort_keys=True)
+    print(f"Results written to {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2, sort_keys=True)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --update-baseline to create one.")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as handle:
+        baseline = json.load(handle)["results"]
+    print(f"Comparing against {args.baseline} (threshold {args.threshold:.0%})")
+    regressions = compare(results, baseline, args.threshold, args.min_seconds)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed")
+        return 1
+    print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
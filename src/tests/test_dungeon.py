@@ -1,10 +1,30 @@
 import unittest
 import random
 import math
+import io
+import os
+import contextlib
+import tempfile
+from unittest import mock
 
 from dungeon_generator.delaunay import Point, Triangle, DelaunayTriangulation
 from dungeon_generator.dungeon import Room, DungeonGenerator
-from dungeon_generator.pathfinding import Node, AStarPathfinder
+from dungeon_generator.pathfinding import Node, AStarPathfinder, PathCache
+from dungeon_generator.flowfield import FlowFieldCache, build_flow_field
+from dungeon_generator.incremental import DStarLite
+from dungeon_generator.hierarchical import HierarchicalPathfinder, octile, octile_line, path_cost
+from dungeon_generator.spatial import SpatialHash
+from dungeon_generator.placement import FreeSpace
+from dungeon_generator.grid import (
+    np, new_grid, fill_rect, fill_segment, rasterize_to_file, ChunkedGrid, PackedGrid,
+    label_components,
+)
+from dungeon_generator.storage import save, load
+from dungeon_generator.cache import CACHE_VERSION, DungeonCache
+from dungeon_generator.prefetch import DungeonPrefetcher, build_dungeon
+from dungeon_generator.visualization import visualize_dungeon
+from dungeon_generator.game_interface import DungeonExplorer, pygame
+from tests.benchmarks.suite import compare, measure
 
 
 class TestPoint(unittest.TestCase):    
@@ -144,6 +164,57 @@ class TestDelaunayTriangulation(unittest.TestCase):    # Testing Delaunay triang
                         f"Delaunay triangulation invalid: {point} inside circumcircle"
                     )
 
+    def test_engines_agree(self):  # Incremental engine matches the reference Bowyer-Watson result
+        rng = random.Random(3)
+        points = [Point(rng.uniform(0, 100), rng.uniform(0, 100)) for _ in range(120)]
+        fast = DelaunayTriangulation(points)
+        reference = DelaunayTriangulation(points, engine="bowyer_watson")
+
+        def as_keys(dt):
+            return {frozenset((v.x, v.y) for v in t.vertices) for t in dt.triangles}
+
+        self.assertEqual(as_keys(fast), as_keys(reference))
+
+    def test_incremental_delaunay_property(self):  # Empty circumcircles on a larger random set
+        rng = random.Random(11)
+        points = [Point(rng.uniform(0, 500), rng.uniform(0, 500)) for _ in range(300)]
+        dt = DelaunayTriangulation(points)
+        for triangle in dt.triangles:
+            for point in points:
+                if point not in triangle.vertices:
+                    self.assertFalse(triangle.in_circumcircle(point))
+
+    def test_regular_grid_points(self):  # Cocircular grid points are fully triangulated
+        points = [Point(x, y) for x in range(10) for y in range(10)]
+        dt = DelaunayTriangulation(points)
+        self.assertEqual(len(dt.triangles), 2 * 9 * 9)
+
+    def test_duplicate_points_ignored(self):  # Repeated points do not create extra triangles
+        points = [Point(0, 0), Point(4, 0), Point(2, 3), Point(4, 0)]
+        dt = DelaunayTriangulation(points)
+        self.assertEqual(len(dt.triangles), 1)
+
+    def test_index_output_matches_triangles(self):  # Index triples refer to the input points
+        rng = random.Random(21)
+        points = [Point(rng.uniform(0, 100), rng.uniform(0, 100)) for _ in range(80)]
+        for engine in DelaunayTriangulation.ENGINES:
+            dt = DelaunayTriangulation(points, engine=engine)
+            self.assertEqual(len(dt.triangle_indices), len(dt.triangles))
+            for (a, b, c), triangle in zip(dt.triangle_indices, dt.triangles):
+                self.assertEqual([points[a], points[b], points[c]], triangle.vertices)
+
+    def test_edge_indices_deduplicated(self):  # Each shared edge is listed once, as (i, j) with i < j
+        points = [Point(0, 0), Point(10, 0), Point(10, 10), Point(0, 10)]
+        edges = DelaunayTriangulation(points).edge_indices()
+        self.assertEqual(len(edges), 5)
+        self.assertEqual(edges, sorted(set(edges)))
+        self.assertTrue(all(i < j for i, j in edges))
+
+    def test_unknown_engine(self):  # Invalid engine names are rejected
+        with self.assertRaises(ValueError):
+            DelaunayTriangulation([Point(0, 0), Point(1, 0), Point(0, 1)], engine="quadratic")
+
+
 class TestRoom(unittest.TestCase):  #  Testing Room class functionality
     def test_room_creation(self):   # Test basic room creation
         room = Room(10, 20, 5, 8, 0)
@@ -182,6 +253,123 @@ class TestRoom(unittest.TestCase):  #  Testing Room class functionality
         self.assertTrue(room.contains_point(20, 20))
         self.assertFalse(room.contains_point(5, 5))
 
+class TestSpatialHash(unittest.TestCase):  # Testing the room bucket index
+    def test_query_returns_nearby_rooms(self):  # Only rooms in overlapping buckets are returned
+        index = SpatialHash(10)
+        near = Room(2, 2, 5, 5, 0)
+        far = Room(80, 80, 5, 5, 1)
+        index.insert(near)
+        index.insert(far)
+        self.assertEqual(index.query(0, 0, 8, 8), [near])
+        self.assertEqual(len(index), 2)
+
+    def test_room_spanning_buckets_reported_once(self):  # No duplicates for multi-bucket rooms
+        index = SpatialHash(4)
+        room = Room(0, 0, 12, 12, 0)
+        index.insert(room)
+        self.assertEqual(index.query(0, 0, 12, 12), [room])
+
+    def test_intersects_any_matches_brute_force(self):  # Same answers as Room.intersects scan
+        rng = random.Random(7)
+        index = SpatialHash(11)
+        rooms = []
+        for i in range(60):
+            room = Room(rng.randint(0, 150), rng.randint(0, 150), rng.randint(3, 10), rng.randint(3, 10), i)
+            rooms.append(room)
+            index.insert(room)
+        for i in range(200):
+            probe = Room(rng.randint(0, 150), rng.randint(0, 150), rng.randint(3, 10), rng.randint(3, 10), i)
+            expected = any(probe.intersects(other) for other in rooms)
+            self.assertEqual(index.intersects_any(probe), expected)
+
+    def test_edge_touching_detected_across_buckets(self):  # Closed-interval semantics kept
+        index = SpatialHash(10)
+        index.insert(Room(0, 0, 10, 10, 0))
+        self.assertTrue(index.intersects_any(Room(10, 0, 5, 5, 1)))
+
+
+class TestFreeSpacePlacement(unittest.TestCase):  # Testing free-space tracking and placement mode
+    def test_occupy_keeps_maximal_rectangles(self):  # A centered block leaves four maximal strips
+        space = FreeSpace(0, 0, 10, 10)
+        space.occupy(4, 4, 2, 2)
+        self.assertEqual(
+            sorted(space.rects),
+            [(0, 0, 4, 10), (0, 0, 10, 4), (0, 6, 10, 4), (6, 0, 4, 10)],
+        )
+
+    def test_free_rects_cover_exactly_the_free_cells(self):  # No gaps, no overlap with blocks
+        rng = random.Random(5)
+        space = FreeSpace(0, 0, 40, 30, bucket_size=8)
+        used = set()
+        for _ in range(25):
+            spot = space.fit(rng, rng.randint(2, 7), rng.randint(2, 7), 2, 2)
+            if spot is None:
+                break
+            x, y, w, h = spot
+            block = {(cx, cy) for cx in range(x, x + w) for cy in range(y, y + h)}
+            self.assertFalse(block & used)
+            used |= block
+            space.occupy(x, y, w, h)
+        covered = {
+            (cx, cy)
+            for rx, ry, rw, rh in space.rects
+            for cx in range(rx, rx + rw)
+            for cy in range(ry, ry + rh)
+        }
+        self.assertEqual(covered, {(cx, cy) for cx in range(40) for cy in range(30)} - used)
+
+    def test_fit_returns_none_when_full(self):  # Nothing fits once the area is occupied
+        space = FreeSpace(0, 0, 5, 5)
+        space.occupy(0, 0, 5, 5)
+        self.assertEqual(len(space), 0)
+        self.assertIsNone(space.fit(random.Random(1), 2, 2, 1, 1))
+
+    def test_reaches_target_where_random_falls_short(self):  # Dense requests succeed in one pass
+        params = dict(width=100, height=100, max_rooms=100, min_room_size=4, max_room_size=10)
+        rejection = DungeonGenerator(seed=3, **params)
+        self.assertLess(rejection.generate_rooms(), 100)
+        gen = DungeonGenerator(seed=3, placement="free_space", **params)
+        self.assertEqual(gen.generate_rooms(), 100)
+        self.assertEqual(gen.placement_shortfall, 0)
+
+    def test_rooms_dont_overlap_and_stay_in_bounds(self):  # Same guarantees as random placement
+        gen = DungeonGenerator(
+            width=80, height=60, max_rooms=60, min_room_size=4, max_room_size=12, seed=11,
+            placement="free_space",
+        )
+        gen.generate_rooms()
+        for i, room in enumerate(gen.rooms):
+            self.assertGreaterEqual(room.x, 1)
+            self.assertGreaterEqual(room.y, 1)
+            self.assertLessEqual(room.x + room.width, gen.width - 1)
+            self.assertLessEqual(room.y + room.height, gen.height - 1)
+            self.assertGreaterEqual(min(room.width, room.height), gen.min_room_size)
+            for other in gen.rooms[i + 1:]:
+                self.assertFalse(room.intersects(other))
+
+    def test_shortfall_reported(self):  # Impossible targets stop early and say so
+        gen = DungeonGenerator(
+            width=30, height=30, max_rooms=50, seed=1, placement="free_space", instrument=True
+        )
+        with self.assertLogs("dungeon_generator.dungeon", level="WARNING"):
+            placed = gen.generate_rooms()
+        self.assertLess(placed, 50)
+        self.assertEqual(gen.placement_shortfall, 50 - placed)
+        self.assertEqual(gen.stats.counters["placement_shortfall"], 50 - placed)
+
+    def test_seeded_placement_is_reproducible(self):  # Same seed, same layout
+        layouts = []
+        for _ in range(2):
+            gen = DungeonGenerator(width=120, height=120, max_rooms=40, seed=9, placement="free_space")
+            gen.generate_rooms()
+            layouts.append([(r.x, r.y, r.width, r.height) for r in gen.rooms])
+        self.assertEqual(layouts[0], layouts[1])
+
+    def test_unknown_placement_mode(self):  # Invalid mode names are rejected
+        with self.assertRaises(ValueError):
+            DungeonGenerator(placement="packed")
+
+
 class TestDungeonGenerator(unittest.TestCase):  # Testing DungeonGenerator class functionality    
     def test_generator_creation(self):    # Test basic generator creation with valid parameters
         gen = DungeonGenerator(width=50, height=50, max_rooms=10)
@@ -225,6 +413,15 @@ class TestDungeonGenerator(unittest.TestCase):  # Testing DungeonGenerator class
             self.assertLessEqual(room.x + room.width, gen.width - 1)
             self.assertLessEqual(room.y + room.height, gen.height - 1)
     
+    def test_spatial_index_matches_brute_force(self):  # Same seed places identical rooms either way
+        layouts = []
+        for use_index in (True, False):
+            random.seed(2024)
+            gen = DungeonGenerator(width=200, height=200, max_rooms=80, use_spatial_index=use_index)
+            gen.generate_rooms()
+            layouts.append([(r.x, r.y, r.width, r.height) for r in gen.rooms])
+        self.assertEqual(layouts[0], layouts[1])
+
     def test_delaunay_generation(self):  # Test that Delaunay triangulation is created correctly
         gen = DungeonGenerator(width=100, height=100, max_rooms=10)
         gen.generate_rooms()
@@ -266,6 +463,25 @@ class TestDungeonGenerator(unittest.TestCase):  # Testing DungeonGenerator class
                         queue.append(neighbor_id)
             
             self.assertEqual(len(visited), len(gen.rooms), "MST did not connect all rooms")
+
+    def test_mst_edge_counts(self):  # Spanning tree plus 20% extra loop edges, no duplicates
+        gen = DungeonGenerator(
+            width=300, height=300, max_rooms=60, min_room_size=4, max_room_size=10, seed=5,
+            instrument=True,
+        )
+        gen.generate_rooms()
+        gen.generate_mst()
+        n = len(gen.rooms)
+        counters = gen.stats.counters
+        self.assertEqual(counters["mst_edges"], n - 1)
+        self.assertEqual(counters["extra_edges"], int((n - 1) * 0.2))
+        pairs = {
+            (min(room.id, other), max(room.id, other))
+            for room in gen.rooms
+            for other in room.connections
+        }
+        self.assertEqual(len(pairs), counters["mst_edges"] + counters["extra_edges"])
+        self.assertTrue(pairs <= set(gen.triangulation.edge_indices()))
     
     def test_grid_generation(self):   # Test that grid is generated correctly
         gen = DungeonGenerator(width=50, height=40, max_rooms=5)
@@ -292,6 +508,497 @@ class TestDungeonGenerator(unittest.TestCase):  # Testing DungeonGenerator class
             self.assertGreater(len(triangulation.triangles), 0)
 
 
+class TestGridBackends(unittest.TestCase):  # Testing grid rasterization helpers and backends
+    def test_fill_rect_clips_to_bounds(self):  # Rectangles hanging off the grid are clipped
+        grid = new_grid(5, 4)
+        written = fill_rect(grid, 3, 2, 5, 5)
+        self.assertEqual(written, 4)
+        self.assertEqual(grid[2], [0, 0, 0, 1, 1])
+        self.assertEqual(grid[0], [0, 0, 0, 0, 0])
+
+    def test_fill_segment_inclusive(self):  # Axis-aligned segments include both endpoints
+        grid = new_grid(6, 6)
+        fill_segment(grid, 4, 1, 1, 1)
+        fill_segment(grid, 1, 1, 1, 4)
+        self.assertEqual(grid[1], [0, 1, 1, 1, 1, 0])
+        self.assertEqual([grid[y][1] for y in range(6)], [0, 1, 1, 1, 1, 0])
+
+    def test_unknown_backend(self):  # Invalid backend names are rejected
+        with self.assertRaises(ValueError):
+            DungeonGenerator(width=50, height=50, grid_backend="dict")
+
+    @unittest.skipIf(np is None, "NumPy not installed")
+    def test_numpy_backend_matches_list(self):  # Both backends rasterize identical grids
+        grids = []
+        for backend in ("list", "numpy"):
+            random.seed(77)
+            gen = DungeonGenerator(width=120, height=90, max_rooms=20, grid_backend=backend)
+            gen.generate()
+            grids.append(gen.grid)
+        self.assertEqual(grids[1].dtype, np.uint8)
+        self.assertEqual(grids[1].tolist(), grids[0])
+
+    @unittest.skipIf(np is None, "NumPy not installed")
+    def test_numpy_grid_with_pathfinder(self):  # grid[y][x] indexing works for existing callers
+        random.seed(42)
+        gen = DungeonGenerator(width=60, height=60, max_rooms=10, grid_backend="numpy")
+        rooms, _, _, _, grid = gen.generate()
+        self.assertEqual(len(grid), 60)
+        self.assertEqual(len(grid[0]), 60)
+        if len(rooms) >= 2:
+            pf = AStarPathfinder(grid)
+            start = (int(rooms[0].center.x), int(rooms[0].center.y))
+            end = (int(rooms[1].center.x), int(rooms[1].center.y))
+            path = pf.find_path(*start, *end)
+            self.assertIsNotNone(path)
+            self.assertEqual(path[-1], end)
+
+    @unittest.skipIf(np is None, "NumPy not installed")
+    def test_wide_and_strided_numpy_grids(self):  # Cells are addressed right for any layout
+        random.seed(42)
+        gen = DungeonGenerator(width=80, height=60, max_rooms=10)
+        rooms, corridors, _, _, grid = gen.generate()
+        start = (int(rooms[0].center.x), int(rooms[0].center.y))
+        end = (int(rooms[-1].center.x), int(rooms[-1].center.y))
+        expected = AStarPathfinder(grid).find_path(*start, *end)
+        wide = np.array(grid, dtype=np.int64)
+        strided = np.zeros((60, 160), dtype=np.uint8)
+        strided[:, ::2] = grid
+        for array in (wide, strided[:, ::2]):
+            pf = AStarPathfinder(array, engine="sparse", cache_size=4)
+            self.assertEqual(pf.find_path(*start, *end), expected)
+            self.assertEqual(pf.find_path(*start, *end), expected)
+            self.assertEqual(pf.path_cache.hits, 1)  # path_open() read the right cells
+            self.assertEqual(HierarchicalPathfinder(array, rooms, corridors).find_path(
+                *start, *end)[-1], end)
+
+    @unittest.skipIf(np is None, "NumPy not installed")
+    def test_memmap_backend_matches_list(self):  # Banded file rasterization gives the same cells
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "grid.bin")
+            grids = []
+            for backend, grid_path in (("list", None), ("memmap", path)):
+                gen = DungeonGenerator(
+                    width=140, height=95, max_rooms=20, seed=6, grid_backend=backend,
+                    grid_path=grid_path,
+                )
+                gen.generate()
+                grids.append(gen.grid)
+            self.assertIsInstance(grids[1], np.memmap)
+            self.assertEqual(grids[1].tolist(), grids[0])
+            self.assertEqual(os.path.getsize(path), 140 * 95)
+            del grids
+
+    @unittest.skipIf(np is None, "NumPy not installed")
+    def test_rasterize_to_file_small_bands(self):  # Shapes crossing band borders are split correctly
+        rects = [(2, 3, 10, 9), (20, 0, 5, 30)]
+        segments = [(0, 29, 29, 0), (15, 2, 15, 27)]
+        grid, rect_cells, segment_cells = rasterize_to_file(
+            None, 30, 30, rects, segments, band_bytes=30 * 4
+        )
+        expected = new_grid(30, 30)
+        self.assertEqual(rect_cells, sum(fill_rect(expected, *rect) for rect in rects))
+        self.assertEqual(segment_cells, sum(fill_segment(expected, *seg) for seg in segments))
+        self.assertEqual(grid.tolist(), expected)
+
+    @unittest.skipIf(np is None, "NumPy not installed")
+    def test_memmap_grid_with_pathfinder(self):  # Walkability is read from the mapped array
+        gen = DungeonGenerator(width=200, height=200, max_rooms=20, seed=3, grid_backend="memmap")
+        rooms, _, _, _, grid = gen.generate()
+        pf = AStarPathfinder(grid)
+        self.assertEqual(pf.engine, "sparse")
+        self.assertEqual(AStarPathfinder(grid, engine="jps").engine, "sparse")
+        first = rooms[0]
+        other = rooms[first.connections[0]]
+        points = (
+            int(first.center.x), int(first.center.y), int(other.center.x), int(other.center.y)
+        )
+        path = pf.find_path(*points)
+        self.assertEqual(len(path), len(AStarPathfinder(grid.tolist()).find_path(*points)))
+
+    def test_chunked_backend_matches_list(self):  # Lazily built chunks hold the same cells
+        grids = []
+        for backend in ("list", "chunked"):
+            gen = DungeonGenerator(
+                width=130, height=90, max_rooms=20, seed=8, grid_backend=backend,
+                chunk_size=32, max_chunks=4,
+            )
+            gen.generate()
+            grids.append(gen.grid)
+        reference, chunked = grids
+        self.assertEqual(chunked.misses, 0)  # Nothing rasterized until read
+        self.assertEqual([list(row) for row in chunked.region(0, 0, 130, 90)], reference)
+        self.assertEqual(chunked[45][100], reference[45][100])
+        self.assertEqual(len(chunked), 90)
+        self.assertEqual(len(chunked[0]), 130)
+
+    def test_chunked_lru_is_bounded(self):  # Old chunks are evicted and rebuilt on demand
+        grid = ChunkedGrid(100, 100, chunk_size=10, max_chunks=3)
+        fill_rect(grid, 5, 5, 30, 2)
+        fill_segment(grid, 0, 50, 40, 90)  # Diagonal segments use Bresenham
+        for x in range(0, 100, 10):
+            grid.is_walkable(x, 0)
+        self.assertEqual(len(grid.chunks), 3)
+        self.assertEqual(grid.evictions, 7)
+        self.assertTrue(grid.is_walkable(5, 5))
+        self.assertTrue(grid.is_walkable(34, 6))
+        self.assertFalse(grid.is_walkable(35, 6))
+        self.assertTrue(grid.is_walkable(40, 90))
+        self.assertFalse(grid.is_walkable(-1, 5))
+
+    def test_chunked_grid_with_pathfinder(self):  # Sparse engine queries cells lazily
+        gen = DungeonGenerator(
+            width=300, height=300, max_rooms=30, seed=4, grid_backend="chunked",
+            chunk_size=50, max_chunks=64,
+        )
+        rooms, _, _, _, grid = gen.generate()
+        pf = AStarPathfinder(grid)
+        self.assertEqual(pf.engine, "sparse")
+        first = rooms[0]
+        neighbor = rooms[first.connections[0]]
+        start = (int(first.center.x), int(first.center.y))
+        end = (int(neighbor.center.x), int(neighbor.center.y))
+        path = pf.find_path(*start, *end)
+        self.assertEqual(path[-1], end)
+        self.assertLess(len(grid.chunks), 36)  # Only chunks near the route were built
+        reference = AStarPathfinder(grid.region(0, 0, 300, 300)).find_path(*start, *end)
+        self.assertEqual(len(path), len(reference))
+
+
+class TestComponentLabels(unittest.TestCase):  # Testing connected-component labelling
+    def setUp(self):
+        self.grid = [
+            [1, 1, 0, 0, 1],
+            [0, 0, 1, 0, 1],  # (2, 1) touches (1, 0) diagonally
+            [0, 0, 0, 0, 1],
+            [1, 0, 1, 1, 0],  # (3, 3) touches (4, 2) diagonally
+        ]
+
+    def test_labels(self):  # 8-connected components, -1 for walls and outside cells
+        labels = label_components(self.grid)
+        self.assertEqual(labels.count, 3)  # (0, 3) is on its own
+        self.assertTrue(labels.same_component((0, 0), (2, 1)))
+        self.assertTrue(labels.same_component((4, 0), (2, 3)))
+        self.assertFalse(labels.same_component((0, 0), (4, 0)))
+        self.assertFalse(labels.same_component((0, 3), (2, 3)))
+        self.assertEqual(labels.label(2, 0), -1)
+        self.assertEqual(labels.label(5, 0), -1)
+        self.assertFalse(labels.is_connected())
+
+    def test_matches_path_existence(self):  # Same component exactly when A* finds a path
+        rng = random.Random(2)
+        for _ in range(30):
+            grid = [[1 if rng.random() < 0.5 else 0 for _ in range(12)] for _ in range(9)]
+            labels = label_components(grid)
+            pf = AStarPathfinder(grid, engine="node")  # No component shortcut in this engine
+            cells = [(x, y) for y in range(9) for x in range(12) if grid[y][x]]
+            for _ in range(10):
+                a, b = rng.sample(cells, 2)
+                found = pf._find_path_nodes(*a, *b) is not None  # pylint: disable=protected-access
+                self.assertEqual(labels.same_component(a, b), found)
+
+    def test_opened_cells_merge(self):  # Edits after labelling join components
+        labels = label_components(self.grid)
+        labels.set_cell(3, 0, 1)
+        self.assertTrue(labels.same_component((0, 0), (4, 2)))
+        self.assertEqual(labels.count, 2)
+        labels.set_cell(1, 2, 1)  # Touches all three original components
+        self.assertTrue(labels.is_connected())
+        labels.set_cell(4, 2, 0)  # Blocking is recorded for the cell itself
+        self.assertEqual(labels.label(4, 2), -1)
+        labels = label_components([[1, 0, 0, 0]])
+        labels.set_cell(3, 0, 1)  # Isolated: a new component
+        self.assertEqual(labels.count, 2)
+        self.assertFalse(labels.same_component((0, 0), (3, 0)))
+
+    def test_backends_agree(self):  # Every grid backend gives the same labelling
+        gen = DungeonGenerator(width=80, height=60, max_rooms=2, seed=4)
+        rooms, _, _, _, grid = gen.generate()
+        expected = label_components(grid)
+        backends = [PackedGrid.from_grid(grid)]
+        if np is not None:
+            backends.append(np.array(grid, dtype=np.uint8))
+        chunked = ChunkedGrid(80, 60, chunk_size=16)
+        for room in rooms:
+            chunked.add_rect(room.x, room.y, room.width, room.height)
+        for corridor in gen.corridors:
+            for (x1, y1), (x2, y2) in zip(corridor, corridor[1:]):
+                chunked.add_segment(int(x1), int(y1), int(x2), int(y2))
+        backends.append(chunked)
+        for backend in backends:
+            labels = label_components(backend)
+            self.assertEqual(labels.count, expected.count)
+            self.assertEqual([row[2].tolist() for row in labels.rows],
+                             [row[2].tolist() for row in expected.rows])
+
+    def test_generator_checks_connectivity(self):  # Labelled on request, once per grid
+        gen = DungeonGenerator(width=80, height=80, max_rooms=12, seed=5)
+        gen.generate()
+        self.assertIsNone(gen.components)  # generate() does not pay for labelling
+        self.assertTrue(gen.is_connected())
+        self.assertIs(gen.component_labels(), gen.components)
+        self.assertEqual(gen.components.count, 1)
+        gen = DungeonGenerator(width=80, height=80, max_rooms=2, seed=3)  # Too few for an MST
+        gen.generate()
+        self.assertFalse(gen.is_connected())
+        self.assertEqual(gen.components.count, 2)
+
+    def test_pathfinder_rejects_other_components(self):  # No search across components
+        grid = [[1] * 200 for _ in range(200)]
+        for y in range(200):
+            grid[y][100] = 0
+        pf = AStarPathfinder(grid, snapshot=True)
+        self.assertFalse(pf.same_component((0, 0), (199, 199)))
+        self.assertIsNone(pf.find_path(0, 0, 199, 199))
+        self.assertEqual(pf.nodes_expanded, 0)
+        pf.set_walkable(100, 50, 1)  # Opening a gap merges the components
+        self.assertTrue(pf.same_component((0, 0), (199, 199)))
+        self.assertEqual(pf.find_path(0, 0, 199, 199)[-1], (199, 199))
+
+    def test_live_grid_labels_not_kept(self):  # Labels of a live grid never reject later queries
+        grid = [[1, 0, 1] for _ in range(3)]
+        pf = AStarPathfinder(grid)
+        self.assertFalse(pf.same_component((0, 0), (2, 0)))
+        grid[1][1] = 1  # Written directly
+        self.assertTrue(pf.same_component((0, 0), (2, 0)))
+        self.assertEqual(len(pf.find_path(0, 0, 2, 0)), 3)
+
+
+class TestStorage(unittest.TestCase):  # Testing the binary dungeon format
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".dgn")
+        os.close(handle)
+        self.gen = DungeonGenerator(width=123, height=77, max_rooms=15, seed=12)
+        self.gen.generate()
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_round_trip(self):  # Rooms, corridors, room graph and grid survive save/load
+        save(self.path, self.gen)
+        for use_mmap in (True, False):
+            with load(self.path, use_mmap=use_mmap) as loaded:
+                self.assertEqual((loaded.width, loaded.height), (123, 77))
+                self.assertEqual(
+                    [(r.id, r.x, r.y, r.width, r.height) for r in loaded.rooms],
+                    [(r.id, r.x, r.y, r.width, r.height) for r in self.gen.rooms],
+                )
+                self.assertEqual(loaded.corridors, self.gen.corridors)
+                for room, original in zip(loaded.rooms, self.gen.rooms):
+                    self.assertEqual(sorted(room.connections), sorted(original.connections))
+                self.assertEqual(
+                    [list(row) for row in loaded.grid.region(0, 0, 123, 77)], self.gen.grid
+                )
+                self.assertEqual(loaded.grid[40][60], self.gen.grid[40][60])
+
+    def test_packed_grid_is_compact(self):  # One bit per cell, rows padded to whole bytes
+        save(self.path, self.gen)
+        with load(self.path) as loaded:
+            self.assertEqual(loaded.grid.stride, 16)
+            self.assertEqual(len(loaded.grid.data), 16 * 77)
+            self.assertIsInstance(loaded.grid.data, memoryview)
+
+    def test_loaded_grid_with_pathfinder(self):  # Flat engine runs on the unpacked snapshot
+        save(self.path, self.gen)
+        with load(self.path) as loaded:
+            first = loaded.rooms[0]
+            other = loaded.rooms[first.connections[0]]
+            points = (
+                int(first.center.x), int(first.center.y),
+                int(other.center.x), int(other.center.y),
+            )
+            path = AStarPathfinder(loaded.grid).find_path(*points)
+            self.assertEqual(path, AStarPathfinder(self.gen.grid).find_path(*points))
+
+    def test_backends_save_identically(self):  # List, NumPy and chunked grids pack the same
+        expected = PackedGrid.from_grid(self.gen.grid).data
+        backends = ["chunked"] + (["numpy"] if np is not None else [])
+        for backend in backends:
+            gen = DungeonGenerator(
+                width=123, height=77, max_rooms=15, seed=12, grid_backend=backend, chunk_size=32
+            )
+            gen.generate()
+            save(self.path, gen)
+            with load(self.path) as loaded:
+                self.assertEqual(bytes(loaded.grid.data), expected)
+
+    def test_rejects_foreign_files(self):  # Wrong magic or version raises ValueError
+        with open(self.path, "wb") as handle:
+            handle.write(b"PNG" * 20)
+        with self.assertRaises(ValueError):
+            load(self.path, use_mmap=False)
+
+    def test_save_requires_grid(self):  # Nothing to save before generate()
+        with self.assertRaises(ValueError):
+            save(self.path, DungeonGenerator(width=50, height=50))
+
+
+class CountingGenerator(DungeonGenerator):  # Counts generate() calls to detect cache hits
+    calls = 0
+
+    def generate(self):
+        CountingGenerator.calls += 1
+        return super().generate()
+
+
+class TestDungeonCache(unittest.TestCase):  # Testing the content-addressed result cache
+    params = {"width": 80, "height": 60, "max_rooms": 8, "seed": 5}
+
+    def setUp(self):
+        CountingGenerator.calls = 0
+
+    def test_hit_skips_generation(self):  # Second request is served from memory
+        cache = DungeonCache()
+        first = cache.generate(CountingGenerator, **self.params)
+        second = cache.generate(CountingGenerator, **self.params)
+        self.assertEqual(CountingGenerator.calls, 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(second[4], first[4])
+        self.assertEqual([(r.x, r.y) for r in second[0]], [(r.x, r.y) for r in first[0]])
+        self.assertIsNot(second[0], first[0])  # Hits are independent copies
+
+    def test_key_is_canonical(self):  # Explicit defaults and ignored options hash the same
+        cache = DungeonCache()
+        key = cache.key(**self.params)
+        self.assertEqual(key, cache.key(min_room_size=5, instrument=True, **self.params))
+        self.assertEqual(key, cache.key(use_spatial_index=False, **self.params))
+        self.assertNotEqual(key, cache.key(**dict(self.params, seed=6)))
+        self.assertNotEqual(key, DungeonCache(version=2).key(**self.params))
+
+    def test_unseeded_requests_rejected(self):  # Random dungeons cannot be cached
+        with self.assertRaises(ValueError):
+            DungeonCache().key(width=50, height=50)
+
+    def test_memmap_requests_rejected(self):  # Cached grids would not be the memmap file
+        with self.assertRaises(ValueError):
+            DungeonCache().generate(grid_backend="memmap", grid_path="grid.bin", **self.params)
+
+    def test_entry_and_byte_eviction(self):  # Least recently used entries go first
+        cache = DungeonCache(max_entries=2)
+        for seed in (1, 2, 1, 3):
+            cache.generate(**dict(self.params, seed=seed))
+        self.assertEqual(cache.evictions, 1)
+        self.assertIsNotNone(cache.get(cache.key(**dict(self.params, seed=1))))
+        self.assertIsNone(cache.get(cache.key(**dict(self.params, seed=2))))
+
+        small = DungeonCache(max_bytes=len(cache.entries[cache.key(**dict(self.params, seed=1))]))
+        small.generate(**dict(self.params, seed=1))
+        small.generate(**dict(self.params, seed=3))
+        self.assertEqual(len(small), 1)
+        self.assertLessEqual(small.size, small.max_bytes)
+
+    def test_disk_tier_and_version_invalidation(self):  # Disk survives restarts, not version bumps
+        with tempfile.TemporaryDirectory() as directory:
+            DungeonCache(directory=directory).generate(CountingGenerator, **self.params)
+            restarted = DungeonCache(directory=directory)
+            restarted.generate(CountingGenerator, **self.params)
+            self.assertEqual(CountingGenerator.calls, 1)
+            self.assertEqual(restarted.disk_hits, 1)
+
+            bumped = DungeonCache(directory=directory, version=CACHE_VERSION + 1)
+            self.assertEqual(os.listdir(directory), [])
+            bumped.generate(CountingGenerator, **self.params)
+            self.assertEqual(CountingGenerator.calls, 2)
+            bumped.invalidate()
+            self.assertEqual((len(bumped), os.listdir(directory)), (0, []))
+
+    def test_foreign_files_survive(self):  # Purging and invalidating only touch cache entries
+        with tempfile.TemporaryDirectory() as directory:
+            foreign = ["model.pickle", "v1-notakey.pickle", f"v{CACHE_VERSION + 1}.pickle"]
+            for name in foreign:
+                with open(os.path.join(directory, name), "wb") as f:
+                    f.write(b"keep")
+            old = DungeonCache(directory=directory, version=CACHE_VERSION + 1)
+            old.generate(**self.params)
+
+            cache = DungeonCache(directory=directory)  # Purges the old version's entry
+            cache.generate(**self.params)
+            cache.invalidate(cache.key(**self.params))
+            cache.generate(**self.params)
+            cache.invalidate()
+            self.assertEqual(sorted(os.listdir(directory)), sorted(foreign))
+
+
+class TestDungeonPrefetcher(unittest.TestCase):  # Testing background pre-generation
+    def make_params(self, seed):  # next_params callback drawing seeds from one RNG
+        rng = random.Random(seed)
+        return lambda: {"width": 60, "height": 60, "max_rooms": 8, "seed": rng.getrandbits(64)}
+
+    def test_build_dungeon_is_deterministic(self):  # Same seed gives the same dungeon
+        rooms1, grid1 = build_dungeon(60, 60, 8, seed=5)
+        rooms2, grid2 = build_dungeon(60, 60, 8, seed=5)
+        self.assertGreaterEqual(len(rooms1), 3)
+        self.assertEqual([(r.x, r.y) for r in rooms1], [(r.x, r.y) for r in rooms2])
+        self.assertEqual(grid1, grid2)
+
+    def test_build_dungeon_reports_failure(self):  # No room fits, so every attempt fails
+        with self.assertRaises(RuntimeError):
+            build_dungeon(5, 5, 8, seed=1, max_attempts=2)
+
+    def test_sequence_follows_caller_rng(self):  # Worker timing never changes the sequence
+        prefetcher = DungeonPrefetcher(self.make_params(3), depth=2, use_processes=False)
+        self.assertEqual(len(prefetcher.pending), 2)
+        taken = [prefetcher.take() for _ in range(3)]
+        prefetcher.close()
+
+        params = self.make_params(3)
+        expected = [build_dungeon(**params()) for _ in range(3)]
+        self.assertEqual([grid for _, grid in taken], [grid for _, grid in expected])
+
+    def test_ready_and_refill(self):  # take() keeps the queue at full depth
+        prefetcher = DungeonPrefetcher(self.make_params(4), depth=1, use_processes=False)
+        prefetcher.pending[0].result()
+        self.assertTrue(prefetcher.ready())
+        prefetcher.take()
+        self.assertEqual(len(prefetcher.pending), 1)
+        prefetcher.close()
+        self.assertFalse(prefetcher.ready())
+
+    def test_process_worker(self):  # Results survive the trip back from a worker process
+        prefetcher = DungeonPrefetcher(self.make_params(6), depth=1)
+        try:
+            rooms, grid = prefetcher.take()
+        finally:
+            prefetcher.close()
+        self.assertGreaterEqual(len(rooms), 3)
+        self.assertEqual(len(grid), 60)
+
+    def test_rejects_zero_depth(self):
+        with self.assertRaises(ValueError):
+            DungeonPrefetcher(self.make_params(1), depth=0)
+
+
+class TestInstrumentation(unittest.TestCase):  # Testing opt-in generation stats
+    def test_disabled_by_default(self):  # No stats object unless requested
+        gen = DungeonGenerator(width=60, height=60, max_rooms=8, seed=1)
+        gen.generate()
+        self.assertIsNone(gen.stats)
+
+    def test_stage_timings_and_counters(self):  # Every stage is timed and counters add up
+        gen = DungeonGenerator(width=100, height=100, max_rooms=30, seed=3, instrument=True)
+        rooms, corridors, _, _, _ = gen.generate()
+        stats = gen.stats.as_dict()
+
+        for stage in ("rooms", "delaunay", "mst", "corridors", "grid", "total"):
+            self.assertIn(stage, stats["timings"])
+        counters = stats["counters"]
+        rejected = counters.get("placement_rejected_overlap", 0) + counters.get(
+            "placement_rejected_size", 0
+        )
+        self.assertEqual(counters["placement_attempts"], counters["rooms_placed"] + rejected)
+        self.assertEqual(counters["rooms_placed"], len(rooms))
+        self.assertEqual(counters["delaunay_insertions"], len(rooms))
+        self.assertEqual(counters["mst_edges"] + counters["extra_edges"], len(corridors))
+        self.assertGreater(counters["corridor_cells_rasterized"], 0)
+
+    def test_callback_receives_stats(self):  # Callback fires once per generate() call
+        received = []
+        gen = DungeonGenerator(width=60, height=60, max_rooms=8, seed=1, stats_callback=received.append)
+        gen.generate()
+        self.assertEqual(len(received), 1)
+        self.assertIs(received[0], gen.stats)
+
+
 class TestNode(unittest.TestCase):  # Testing Node class for pathfinding    
     def test_node_creation(self):   # Test basic node creation
         node = Node(5, 10, cost=2.0, heuristic=3.0)
@@ -426,12 +1133,492 @@ class TestAStarPathfinder(unittest.TestCase):   # Testing A* pathfinding algorit
             self.assertLessEqual(abs(y2 - y1), 1)
             self.assertTrue(x2 != x1 or y2 != y1)
     
+    def test_engines_find_equal_cost_paths(self):  # Flat and Node engines agree on path cost
+        def cost(path):
+            return sum(
+                1.414 if (x1 != x2 and y1 != y2) else 1.0
+                for (x1, y1), (x2, y2) in zip(path, path[1:])
+            )
+
+        for grid in (self.open_grid, self.wall_grid):
+            flat = AStarPathfinder(grid).find_path(0, 0, 4, 4)
+            nodes = AStarPathfinder(grid, engine="node").find_path(0, 0, 4, 4)
+            self.assertAlmostEqual(cost(flat), cost(nodes), places=6)
+
+    def test_jps_matches_flat_cost(self):  # Jump Point Search finds equally short paths
+        rng = random.Random(5)
+        for _ in range(40):
+            grid = [[0 if rng.random() < 0.3 else 1 for _ in range(12)] for _ in range(12)]
+            cells = [(x, y) for y in range(12) for x in range(12) if grid[y][x]]
+            start, end = rng.sample(cells, 2)
+            flat = AStarPathfinder(grid).find_path(*start, *end)
+            jps = AStarPathfinder(grid, engine="jps").find_path(*start, *end)
+            self.assertEqual(flat is None, jps is None)
+            if jps is not None:
+                self.assertEqual((jps[0], jps[-1]), (start, end))
+                self.assertTrue(all(grid[y][x] for x, y in jps))
+                for (x1, y1), (x2, y2) in zip(jps, jps[1:]):
+                    self.assertEqual(max(abs(x2 - x1), abs(y2 - y1)), 1)
+                self.assertLessEqual(path_cost(jps), path_cost(flat) + 1e-9)
+
+    def test_jps_expands_fewer_nodes(self):  # Open areas need only a handful of jump points
+        grid = [[1] * 40 for _ in range(40)]
+        flat = AStarPathfinder(grid)
+        jps = AStarPathfinder(grid, engine="jps")
+        self.assertEqual(len(jps.find_path(0, 0, 39, 20)), len(flat.find_path(0, 0, 39, 20)))
+        self.assertLess(jps.nodes_expanded * 5, flat.nodes_expanded)
+
+    def test_flat_engine_deterministic(self):  # Repeated queries return the identical path
+        pf = AStarPathfinder(self.open_grid)
+        self.assertEqual(pf.find_path(0, 0, 4, 2), pf.find_path(0, 0, 4, 2))
+
+    def test_nodes_expanded_reported(self):  # Expansion counter is set by each search
+        pf = AStarPathfinder(self.blocked_grid)
+        self.assertEqual(len(pf.find_path(0, 0, 1, 4)), 5)
+        self.assertEqual(pf.nodes_expanded, 4)
+        self.assertIsNone(pf.find_path(0, 0, 4, 0))
+        self.assertGreater(pf.nodes_expanded, 0)  # Live grid: the whole component is searched
+        pf = AStarPathfinder(self.blocked_grid, snapshot=True)
+        self.assertIsNone(pf.find_path(0, 0, 4, 0))
+        self.assertEqual(pf.nodes_expanded, 0)  # Other component: rejected without a search
+
+    def test_direct_edits_seen(self):  # Cells written after a search are read by the next one
+        grids = [lambda rows: rows]
+        if np is not None:
+            grids.append(lambda rows: np.array(rows, dtype=np.uint8))
+        for engine in ("flat", "node", "sparse"):
+            for make in grids:
+                grid = make([[1] * 3 for _ in range(3)])
+                pf = AStarPathfinder(grid, engine=engine)
+                self.assertEqual(pf.find_path(0, 0, 2, 2), [(0, 0), (1, 1), (2, 2)])
+                grid[1][1] = 0  # New wall on the path
+                self.assertEqual(len(pf.find_path(0, 0, 2, 2)), 4)
+                for y in range(3):
+                    grid[y][1] = 0
+                self.assertIsNone(pf.find_path(0, 0, 2, 0))
+                grid[2][1] = 1  # Opened gap
+                self.assertEqual(pf.find_path(0, 0, 2, 0)[2], (1, 2))
+
+    def test_reused_buffers_do_not_leak(self):  # Stale stamps from earlier searches are ignored
+        pf = AStarPathfinder(self.wall_grid)
+        fresh = [AStarPathfinder(self.wall_grid).find_path(0, 0, *end) for end in ((4, 4), (0, 2))]
+        self.assertEqual([pf.find_path(0, 0, *end) for end in ((4, 4), (0, 2))], fresh)
+        pf._stamp = 2 ** 32 - 3  # pylint: disable=protected-access
+        self.assertEqual(pf.find_path(0, 0, 4, 4), fresh[0])  # Buffers rebuilt before wrapping
+
+    def test_find_paths_matches_find_path(self):  # Batch results in input order, per-query stats
+        pairs = [((0, 0), (4, 4)), ((0, 2), (4, 3)), ((0, 0), (4, 0)), ((9, 9), (0, 0))]
+        single = AStarPathfinder(self.wall_grid)
+        expected, expanded = [], []
+        for start, end in pairs:
+            expected.append(single.find_path(*start, *end))
+            expanded.append(single.nodes_expanded)
+        pf = AStarPathfinder(self.wall_grid)
+        self.assertEqual(pf.find_paths(pairs), expected)
+        self.assertEqual(pf.batch_nodes_expanded, expanded)
+        self.assertEqual(pf.nodes_expanded, sum(expanded))
+
+    def test_find_paths_on_pools(self):  # Thread and process pools keep the input order
+        rng = random.Random(8)
+        grid = [[0 if rng.random() < 0.2 else 1 for _ in range(20)] for _ in range(20)]
+        cells = [(x, y) for y in range(20) for x in range(20) if grid[y][x]]
+        pairs = [tuple(rng.sample(cells, 2)) for _ in range(12)]
+        for engine in ("flat", "jps"):
+            pf = AStarPathfinder(grid, engine=engine)
+            expected = pf.find_paths(pairs)
+            expanded = pf.batch_nodes_expanded
+            self.assertEqual(pf.find_paths(pairs, workers=3), expected)
+            self.assertEqual(pf.batch_nodes_expanded, expanded)
+            self.assertEqual(pf.find_paths(pairs, workers=2, use_processes=True), expected)
+            self.assertEqual(pf.batch_nodes_expanded, expanded)
+
+    def test_find_paths_reuses_workers(self):  # Thread workers keep their buffers across batches
+        grid = [[1] * 30 for _ in range(30)]
+        pairs = [((0, y), (29, 29 - y)) for y in range(6)]
+        pf = AStarPathfinder(grid)
+        expected = pf.find_paths(pairs)
+        self.assertEqual(pf.find_paths(pairs, workers=3), expected)
+        buffers = [worker.search_buffers() for worker in pf.workers(3)]
+        grid[5][5] = 0
+        pf.grid_changed()
+        self.assertEqual(pf.find_paths(pairs, workers=3), AStarPathfinder(grid).find_paths(pairs))
+        self.assertTrue(all(
+            worker.search_buffers() is old for worker, old in zip(pf.workers(3), buffers)
+        ))
+        self.assertTrue(all(worker.version == pf.version for worker in pf.workers(3)))
+
+    def test_find_paths_reuses_processes(self):  # One process pool serves every batch
+        grid = [[1] * 30 for _ in range(30)]
+        pairs = [((0, y), (29, 29 - y)) for y in range(6)]
+        pf = AStarPathfinder(grid)
+        expected = pf.find_paths(pairs)
+        self.assertEqual(pf.find_paths(pairs, workers=2, use_processes=True), expected)
+        processes = pf._processes  # pylint: disable=protected-access
+        self.assertEqual(pf.find_paths(pairs, workers=2, use_processes=True), expected)
+        self.assertIs(pf._processes, processes)  # pylint: disable=protected-access
+        for x in range(1, 29):
+            grid[5][x] = 0  # Written directly: the processes' copy of the rows is out of date
+        self.assertEqual(
+            pf.find_paths(pairs, workers=2, use_processes=True),
+            AStarPathfinder(grid).find_paths(pairs),
+        )
+        self.assertIsNot(pf._processes, processes)  # pylint: disable=protected-access
+        pf.close()
+        self.assertIsNone(pf._processes)  # pylint: disable=protected-access
+
+    def test_find_paths_labels_once(self):  # Workers share the batch's component labels
+        grid = [[1] * 20 for _ in range(20)]
+        for y in range(20):
+            grid[y][10] = 0
+        pairs = [((0, y), (19, 19 - y)) for y in range(8)]  # All across the wall
+        pf = AStarPathfinder(grid, snapshot=True)
+        with mock.patch(
+            "dungeon_generator.pathfinding.label_components", wraps=label_components
+        ) as labelling:
+            for _ in range(2):
+                self.assertEqual(pf.find_paths(pairs, workers=4), [None] * 8)
+                self.assertEqual(pf.batch_nodes_expanded, [0] * 8)
+        self.assertEqual(labelling.call_count, 1)
+        self.assertEqual(pf.find_paths(pairs, workers=2, use_processes=True), [None] * 8)
+        self.assertEqual(pf.batch_nodes_expanded, [0] * 8)  # Labels sent to the processes
+
+    def test_path_cache_hits(self):  # Repeated and sub-queries are answered without searching
+        grid = [[1] * 30 for _ in range(30)]
+        pf = AStarPathfinder(grid, cache_size=8)
+        path = pf.find_path(0, 0, 29, 20)
+        self.assertEqual(pf.find_path(0, 0, 29, 20), path)
+        self.assertEqual(pf.nodes_expanded, 0)
+        middle, end = path[5], path[-3]
+        self.assertEqual(pf.find_path(*middle, *end), path[5:-2])
+        self.assertEqual(pf.find_path(*end, *middle), path[5:-2][::-1])  # Reversed slice
+        self.assertEqual(pf.nodes_expanded, 0)
+        stats = pf.path_cache.as_dict()
+        self.assertEqual((stats["hits"], stats["subpath_hits"], stats["misses"]), (3, 2, 1))
+        self.assertAlmostEqual(pf.path_cache.hit_rate(), 0.75)
+        self.assertGreater(stats["bytes"], len(path) * 8)
+
+    def test_path_cache_lru_and_unreachable(self):  # Bounded entries, failures cached too
+        pf = AStarPathfinder(self.blocked_grid, cache_size=2)  # Live grid: no labels
+        self.assertIsNone(pf.find_path(0, 0, 4, 0))
+        self.assertGreater(pf.nodes_expanded, 0)
+        self.assertIsNone(pf.find_path(0, 0, 4, 0))
+        self.assertEqual(pf.nodes_expanded, 0)  # Failure served from the cache
+        self.assertEqual((pf.path_cache.hits, pf.path_cache.misses), (1, 1))
+        pf.find_path(0, 2, 0, 3)
+        pf.find_path(0, 3, 0, 4)
+        self.assertEqual(len(pf.path_cache), 2)
+        self.assertEqual(pf.path_cache.evictions, 1)
+        self.assertEqual(pf.path_cache.size, 2 * 2 * pf.path_cache.entries[(15, 20)].itemsize)
+        with self.assertRaises(ValueError):
+            PathCache(5, max_entries=0)
+
+    def test_path_cache_invalidated_by_grid_version(self):  # Edits announced by grid_changed()
+        grid = [[1] * 5 for _ in range(3)]
+        pf = AStarPathfinder(grid, cache_size=4)
+        self.assertEqual(len(pf.find_path(0, 1, 4, 1)), 5)
+        for y in range(3):
+            grid[y][2] = 0
+        pf.grid_changed()
+        self.assertIsNone(pf.find_path(0, 1, 4, 1))
+        self.assertIsNone(pf.find_path(0, 1, 3, 1))  # Old path no longer used for subpaths
+        self.assertEqual(pf.path_cache.hits, 0)
+
+    def test_path_cache_catches_direct_blocks(self):  # Unannounced walls are not walked through
+        grid = [[1] * 5 for _ in range(5)]
+        pf = AStarPathfinder(grid, cache_size=4, snapshot=True)
+        path = pf.find_path(0, 2, 4, 2)
+        version = pf.version
+        grid[2][2] = 0  # Written directly, without set_walkable() or grid_changed()
+        path = pf.find_path(0, 2, 4, 2)
+        self.assertNotIn((2, 2), path)
+        self.assertEqual(len(path), 5)
+        self.assertEqual((pf.path_cache.stale, pf.version), (1, version + 1))
+        self.assertEqual(pf.find_path(0, 2, 4, 2), path)  # The new path was cached
+        self.assertEqual(pf.path_cache.hits, 2)
+
+        for y in range(5):
+            grid[y][2] = 0
+        pf.grid_changed()
+        self.assertIsNone(pf.find_path(0, 2, 4, 2))
+        grid[0][2] = 1  # Opened without notice: the cached failure cannot tell
+        self.assertIsNone(pf.find_path(0, 2, 4, 2))
+        pf.grid_changed()
+        self.assertEqual(pf.find_path(0, 2, 4, 2)[2], (2, 0))
+
+    def test_unknown_engine(self):  # Invalid engine names are rejected
+        with self.assertRaises(ValueError):
+            AStarPathfinder(self.open_grid, engine="dijkstra")
+
     def test_heuristic_calculation(self):   # Test heuristic calculation (Euclidean distance)
         pf = AStarPathfinder(self.open_grid)
         h = pf.heuristic(0, 0, 3, 4)
         self.assertAlmostEqual(h, 5.0, places=5)
 
 
+class TestHierarchicalPathfinder(unittest.TestCase):  # Testing room/corridor-level planning
+    def setUp(self):
+        gen = DungeonGenerator(width=200, height=200, max_rooms=40, min_room_size=6,
+                               max_room_size=16, placement="free_space", seed=11)
+        self.rooms, self.corridors, _, _, self.grid = gen.generate()
+        self.pathfinder = HierarchicalPathfinder(self.grid, self.rooms, self.corridors)
+        self.astar = AStarPathfinder(self.grid)
+
+    def assert_valid_path(self, path, start, end):  # Walkable, 8-connected, right endpoints
+        self.assertEqual(path[0], start)
+        self.assertEqual(path[-1], end)
+        for (x1, y1), (x2, y2) in zip(path, path[1:]):
+            self.assertEqual(max(abs(x2 - x1), abs(y2 - y1)), 1)
+        self.assertTrue(all(self.grid[y][x] for x, y in path))
+
+    def test_octile_line(self):  # Diagonal steps first, cost matches octile()
+        line = octile_line(0, 0, 3, 1)
+        self.assertEqual(line, [(0, 0), (1, 1), (2, 1), (3, 1)])
+        self.assertAlmostEqual(path_cost(line), octile(3, 1))
+
+    def test_paths_close_to_optimal(self):  # Valid paths within 5% of grid A*
+        rng = random.Random(3)
+        for _ in range(30):
+            a, b = rng.sample(self.rooms, 2)
+            start = (rng.randrange(a.x, a.x + a.width), rng.randrange(a.y, a.y + a.height))
+            end = (rng.randrange(b.x, b.x + b.width), rng.randrange(b.y, b.y + b.height))
+            path = self.pathfinder.find_path(*start, *end)
+            optimal = self.astar.find_path(*start, *end)
+            self.assert_valid_path(path, start, end)
+            self.assertLessEqual(path_cost(path), path_cost(optimal) * 1.05)
+        self.assertEqual(self.pathfinder.fallbacks, 0)
+
+    def test_same_room_is_direct(self):  # No abstract search needed inside one room
+        room = self.rooms[0]
+        start, end = (room.x, room.y), (room.x + room.width - 1, room.y + room.height - 1)
+        path = self.pathfinder.find_path(*start, *end)
+        self.assert_valid_path(path, start, end)
+        self.assertAlmostEqual(path_cost(path), octile(room.width - 1, room.height - 1))
+
+    def test_corridor_endpoints(self):  # Queries may start and end on corridor cells
+        corridor = self.corridors[0]
+        start = corridor[1]  # The L corner is on the corridor, usually outside rooms
+        end = (int(self.rooms[-1].center.x), int(self.rooms[-1].center.y))
+        path = self.pathfinder.find_path(*start, *end)
+        self.assert_valid_path(path, start, end)
+
+    def test_invalid_queries(self):  # Same contract as AStarPathfinder
+        self.assertIsNone(self.pathfinder.find_path(-1, 0, 5, 5))
+        wall = next((x, y) for y in range(200) for x in range(200) if not self.grid[y][x])
+        room = self.rooms[0]
+        self.assertIsNone(self.pathfinder.find_path(*wall, room.x, room.y))
+
+    def test_falls_back_off_the_graph(self):  # Floor unknown to the layout uses grid A*
+        grid = [[1] * 10 for _ in range(10)]
+        pathfinder = HierarchicalPathfinder(grid, [], [])
+        path = pathfinder.find_path(0, 0, 9, 5)
+        self.assertEqual(len(path), 10)
+        self.assertEqual(pathfinder.fallbacks, 1)
+
+    def test_blocked_leg_is_repaired(self):  # Grid edits after the build are respected
+        room = Room(2, 2, 10, 10, 0)
+        grid = [[0] * 15 for _ in range(15)]
+        fill_rect(grid, room.x, room.y, room.width, room.height)
+        pathfinder = HierarchicalPathfinder(grid, [room], [])
+        for y in range(2, 11):
+            grid[y][6] = 0  # Wall across the room, open at the bottom row
+        path = pathfinder.find_path(3, 3, 10, 3)
+        self.assertTrue(all(grid[y][x] for x, y in path))
+        self.assertEqual(path[-1], (10, 3))
+
+
+class TestFlowField(unittest.TestCase):  # Testing shared-goal distance fields
+    def setUp(self):
+        gen = DungeonGenerator(width=80, height=80, max_rooms=12, seed=5)
+        self.rooms, _, _, _, self.grid = gen.generate()
+        self.pathfinder = AStarPathfinder(self.grid)
+        self.cache = FlowFieldCache(self.pathfinder)
+        center = self.rooms[0].center
+        self.goal = (int(center.x), int(center.y))
+
+    def test_distances_match_astar(self):  # Field distance equals the A* path cost
+        field = self.cache.field([self.goal])
+        for room in self.rooms[1:6]:
+            start = (int(room.center.x), int(room.center.y))
+            path = self.pathfinder.find_path(*start, *self.goal)
+            self.assertAlmostEqual(field.distance(*start), path_cost(path))
+            self.assertAlmostEqual(path_cost(field.path(*start)), path_cost(path))
+
+    def test_next_step_walks_to_goal(self):  # Directions are single walkable moves
+        field = self.cache.field([self.goal])
+        room = self.rooms[-1]
+        x, y = room.x, room.y
+        while (x, y) != self.goal:
+            dx, dy = field.direction(x, y)
+            self.assertLessEqual(max(abs(dx), abs(dy)), 1)
+            x, y = x + dx, y + dy
+            self.assertTrue(self.grid[y][x])
+        self.assertIsNone(field.next_step(*self.goal))
+
+    def test_nearest_of_several_goals(self):  # Multi-source field uses the closest goal
+        grid = [[1] * 20 for _ in range(3)]
+        field = build_flow_field(AStarPathfinder(grid).walkable_cells(), 20, 3,
+                                 [(0, 1), (19, 1)])
+        self.assertEqual(field.distance(4, 1), 4.0)
+        self.assertEqual(field.direction(4, 1)[0], -1)
+        self.assertEqual(field.direction(15, 1)[0], 1)
+
+    def test_unreachable_cells(self):  # Walls and cut-off cells have no next step
+        grid = [[1, 0, 1]]
+        field = build_flow_field(AStarPathfinder(grid).walkable_cells(), 3, 1, [(0, 0)])
+        self.assertEqual(field.distance(2, 0), math.inf)
+        self.assertIsNone(field.next_step(2, 0))
+        self.assertIsNone(field.path(2, 0))
+        self.assertEqual(field.distance(5, 5), math.inf)
+
+    def test_cached_per_goal_set(self):  # Same goals reuse the field, in any order
+        room = self.rooms[1]
+        other = (room.x, room.y)
+        first = self.cache.field([self.goal, other])
+        self.assertIs(self.cache.field([other, self.goal]), first)
+        self.assertIsNot(self.cache.field([self.goal]), first)
+        self.assertEqual(self.cache.builds, 2)
+
+    def test_rebuilt_after_grid_change(self):  # Only grid_changed() invalidates fields
+        grid = [[1] * 10 for _ in range(3)]
+        pathfinder = AStarPathfinder(grid)
+        cache = FlowFieldCache(pathfinder)
+        field = cache.field([(0, 1)])
+        self.assertEqual(field.distance(9, 1), 9.0)
+        for y in range(3):
+            grid[y][5] = 0
+        self.assertIs(cache.field([(0, 1)]), field)  # Not told about the edit yet
+        pathfinder.grid_changed()
+        rebuilt = cache.field([(0, 1)])
+        self.assertIsNot(rebuilt, field)
+        self.assertEqual(rebuilt.distance(9, 1), math.inf)
+
+    def test_lru_bound_and_invalid_goals(self):  # Oldest field dropped, no walkable goal rejected
+        cache = FlowFieldCache(self.pathfinder, max_fields=2)
+        room = self.rooms[1]
+        for x in range(3):
+            cache.field([(room.x + x, room.y)])
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn(frozenset([(room.x, room.y)]), cache.fields)
+        with self.assertRaises(ValueError):
+            cache.field([(-1, -1)])
+        with self.assertRaises(ValueError):
+            FlowFieldCache(self.pathfinder, max_fields=0)
+
+
+class TestIncrementalPlanner(unittest.TestCase):  # Testing grid edits and D* Lite replanning
+    def test_set_walkable_patches_snapshots(self):  # Engines see edits without grid_changed()
+        for engine in ("flat", "jps"):
+            grid = [[1] * 6 for _ in range(3)]
+            pf = AStarPathfinder(grid, engine=engine)
+            self.assertEqual(len(pf.find_path(0, 1, 5, 1)), 6)
+            changed = pf.set_walkable_cells([(3, y, 0) for y in range(3)] + [(0, 0, 1)])
+            self.assertEqual(changed, [(3, 0), (3, 1), (3, 2)])  # (0, 0) was already open
+            self.assertEqual((grid[1][3], pf.version), (0, 1))
+            self.assertIsNone(pf.find_path(0, 1, 5, 1))
+            pf.set_walkable(3, 2, True)
+            self.assertEqual(pf.version, 2)
+            self.assertEqual(pf.find_path(0, 1, 5, 1)[3], (3, 2))
+
+    def test_set_walkable_rejects_outside_cells(self):
+        pf = AStarPathfinder([[1, 1]])
+        with self.assertRaises(ValueError):
+            pf.set_walkable(2, 0, 0)
+        self.assertEqual(pf.set_walkable(0, 0, 1), [])
+        self.assertEqual(pf.version, 0)
+
+    def test_matches_astar_after_edits(self):  # Same cost as a fresh search at every step
+        rng = random.Random(4)
+        for _ in range(10):
+            grid = [[0 if rng.random() < 0.25 else 1 for _ in range(16)] for _ in range(16)]
+            pf = AStarPathfinder(grid)
+            cells = [(x, y) for y in range(16) for x in range(16) if grid[y][x]]
+            start, goal = rng.sample(cells, 2)
+            planner = DStarLite(pf, *start, *goal)
+            for _ in range(10):
+                expected, path = pf.find_path(*start, *goal), planner.find_path()
+                self.assertEqual(expected is None, path is None)
+                if path is not None:
+                    self.assertEqual((path[0], path[-1]), (start, goal))
+                    self.assertTrue(all(grid[y][x] for x, y in path))
+                    self.assertAlmostEqual(path_cost(path), path_cost(expected))
+                    if len(path) > 2:
+                        start = path[1]
+                        planner.move_start(*start)
+                cell = (rng.randrange(16), rng.randrange(16))
+                if cell not in (start, goal):
+                    pf.set_walkable(*cell, not grid[cell[1]][cell[0]])
+
+    def test_replanning_is_local(self):  # Edits off the path cost nothing, on it a detour
+        gen = DungeonGenerator(width=150, height=150, max_rooms=30, min_room_size=6,
+                               max_room_size=16, placement="free_space", seed=3)
+        rooms, _, _, _, grid = gen.generate()
+        pf = AStarPathfinder(grid)
+        start = (int(rooms[0].center.x), int(rooms[0].center.y))
+        goal = (int(rooms[-1].center.x), int(rooms[-1].center.y))
+        planner = DStarLite(pf, *start, *goal)
+        path = planner.find_path()
+        wall = next((x, y) for y in range(150) for x in range(150) if not grid[y][x])
+        pf.set_walkable(*wall, 0)
+        pf.set_walkable(*wall, 1)  # Opened and closed again: nothing to repair
+        self.assertEqual(planner.find_path(), path)
+        self.assertEqual(planner.nodes_expanded, 0)
+
+        # Block a path cell near the agent, where a detour one cell aside exists
+        room = rooms[0]
+        cell = next(
+            (x, y) for x, y in path[1:]
+            if room.x < x < room.x + room.width - 1 and room.y < y < room.y + room.height - 1
+        )
+        pf.set_walkable(*cell, 0)
+        detour = planner.find_path()
+        expected = pf.find_path(*start, *goal)
+        self.assertNotIn(cell, detour)
+        self.assertAlmostEqual(path_cost(detour), path_cost(expected))
+        self.assertLess(planner.nodes_expanded * 3, pf.nodes_expanded)
+
+    def test_corridor_cuts_match_astar(self):  # Long detours and restarts stay optimal
+        gen = DungeonGenerator(width=150, height=150, max_rooms=30, placement="free_space",
+                               seed=7)
+        rooms, _, _, _, grid = gen.generate()
+        pf = AStarPathfinder(grid)
+        start = (int(rooms[0].center.x), int(rooms[0].center.y))
+        goal = (int(rooms[-1].center.x), int(rooms[-1].center.y))
+        planner = DStarLite(pf, *start, *goal)
+        path = planner.find_path()
+        corridor = [
+            (x, y) for x, y in path
+            if not any(r.x <= x < r.x + r.width and r.y <= y < r.y + r.height for r in rooms)
+        ]
+        for cell in corridor[::max(1, len(corridor) // 5)]:
+            pf.set_walkable(*cell, 0)
+            expected, path = pf.find_path(*start, *goal), planner.find_path()
+            self.assertEqual(expected is None, path is None)
+            if path is not None:
+                self.assertAlmostEqual(path_cost(path), path_cost(expected))
+            pf.set_walkable(*cell, 1)
+
+    def test_grid_changed_restarts(self):  # Unannounced edits are picked up after grid_changed()
+        grid = [[1] * 5 for _ in range(3)]
+        pf = AStarPathfinder(grid)
+        planner = DStarLite(pf, 0, 1, 4, 1)
+        self.assertEqual(len(planner.find_path()), 5)
+        for y in range(3):
+            grid[y][2] = 0
+        pf.grid_changed()
+        self.assertIsNone(planner.find_path())
+        pf.set_walkable(2, 0, 1)
+        self.assertEqual(planner.find_path()[2], (2, 0))
+
+    def test_chunked_grid(self):  # Grids without a flat snapshot are read in place
+        grid = ChunkedGrid(30, 30, chunk_size=10)
+        grid.add_rect(2, 2, 10, 10)
+        grid.add_segment(11, 6, 25, 6)
+        grid.add_rect(20, 4, 8, 8)
+        pf = AStarPathfinder(grid)
+        path = DStarLite(pf, 3, 3, 26, 10).find_path()
+        self.assertAlmostEqual(path_cost(path), path_cost(pf.find_path(3, 3, 26, 10)))
+
+
 class TestIntegration(unittest.TestCase):  # Integration tests for dungeon generation and pathfinding    
     def test_full_dungeon_generation_and_pathfinding(self): # Test full dungeon generation and pathfinding between rooms
         random.seed(42)
@@ -481,6 +1668,36 @@ class TestIntegration(unittest.TestCase):  # Integration tests for dungeon gener
             self.assertEqual(r1.width, r2.width)
             self.assertEqual(r1.height, r2.height)
     
+    def test_seeded_generator_ignores_global_random(self):  # Own RNG isolates seeded output
+        def layout():
+            gen = DungeonGenerator(width=80, height=80, max_rooms=12, seed=2024)
+            _, corridors, _, _, grid = gen.generate()
+            return [(r.x, r.y, r.width, r.height) for r in gen.rooms], corridors, grid
+
+        random.seed(1)
+        first = layout()
+        random.seed(2)
+        random.random()
+        second = layout()
+        self.assertEqual(first, second)
+
+    def test_interleaved_generators_are_independent(self):  # Step-by-step interleaving is safe
+        solo = DungeonGenerator(width=80, height=80, max_rooms=12, seed=7)
+        solo.generate()
+
+        gen_a = DungeonGenerator(width=80, height=80, max_rooms=12, seed=7)
+        gen_b = DungeonGenerator(width=80, height=80, max_rooms=12, seed=8)
+        gen_a.generate_rooms()
+        gen_b.generate_rooms()
+        gen_a.generate_mst()
+        gen_b.generate_mst()
+        self.assertEqual(gen_a.corridors, solo.corridors)
+
+    def test_shared_rng_argument(self):  # An injected rng is used for every draw
+        gen1 = DungeonGenerator(width=60, height=60, max_rooms=8, rng=random.Random(99))
+        gen2 = DungeonGenerator(width=60, height=60, max_rooms=8, rng=random.Random(99))
+        self.assertEqual(gen1.generate()[1], gen2.generate()[1])
+
     def test_path_between_all_rooms(self):  # Test pathfinding between all pairs of rooms in the generated dungeon
         random.seed(999)
         gen = DungeonGenerator(width=100, height=100, max_rooms=8)
@@ -510,6 +1727,188 @@ class TestIntegration(unittest.TestCase):  # Integration tests for dungeon gener
             self.assertLessEqual(len(rooms), target_rooms)
 
 
+class TestBatchGeneration(unittest.TestCase):  # Testing DungeonGenerator.generate_many
+    @staticmethod
+    def layout(value):  # Comparable summary of a generate() result
+        rooms, corridors, _, _, grid = value
+        return [(r.x, r.y, r.width, r.height) for r in rooms], corridors, grid
+
+    def test_pool_matches_serial(self):  # Same seeds give the same dungeons as a serial loop
+        expected = [
+            self.layout(DungeonGenerator(width=60, height=60, max_rooms=8, seed=seed).generate())
+            for seed in range(4)
+        ]
+
+        results = list(
+            DungeonGenerator.generate_many(range(4), workers=2, width=60, height=60, max_rooms=8)
+        )
+        self.assertEqual([r.index for r in results], [0, 1, 2, 3])
+        self.assertEqual([self.layout(r.value) for r in results], expected)
+
+    def test_errors_are_captured_per_item(self):  # One bad parameter set does not stop the batch
+        items = [{"seed": 1}, {"seed": 2, "width": 5}, {"seed": 3}]
+        results = list(
+            DungeonGenerator.generate_many(items, workers=1, height=50, width=50, max_rooms=5)
+        )
+        self.assertEqual([r.ok for r in results], [True, False, True])
+        self.assertIn("ValueError", results[1].error)
+        self.assertIsNone(results[1].value)
+
+    def test_completion_order_returns_every_item(self):  # Unordered mode still yields everything
+        results = DungeonGenerator.generate_many(
+            range(6), workers=2, chunksize=2, ordered=False, width=40, height=40, max_rooms=4
+        )
+        self.assertEqual(sorted(r.index for r in results), list(range(6)))
+
+    def test_serial_batch_keeps_global_rng(self):  # Serial batches do not disturb random state
+        random.seed(5)
+        expected = random.random()
+        random.seed(5)
+        list(DungeonGenerator.generate_many([1, 2], workers=1, width=40, height=40, max_rooms=4))
+        self.assertEqual(random.random(), expected)
+
+
+class TestDungeonExplorer(unittest.TestCase):  # Testing the explorer's cached floor and camera
+    params = {"width": 120, "height": 90, "max_rooms": 12, "min_room_size": 4, "seed": 4}
+
+    def setUp(self):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # No window
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.explorer = DungeonExplorer(
+                width=160, height=120, dungeon_width=120, dungeon_height=90, seed=4, prefetch=1
+            )
+        self.addCleanup(self.explorer.prefetcher.close)
+
+    @staticmethod
+    def pixels(surface):
+        return pygame.image.tobytes(surface, "RGB")
+
+    def full_floor(self):  # Cached floor rendered from scratch for the current camera
+        frame = self.explorer.frame
+        frame.floor_view = None
+        frame.update_floor(self.explorer.grid)
+        return self.pixels(frame.floor)
+
+    def test_chunked_grid_renders_like_list_grid(self):  # Rendering reads chunks via region()
+        rooms, _, _, _, grid = DungeonGenerator(**self.params).generate()
+        chunked = DungeonGenerator(grid_backend="chunked", chunk_size=16, **self.params)
+        _, _, _, _, chunked_grid = chunked.generate()
+        self.assertEqual(chunked_grid[3][10:40], bytearray(grid[3][10:40]))
+
+        explorer = self.explorer
+        floors = []
+        for backend in (grid, chunked_grid):
+            explorer._apply_dungeon(rooms, backend)
+            explorer.camera.cell_size = 3
+            explorer.camera.x, explorer.camera.y = 37, 21  # Edges fall inside cells and chunks
+            floors.append(self.full_floor())
+        self.assertEqual(floors[0], floors[1])
+        self.assertIn(b"22P", floors[0])  # Some floor was drawn
+
+    def test_floor_cache_matches_grid(self):  # Every visible cell is drawn in its own color
+        explorer, camera = self.explorer, self.explorer.camera
+        camera.zoom(1, 50, 40)  # The dungeon is now larger than the screen
+        explorer.draw()
+        size, floor = camera.cell_size, explorer.colors["floor"]
+        for y in range(camera.screen_height // size):
+            for x in range(camera.screen_width // size):
+                cell_x, cell_y = camera.screen_to_grid(x * size, y * size)
+                color = explorer.frame.floor.get_at((x * size, y * size))[:3]
+                self.assertEqual(color == floor, explorer.grid[cell_y][cell_x] != 0)
+
+    def test_dirty_rect_frames_match_full_redraw(self):  # Partial updates leave no trails
+        explorer = self.explorer
+        target = explorer.rooms[-1]
+        explorer.path = explorer.pathfinder.find_path(
+            explorer.player_x, explorer.player_y, int(target.center.x), int(target.center.y)
+        )
+        explorer.draw()
+        for _ in range(5):
+            explorer.update(explorer.move_delay)  # One step per frame
+            explorer.draw()
+            self.assertFalse(explorer.frame.full_redraw)
+            incremental = self.pixels(explorer.screen)
+            explorer.frame.full_redraw = True
+            explorer.draw()
+            self.assertEqual(self.pixels(explorer.screen), incremental)
+
+        explorer.screen.fill((1, 2, 3))
+        explorer.draw()  # Nothing changed: the frame is skipped
+        self.assertEqual(explorer.screen.get_at((0, 0))[:3], (1, 2, 3))
+
+    def test_scrolled_floor_matches_full_render(self):  # Shifted cache + new strips are exact
+        camera, frame, grid = self.explorer.camera, self.explorer.frame, self.explorer.grid
+        camera.zoom(1, 0, 0)
+        frame.update_floor(grid)
+        moves = [(13, 0), (0, 9), (-7, -5), (40, 33), (-300, 0), (0, 500), (5, -3)]
+        for index, (dx, dy) in enumerate(moves):
+            if index == 3:
+                camera.zoom(1, 70, 20)
+            camera.scroll(dx, dy)
+            frame.update_floor(grid)
+            incremental = self.pixels(frame.floor)
+            self.assertEqual(self.full_floor(), incremental)
+
+    def test_camera_stays_clamped(self):  # The view never leaves the dungeon
+        camera = self.explorer.camera
+        for size_steps, dx, dy in [(1, -999, -999), (2, 9999, 9999), (0, -50, 30), (-3, 999, 0)]:
+            for _ in range(abs(size_steps)):
+                camera.zoom(size_steps, 159, 119)
+            camera.scroll(dx, dy)
+            world_width = camera.dungeon_width * camera.cell_size
+            world_height = camera.dungeon_height * camera.cell_size
+            self.assertGreaterEqual(min(camera.x, camera.y), 0)
+            self.assertLessEqual(camera.x, max(0, world_width - camera.screen_width))
+            self.assertLessEqual(camera.y, max(0, world_height - camera.screen_height))
+
+    def test_screen_to_grid_and_zoom_anchor(self):  # Clicks map to the cell under the pointer
+        camera = self.explorer.camera
+        camera.zoom(1, 0, 0)
+        camera.zoom(1, 0, 0)
+        camera.scroll(123, 57)
+        for point in [(0, 0), (1, 1), (3, 2), (80, 61), (159, 119)]:
+            cell = camera.screen_to_grid(*point)
+            self.assertTrue(camera.cell_rect(*cell).collidepoint(point))
+
+        anchor = (100, 60)
+        cell = camera.screen_to_grid(*anchor)
+        camera.zoom(1, *anchor)
+        self.assertEqual(camera.screen_to_grid(*anchor), cell)
+        camera.zoom(-1, *anchor)
+        self.assertEqual(camera.screen_to_grid(*anchor), cell)
+
+
+class TestVisualization(unittest.TestCase):  # Testing map rendering without a display
+    def setUp(self):
+        gen = DungeonGenerator(width=80, height=80, max_rooms=12, seed=3)
+        self.rooms, self.corridors, _, self.triangulation, _ = gen.generate()
+
+    def render(self, **options):  # Render quietly, returning the Figure
+        with contextlib.redirect_stdout(io.StringIO()):
+            return visualize_dungeon(
+                self.rooms, self.corridors, self.triangulation, 80, 80, show=False, **options
+            )
+
+    def test_saves_png_without_pyplot(self):  # show=False writes the file and opens no window
+        import matplotlib.pyplot as plt
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "map.png")
+            self.render(output=output, dpi=20)
+            with open(output, "rb") as f:
+                self.assertEqual(f.read(8), b"\x89PNG\r\n\x1a\n")
+        self.assertEqual(plt.get_fignums(), [])
+
+    def test_one_collection_per_layer(self):  # Triangles, corridors and rooms are single artists
+        ax = self.render(output=None).axes[0]
+        self.assertEqual(len(ax.collections), 3)
+        self.assertEqual(len(ax.lines), 0)
+        self.assertEqual(len(ax.collections[2].get_paths()), len(self.rooms))
+
+    def test_labels_skipped_above_limit(self):  # Room IDs only on small maps
+        self.assertEqual(len(self.render(output=None).axes[0].texts), len(self.rooms))
+        self.assertEqual(len(self.render(output=None, label_limit=5).axes[0].texts), 0)
+
+
 class TestBresenhamLine(unittest.TestCase): # Testing Bresenham's line algorithm    
     def test_horizontal_line(self):   # Test horizontal line generation
         points = list(DungeonGenerator.get_line_points(1, 1, 5, 1))
@@ -547,4 +1946,18 @@ class TestEdgeCases(unittest.TestCase):  # Testing edge cases in dungeon generat
         self.assertGreater(len(rooms), 0)
         self.assertIsNotNone(grid)
         self.assertEqual(len(grid), 30)
-        self.assertEqual(len(grid[0]), 30)
\ No newline at end of file
+        self.assertEqual(len(grid[0]), 30)
+
+
+class TestBenchmarkSuite(unittest.TestCase):  # Testing the benchmark harness helpers
+    def test_measure_reports_min_and_median(self):  # Timing dict has the expected fields
+        result = measure(lambda: None, lambda _: None, 3)
+        self.assertEqual(result["repeats"], 3)
+        self.assertLessEqual(result["seconds"], result["median"])
+
+    def test_compare_flags_regressions(self):  # Only slowdowns above the threshold are flagged
+        baseline = {"a": {"seconds": 1.0}, "b": {"seconds": 1.0}, "c": {"seconds": 0.001}}
+        results = {"a": {"seconds": 1.1}, "b": {"seconds": 1.5}, "c": {"seconds": 0.004}}
+        with contextlib.redirect_stdout(io.StringIO()):
+            regressions = compare(results, baseline, threshold=0.25, min_seconds=0.01)
+        self.assertEqual([name for name, *_ in regressions], ["b"])